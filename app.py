@@ -1,3 +1,4 @@
+import multiprocessing
 import customtkinter as ctk
 from main_controller import MainController
 from gui_builder import GUIBuilder
@@ -25,7 +26,15 @@ class App(ctk.CTk):
 
         GUIBuilder.build(self, self.controller)
         self.controller._initialize()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self) -> None:
+        """Cancela os jobs em segundo plano antes de fechar a janela"""
+        self.controller.jobs.shutdown()
+        self.destroy()
 
 if __name__ == "__main__":
+    # necessário para os pools de processos no executável empacotado
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
\ No newline at end of file
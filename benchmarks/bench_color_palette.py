@@ -0,0 +1,90 @@
+# benchmarks/bench_color_palette.py
+"""
+Compara a extração de paleta nativa (corte na mediana vetorizado) com o pipeline
+anterior do ColorThief (cópia RGB + PNG em memória + filtro O(n²) em Python).
+
+Uso:
+    python benchmarks/bench_color_palette.py [--sizes 256 512 1024] [--colors 16 64 4096]
+"""
+
+import argparse
+import importlib.util
+import io
+import math
+import os
+import sys
+import time
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sprite_core.color_palette_generator import get_color_palette, rgb_to_hex
+
+
+def color_distance(c1: Tuple[int, int, int], c2: Tuple[int, int, int]) -> float:
+    """Distância euclidiana original (Python puro), para que a referência seja de fato o código antigo."""
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(c1, c2)))
+
+
+def get_color_palette_colorthief(image: Image.Image, num_colors: int = 24, min_distance: int = 20) -> list:
+    """Implementação original, mantida apenas como referência para o benchmark."""
+    from colorthief import ColorThief
+
+    with io.BytesIO() as stream:
+        image_rgb = image.copy().convert("RGB")
+        image_rgb.save(stream, format='PNG')
+        stream.seek(0)
+        raw_palette = ColorThief(stream).get_palette(color_count=num_colors * 3, quality=9)
+
+    filtered_palette = []
+    for color in raw_palette:
+        if all(color_distance(color, existing_color) >= min_distance for existing_color in filtered_palette):
+            filtered_palette.append(color)
+        if len(filtered_palette) >= num_colors:
+            break
+    return [rgb_to_hex(color) for color in filtered_palette]
+
+
+def make_sheet(size: int, num_colors: int, transparent_ratio: float = 0.3, seed: int = 0) -> Image.Image:
+    """Gera uma folha sintética com `num_colors` cores e uma fração de pixels transparentes."""
+    rng = np.random.default_rng(seed)
+    palette = rng.integers(0, 256, size=(num_colors, 4), dtype=np.uint8)
+    palette[:, 3] = 255
+    pixels = palette[rng.integers(0, num_colors, size=(size, size))]
+    pixels[rng.random((size, size)) < transparent_ratio, 3] = 0
+    return Image.fromarray(pixels)
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512, 1024, 1920])
+    parser.add_argument("--colors", type=int, nargs="+", default=[16, 64, 4096])
+    args = parser.parse_args()
+
+    has_colorthief = importlib.util.find_spec("colorthief") is not None
+    if not has_colorthief:
+        print("colorthief não instalado: apenas o método nativo será medido.\n")
+
+    print(f"{'tamanho':>9} {'cores':>6} {'colorthief (s)':>15} {'nativo (s)':>11} {'ganho':>7}")
+    for size in args.sizes:
+        for num_colors in args.colors:
+            sheet = make_sheet(size, num_colors)
+            native_time, _ = _time(get_color_palette, sheet)
+            if has_colorthief:
+                thief_time, _ = _time(get_color_palette_colorthief, sheet)
+                print(f"{size:>4}x{size:<4} {num_colors:>6} {thief_time:>15.3f} {native_time:>11.4f} {thief_time / native_time:>6.0f}x")
+            else:
+                print(f"{size:>4}x{size:<4} {num_colors:>6} {'-':>15} {native_time:>11.4f} {'-':>7}")
+
+
+if __name__ == "__main__":
+    main()
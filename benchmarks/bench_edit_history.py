@@ -0,0 +1,81 @@
+# benchmarks/bench_edit_history.py
+"""
+Mede desfazer/refazer do EditHistory com um orçamento de memória do tamanho da imagem (ou menor).
+
+O estado original e o atual não contam no orçamento: mesmo quando ele não comporta uma imagem
+inteira, os deltas das edições recentes devem ser mantidos e desfazer/refazer não deve refazer
+as operações desde o original. O script termina com erro se nenhum delta for mantido.
+
+Uso:
+    python benchmarks/bench_edit_history.py [--sizes 512 1024 2048] [--edits 16] [--budget-ratios 1.0 0.5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sprite_core.edit_history import EditHistory
+
+
+def make_sheet(size: int, seed: int = 0) -> Image.Image:
+    """Gera uma folha sintética com 16 cores opacas, como pixel art."""
+    rng = np.random.default_rng(seed)
+    palette = rng.integers(0, 256, size=(16, 4), dtype=np.uint8)
+    palette[:, 3] = 255
+    return Image.fromarray(palette[rng.integers(0, len(palette), size=(size, size))])
+
+
+def _steps_ms(step, count: int) -> list:
+    """Duração (ms) de cada uma de `count` chamadas seguidas de `step`."""
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        step()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--edits", type=int, default=16)
+    parser.add_argument("--budget-ratios", type=float, nargs="+", default=[1.0, 0.5], help="Orçamento em frações do tamanho RGBA da imagem.")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'tamanho':>9} {'orçamento':>10} {'deltas':>7} {'quadros':>8} {'desf. c/ delta':>17} {'desfazer (ms)':>14} {'refazer (ms)':>13}")
+    for size in args.sizes:
+        sheet = make_sheet(size)
+        colors = [color[:3] for _, color in sorted(sheet.getcolors(256), reverse=True)]
+        for ratio in args.budget_ratios:
+            budget = int(size * size * 4 * ratio)
+            history = EditHistory(sheet, memory_budget=budget)
+            current = list(colors)
+            for i in range(args.edits):
+                # Cada edição troca uma das 16 cores por uma cor nova: o delta cobre ~1/16 dos pixels
+                slot = i % len(current)
+                new = (i % 256, 255 - i % 256, (i * 7) % 256)
+                history.recolor([(current[slot], new, 0)])
+                current[slot] = new
+            kept = sum(entry.delta is not None for entry in history._entries)
+            undo = _steps_ms(history.undo, args.edits)
+            redo = _steps_ms(history.redo, args.edits)
+            # As edições mais recentes são as que mantêm o delta: são as primeiras a serem desfeitas
+            recent = sum(undo[:kept]) / kept if kept else float("nan")
+            print(f"{size:>4}x{size:<4} {ratio:>9.2f}x {kept:>7} {len(history._keyframes):>8} "
+                  f"{recent:>17.2f} {sum(undo) / len(undo):>14.2f} {sum(redo) / len(redo):>13.2f}")
+            if kept == 0:
+                failures.append(f"{size}x{size} com orçamento {ratio:.2f}x")
+
+    if failures:
+        sys.exit("Nenhum delta mantido: " + ", ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_import_time.py
+"""
+Mede o tempo de inicialização (importação) do caminho da GUI e do núcleo sem GUI.
+
+Cada cenário roda em um processo Python novo; o resultado é a mediana de --runs execuções,
+junto com as bibliotecas pesadas que ficaram carregadas ao final.
+
+Uso:
+    python benchmarks/bench_import_time.py [--runs 7]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("tkinter", "customtkinter", "PIL.Image", "numpy", "colorthief")
+
+SCENARIOS = {
+    "núcleo (import sprite_core)": "import sprite_core",
+    "núcleo + replace_color": "import sprite_core; sprite_core.replace_color",
+    "núcleo + get_color_palette": "import sprite_core; sprite_core.get_color_palette",
+    "CLI (cli.py --help)": "import sys; sys.argv = ['cli.py', '--help']\ntry:\n    import cli; cli.main()\nexcept SystemExit:\n    pass",
+    "GUI (import app)": "import app",
+}
+
+PROBE = """
+import sys, time
+_start = time.perf_counter()
+{code}
+_elapsed = time.perf_counter() - _start
+print("@@", _elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def run_scenario(code: str) -> tuple:
+    """Executa o código em um processo novo e retorna (segundos, módulos pesados carregados)."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("@@"):
+            _, seconds, modules = (line.split(" ", 2) + [""])[:3]
+            return float(seconds), modules
+    raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "sem saída")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'cenário':<30} {'mediana (ms)':>13}  módulos carregados")
+    for name, code in SCENARIOS.items():
+        try:
+            samples = [run_scenario(code) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{name:<30} {'-':>13}  indisponível: {e}")
+            continue
+        median = statistics.median(seconds for seconds, _ in samples)
+        print(f"{name:<30} {median * 1000:>13.1f}  {samples[-1][1] or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_png_output.py
+"""
+Compara os presets de gravação de PNG (sprite_core.png_writer) na divisão de uma folha
+sintética: bytes escritos, blocos indexados e tempo de codificação.
+
+Uso:
+    python benchmarks/bench_png_output.py [--size 2048] [--block 32] [--colors 24] [--presets none fast balanced smallest]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sprite_core import PNG_PRESETS
+from sprite_core.image_processor import process_and_save_blocks
+from sprite_core.png_writer import SaveStats
+
+
+def make_sheet(size: int, colors: int, seed: int = 0) -> Image.Image:
+    """Folha com áreas de cor sólida (pixels 4x4) e fundo transparente, como pixel art ampliada."""
+    rng = np.random.default_rng(seed)
+    palette = rng.integers(0, 256, size=(colors, 4), dtype=np.uint8)
+    palette[:, 3] = 255
+    palette[0] = 0
+    indices = rng.integers(0, colors, size=(size // 4, size // 4))
+    return Image.fromarray(palette[indices]).resize((size, size), Image.Resampling.NEAREST)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--block", type=int, default=32)
+    parser.add_argument("--colors", type=int, default=24)
+    parser.add_argument("--presets", nargs="+", choices=PNG_PRESETS, default=list(PNG_PRESETS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sheet_path = os.path.join(tmp, "sheet.png")
+        make_sheet(args.size, args.colors).save(sheet_path)
+
+        print(f"{'preset':>9} {'total (s)':>10} {'codif. (s)':>11} {'KB':>10} {'indexados':>10}")
+        for preset in args.presets:
+            output = os.path.join(tmp, preset)
+            os.mkdir(output)
+            stats = SaveStats()
+            start = time.perf_counter()
+            process_and_save_blocks(sheet_path, output, "tile", args.block, 1, None, png_options=preset, png_stats=stats)
+            total = time.perf_counter() - start
+            print(f"{preset:>9} {total:>10.3f} {stats.encode_seconds:>11.3f} {stats.bytes_written / 1024:>10.1f} {stats.indexed:>6}/{stats.files}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_replace_color.py
+"""
+Compara o replace_color vetorizado com a implementação antiga (laço por pixel).
+
+Uso:
+    python benchmarks/bench_replace_color.py [--sizes 256 512 1024] [--tolerances 0 30 80] [--skip-loop-above 1024]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sprite_core.image_editor import replace_color
+
+
+def replace_color_loop(image: Image.Image, old_color_rgb: Tuple[int, int, int], new_color_rgb: Tuple[int, int, int], tolerance: int = 30) -> Image.Image:
+    """Implementação original, mantida apenas como referência para o benchmark."""
+    img_copy = image.copy().convert("RGBA")
+    data = img_copy.load()
+    width, height = img_copy.size
+
+    for y in range(height):
+        for x in range(width):
+            r, g, b, a = data[x, y]
+            if ((r - old_color_rgb[0])**2 + (g - old_color_rgb[1])**2 + (b - old_color_rgb[2])**2) ** 0.8 <= tolerance:
+                data[x, y] = new_color_rgb + (a,)
+
+    return img_copy
+
+
+def make_sheet(size: int, seed: int = 0) -> Image.Image:
+    """Gera uma folha sintética com poucas cores e áreas transparentes, como pixel art."""
+    rng = np.random.default_rng(seed)
+    palette = rng.integers(0, 256, size=(16, 4), dtype=np.uint8)
+    palette[:, 3] = 255
+    palette[0, 3] = 0
+    indices = rng.integers(0, len(palette), size=(size, size))
+    return Image.fromarray(palette[indices])
+
+
+def _time(func, *args) -> Tuple[float, Image.Image]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[128, 256, 512, 1024, 1920])
+    parser.add_argument("--tolerances", type=int, nargs="+", default=[0, 30, 80])
+    parser.add_argument("--skip-loop-above", type=int, default=1024, help="Não roda o laço antigo acima deste tamanho.")
+    args = parser.parse_args()
+
+    print(f"{'tamanho':>9} {'tol':>5} {'laço (s)':>10} {'numpy (s)':>10} {'ganho':>8} {'igual':>6}")
+    for size in args.sizes:
+        sheet = make_sheet(size)
+        old_color = tuple(int(c) for c in np.array(sheet)[0, 0, :3])
+        new_color = (255, 0, 255)
+        for tolerance in args.tolerances:
+            fast_time, fast = _time(replace_color, sheet, old_color, new_color, tolerance)
+            if size <= args.skip_loop_above:
+                loop_time, slow = _time(replace_color_loop, sheet, old_color, new_color, tolerance)
+                same = fast.tobytes() == slow.tobytes()
+                print(f"{size:>4}x{size:<4} {tolerance:>5} {loop_time:>10.3f} {fast_time:>10.4f} {loop_time / fast_time:>7.0f}x {str(same):>6}")
+            else:
+                print(f"{size:>4}x{size:<4} {tolerance:>5} {'-':>10} {fast_time:>10.4f} {'-':>8} {'-':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# benchmarks/bench_suite.py
+"""
+Suíte de benchmarks reprodutível sobre folhas sintéticas geradas a partir de uma semente.
+
+Parte de uma folha base e varia um parâmetro de cada vez (tamanho, bloco, fração de
+pixels transparentes, quantidade de cores e fração de blocos duplicados), medindo as
+operações principais do sprite_core:
+
+    split        process_and_save_blocks (um PNG por bloco)
+    split_dedup  process_and_save_blocks com dedup
+    recolor      replace_color (imagem já carregada)
+    edit         EditHistory: abertura do histórico e uma substituição de cores, como na GUI
+    save         save_png da imagem já carregada (preset padrão)
+    palette      get_color_palette (imagem já carregada)
+    convert      convert_image_type (PNG -> --convert-format)
+
+Cada medição roda em um processo novo (spawn), para que o pico de memória seja só o da
+operação: no Linux o pico de RSS (VmHWM) é zerado antes de cada repetição; em outros
+sistemas vale o ru_maxrss do processo. O tempo é o menor de --repeat execuções.
+O resultado vai para um JSON (--output) com a versão do código, das bibliotecas e da
+máquina; --compare mostra a razão de tempo e memória em relação a um resultado anterior.
+
+Uso:
+    python benchmarks/bench_suite.py [--quick] [--output bench_results.json] [--compare anterior.json]
+    python benchmarks/bench_suite.py --sizes 1024 8192 --tiles 32 --ops split recolor --repeat 5
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+OPS = ("split", "split_dedup", "recolor", "edit", "save", "palette", "convert")
+# Folha base; cada eixo abaixo varia um dos parâmetros mantendo os demais
+BASE = {"size": 2048, "tile": 32, "transparent": 0.3, "colors": 32, "duplicates": 0.5}
+AXES = {
+    "size": [512, 1024, 2048, 4096, 8192],
+    "tile": [16, 32, 64, 128],
+    "transparent": [0.0, 0.3, 0.9],
+    "colors": [4, 32, 256, 4096],
+    "duplicates": [0.0, 0.5, 0.95],
+}
+# Opção da linha de comando que substitui os valores de cada eixo
+AXIS_OPTIONS = {"size": "sizes", "tile": "tiles", "transparent": "transparency", "colors": "colors", "duplicates": "duplicates"}
+QUICK_MAX_SIZE = 1024
+# Blocos gerados por vez (limita os temporários da geração das folhas de 8k)
+TILE_CHUNK = 4096
+
+
+def make_sheet(size: int, tile: int, transparent: float, colors: int, duplicates: float, cell: int = 2, seed: int = 0) -> np.ndarray:
+    """
+    Folha RGBA (size x size) de blocos tile x tile desenhados em células cell x cell, como
+    pixel art ampliada: cada célula tem uma das `colors` cores ou é transparente (com
+    probabilidade `transparent`). Uma fração `duplicates` dos blocos repete outros blocos
+    da folha, em posições embaralhadas.
+    """
+    rng = np.random.default_rng(seed)
+    palette = rng.integers(0, 256, size=(colors, 4), dtype=np.uint8)
+    palette[:, 3] = 255
+    per_row = size // tile
+    total = per_row * per_row
+    unique = max(1, round(total * (1 - duplicates)))
+    order = np.concatenate([np.arange(unique), rng.integers(0, unique, total - unique)])
+    rng.shuffle(order)
+
+    cells = max(1, tile // cell)
+    tiles = np.empty((unique, tile, tile, 4), dtype=np.uint8)
+    for start in range(0, unique, TILE_CHUNK):
+        count = min(TILE_CHUNK, unique - start)
+        indices = rng.integers(0, colors, size=(count, cells, cells), dtype=np.uint16)
+        pixels = palette[indices]
+        pixels[rng.random((count, cells, cells), dtype=np.float32) < transparent] = 0
+        tiles[start:start + count] = pixels.repeat(tile // cells, axis=1).repeat(tile // cells, axis=2)
+
+    sheet = np.empty((size, size, 4), dtype=np.uint8)
+    for row in range(per_row):
+        picked = tiles[order[row * per_row:(row + 1) * per_row]]
+        sheet[row * tile:(row + 1) * tile] = picked.transpose(1, 0, 2, 3).reshape(tile, size, 4)
+    return sheet
+
+
+def build_cases(args: argparse.Namespace) -> List[dict]:
+    """Folha base mais uma variação por valor de cada eixo, sem repetições."""
+    axes = {name: getattr(args, AXIS_OPTIONS[name]) or values for name, values in AXES.items()}
+    if args.quick:
+        axes["size"] = [s for s in axes["size"] if s <= QUICK_MAX_SIZE]
+    base = dict(BASE, size=min(BASE["size"], max(axes["size"])))
+    cases = []
+    for name, values in axes.items():
+        for value in values:
+            case = dict(base, **{name: value})
+            if case["size"] % case["tile"] == 0 and case not in cases:
+                cases.append(case)
+    return cases
+
+
+def case_key(case: dict) -> str:
+    return "size={size} tile={tile} transp={transparent} cores={colors} dup={duplicates}".format(**case)
+
+
+def _reset_peak() -> bool:
+    """Zera o pico de RSS do processo (Linux 4.0+); False se não for possível."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _memory_kb() -> Dict[str, int]:
+    """RSS atual e pico (VmRSS/VmHWM) em KB; sem /proc, o ru_maxrss serve para os dois."""
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f)
+        return {"rss": int(fields["VmRSS"].split()[0]), "peak": int(fields["VmHWM"].split()[0])}
+    except (OSError, KeyError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss vem em bytes no macOS e em KB nos demais
+        peak = peak // 1024 if sys.platform == "darwin" else peak
+        return {"rss": peak, "peak": peak}
+
+
+def run_op(op: str, sheet_path: str, case: dict, repeat: int, workers: Optional[int], convert_format: str) -> dict:
+    """Executa a operação `repeat` vezes neste processo (um processo novo por medição) e devolve os tempos e o pico de memória."""
+    from sprite_core.color_palette_generator import get_color_palette
+    from sprite_core.edit_history import EditHistory
+    from sprite_core.file_conversor import convert_image_type
+    from sprite_core.image_editor import replace_color
+    from sprite_core.image_processor import process_and_save_blocks
+    from sprite_core.png_writer import save_png
+
+    image = None
+    if op in ("recolor", "edit", "save", "palette"):
+        image = Image.open(sheet_path)
+        image.load()
+        old_color = next(color[:3] for _, color in sorted(image.getcolors(1 << 24), reverse=True) if color[3])
+
+    seconds, peaks, extras, outputs = [], [], [], 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as out:
+            _reset_peak()
+            before = _memory_kb()
+            start = time.perf_counter()
+            if op == "split":
+                result = process_and_save_blocks(sheet_path, out, "tile", case["tile"], 1, None, workers)
+            elif op == "split_dedup":
+                result = process_and_save_blocks(sheet_path, out, "tile", case["tile"], 1, None, workers, dedup=True)
+            elif op == "recolor":
+                result = replace_color(image, old_color, (255, 0, 255), 30)
+            elif op == "edit":
+                result = EditHistory(image).recolor([(old_color, (255, 0, 255), 30)])
+            elif op == "save":
+                result = save_png(image, os.path.join(out, "imagem.png"))
+            elif op == "palette":
+                result = get_color_palette(image, 24)
+            else:
+                result = convert_image_type(sheet_path, out, "convertido", convert_format)
+            seconds.append(time.perf_counter() - start)
+            after = _memory_kb()
+            peaks.append(after["peak"])
+            extras.append(max(0, after["peak"] - before["rss"]))
+            outputs = len(result) if op.startswith("split") else 1
+            del result
+
+    return {
+        "seconds": min(seconds),
+        "median_seconds": statistics.median(seconds),
+        "runs": seconds,
+        "peak_mb": max(peaks) / 1024,
+        "peak_extra_mb": max(extras) / 1024,
+        "megapixels_per_second": case["size"] * case["size"] / 1e6 / min(seconds),
+        "outputs": outputs,
+    }
+
+
+def environment() -> dict:
+    """Versões do código, das bibliotecas e da máquina, para comparar resultados entre execuções."""
+    import PIL
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results: List[dict], baseline_path: str) -> None:
+    """Razão de tempo e de pico de memória (atual / anterior) para cada medição presente nos dois arquivos."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["case_key"], r["op"]): r for r in json.load(f)["results"]}
+    print(f"\nComparação com {baseline_path} (razão atual/anterior; < 1 é melhor)")
+    print(f"{'folha':<52} {'operação':<12} {'tempo':>7} {'memória':>8}")
+    for result in results:
+        old = baseline.get((result["case_key"], result["op"]))
+        if old:
+            time_ratio = result["seconds"] / old["seconds"]
+            memory_ratio = result["peak_extra_mb"] / old["peak_extra_mb"] if old["peak_extra_mb"] else float("nan")
+            print(f"{result['case_key']:<52} {result['op']:<12} {time_ratio:>6.2f}x {memory_ratio:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", help=f"Lados das folhas (padrão: {AXES['size']}).")
+    parser.add_argument("--tiles", type=int, nargs="+", help=f"Tamanhos de bloco (padrão: {AXES['tile']}).")
+    parser.add_argument("--transparency", type=float, nargs="+", help=f"Frações de pixels transparentes (padrão: {AXES['transparent']}).")
+    parser.add_argument("--colors", type=int, nargs="+", help=f"Quantidades de cores (padrão: {AXES['colors']}).")
+    parser.add_argument("--duplicates", type=float, nargs="+", help=f"Frações de blocos duplicados (padrão: {AXES['duplicates']}).")
+    parser.add_argument("--ops", nargs="+", choices=OPS, default=list(OPS))
+    parser.add_argument("--quick", action="store_true", help=f"Só folhas de até {QUICK_MAX_SIZE}px.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, help="Threads de codificação do split (padrão: número de CPUs).")
+    parser.add_argument("--convert-format", default="webp")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json", help="Arquivo JSON com os resultados.")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparação.")
+    args = parser.parse_args()
+
+    cases = build_cases(args)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    print(f"{'folha':<52} {'operação':<12} {'mín. (s)':>9} {'MP/s':>8} {'pico (MB)':>10} {'+op (MB)':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in cases:
+            sheet_path = os.path.join(tmp, "sheet.png")
+            Image.fromarray(make_sheet(**case, seed=args.seed)).save(sheet_path, compress_level=1)
+            for op in args.ops:
+                # Um processo por medição: o pico de memória de uma não contamina a seguinte
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    measured = executor.submit(run_op, op, sheet_path, case, args.repeat, args.workers, args.convert_format).result()
+                result = {"case_key": case_key(case), "case": case, "op": op, **measured}
+                results.append(result)
+                print(f"{result['case_key']:<52} {op:<12} {result['seconds']:>9.3f} {result['megapixels_per_second']:>8.1f} "
+                      f"{result['peak_mb']:>10.1f} {result['peak_extra_mb']:>9.1f}")
+
+    report = {"environment": environment(), "settings": {k: v for k, v in vars(args).items() if k not in ("output", "compare")}, "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"\nResultados salvos em {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
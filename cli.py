@@ -0,0 +1,283 @@
+# cli.py
+"""
+Interface de linha de comando (sem GUI) do Editor de Sprites.
+
+Exemplos:
+    python cli.py split "sheets/*.png" -o out --block 16 --scale 4 --jobs 8 --manifest manifest.jsonl
+    python cli.py slice sheet.png -o out --padding 1 --merge-distance 2
+    python cli.py animate walk.png -o out --block 32 --scale 2 --format gif --duration 80 --pingpong
+    python cli.py convert sheets/ -o out --format webp
+    python cli.py resize "icons/*.png" -o out --scale 4 --method scale2x
+    python cli.py recolor hero.png -o out --map "#ff0000=#00ff00" --map "#0000ff=#ffff00:10" --metric ciede2000
+    python cli.py palette sheets/ --colors 16 --manifest -
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# Pillow, numpy e colorthief só são carregados quando uma operação roda
+import sprite_core
+from sprite_core.profiling import PROFILER
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """Expande arquivos, pastas (imagens diretamente dentro delas) e globs (com suporte a **)."""
+    paths: List[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = sprite_core.list_images([pattern])
+        elif glob.has_magic(pattern):
+            found = [path for path in sorted(glob.glob(pattern, recursive=True)) if os.path.isfile(path)]
+        else:
+            found = [pattern]
+        paths.extend(found)
+    return list(dict.fromkeys(paths))
+
+
+def parse_color_edit(text: str) -> Tuple[Tuple[int, int, int], Tuple[int, int, int], float]:
+    """Lê uma substituição no formato '#antiga=#nova' ou '#antiga=#nova:tolerância'."""
+    try:
+        old_hex, rest = text.split("=", 1)
+        new_hex, _, tolerance = rest.partition(":")
+        return sprite_core.hex_to_rgb(old_hex.strip()), sprite_core.hex_to_rgb(new_hex.strip()), float(tolerance) if tolerance else 30
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Substituição inválida: '{text}' (use #antiga=#nova[:tolerância])")
+
+
+def _stem(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+# As tarefas abaixo rodam nos processos do pool: recebem apenas valores serializáveis
+# e retornam a lista de arquivos gerados (ou o resultado, no caso da paleta).
+
+def _task_split(path: str, args: argparse.Namespace) -> dict:
+    stats = sprite_core.SaveStats()
+    name = _stem(path)
+    if args.name:
+        name = f"{args.name}_{name}" if args.multiple_inputs else args.name
+    outputs = sprite_core.process_and_save_blocks(
+        path, args.output, name, args.block, args.scale, None,
+        workers=1 if args.jobs > 1 else None,
+        dedup=args.dedup, match_transforms=args.match_transforms, atlas=args.atlas,
+        png_options=args.png, png_stats=stats
+    )
+    return {"outputs": outputs, "png": stats.as_dict()}
+
+
+def _task_slice(path: str, args: argparse.Namespace) -> dict:
+    stats = sprite_core.SaveStats()
+    outputs = sprite_core.auto_slice(
+        path, args.output, _stem(path), args.scale, args.padding, args.merge_distance,
+        workers=1 if args.jobs > 1 else None, png_options=args.png, png_stats=stats
+    )
+    return {"outputs": outputs, "sprites": len(outputs) - 1, "png": stats.as_dict()}
+
+
+def _task_animate(path: str, args: argparse.Namespace) -> dict:
+    extension = "png" if args.format == "apng" else args.format
+    output = sprite_core.export_animation(
+        path, os.path.join(args.output, f"{_stem(path)}.{extension}"), args.block, args.scale,
+        args.duration, args.order, args.reverse, args.pingpong
+    )
+    return {"outputs": [output], "bytes": os.path.getsize(output)}
+
+
+def _task_convert(path: str, args: argparse.Namespace) -> dict:
+    output = sprite_core.convert_image_type(path, args.output, _stem(path), args.format, args.png)
+    return {"outputs": [output], "bytes": os.path.getsize(output)}
+
+
+def _task_resize(path: str, args: argparse.Namespace) -> dict:
+    stats = sprite_core.SaveStats()
+    output = sprite_core.resize_file(
+        path, args.output, None, args.width, args.height, args.scale, args.method,
+        not args.no_keep_aspect, args.png, stats
+    )
+    return {"outputs": [output], "png": stats.as_dict()}
+
+
+def _task_recolor(path: str, args: argparse.Namespace) -> dict:
+    output = os.path.join(args.output, os.path.basename(path))
+    if os.path.abspath(output) == os.path.abspath(path):
+        raise ValueError("A pasta de saída não pode ser a mesma da imagem de entrada.")
+    from PIL import Image
+    with Image.open(path) as image:
+        indexed = sprite_core.IndexedImage.from_image(image)
+        if indexed is not None:
+            # Até 256 cores: só a paleta é alterada e a saída continua indexada
+            result = indexed.recolor(args.map, args.metric).image
+        else:
+            result = sprite_core.replace_colors(image, args.map, args.metric)
+    sprite_core.save_image(result, output, args.png)
+    return {"outputs": [output], "indexed": indexed is not None}
+
+
+def _task_palette(path: str, args: argparse.Namespace) -> dict:
+    from PIL import Image
+    with Image.open(path) as image:
+        palette = sprite_core.get_color_palette(image, args.colors, args.min_distance, args.method, args.metric)
+    return {"palette": palette}
+
+
+def _run_task(task: Callable[[str, argparse.Namespace], dict], path: str, args: argparse.Namespace) -> dict:
+    """Executa uma tarefa e devolve o registro do manifesto (nunca lança exceção)."""
+    start = time.perf_counter()
+    record = {"command": args.command, "input": path}
+    PROFILER.enabled = bool(args.profile or args.trace)
+    profile_start = PROFILER.mark()
+    try:
+        record.update(task(path, args))
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    if PROFILER.enabled and os.getpid() != args.parent_pid:
+        # Rodando em um processo do pool: os spans voltam ao processo principal junto com o registro
+        record["spans"] = PROFILER.spans(profile_start)
+    return record
+
+
+def run(args: argparse.Namespace) -> int:
+    """Processa todas as entradas, escrevendo um registro JSON por linha no manifesto assim que cada uma termina."""
+    task = TASKS[args.command]
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Nenhuma imagem encontrada.", file=sys.stderr)
+        return 2
+    args.multiple_inputs = len(paths) > 1
+    args.parent_pid = os.getpid()
+    PROFILER.enabled = bool(args.profile or args.trace)
+    if getattr(args, "output", None):
+        os.makedirs(args.output, exist_ok=True)
+
+    manifest = None
+    if args.manifest == "-":
+        manifest = sys.stdout
+    elif args.manifest:
+        manifest = open(args.manifest, "w", encoding="utf-8")
+
+    failures = 0
+    try:
+        def emit(record: dict) -> None:
+            nonlocal failures
+            failures += record["status"] != "ok"
+            PROFILER.extend(record.pop("spans", []))
+            if manifest:
+                manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+                manifest.flush()
+            if manifest is not sys.stdout:
+                detail = record.get("error") or f"{record['seconds']}s"
+                print(f"[{record['status']}] {record['input']} ({detail})", file=sys.stderr)
+
+        if args.jobs <= 1:
+            for path in paths:
+                emit(_run_task(task, path, args))
+        else:
+            with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+                futures = [executor.submit(_run_task, task, path, args) for path in paths]
+                for future in as_completed(futures):
+                    emit(future.result())
+    finally:
+        if manifest and manifest is not sys.stdout:
+            manifest.close()
+        if args.profile:
+            PROFILER.export_json(args.profile)
+        if args.trace:
+            PROFILER.export_chrome_trace(args.trace)
+        if PROFILER.enabled:
+            print(PROFILER.format_summary(), file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+TASKS = {
+    "split": _task_split,
+    "slice": _task_slice,
+    "animate": _task_animate,
+    "convert": _task_convert,
+    "resize": _task_resize,
+    "recolor": _task_recolor,
+    "palette": _task_palette,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Editor de Sprites em modo texto (sem GUI).")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="+", help="Arquivos, pastas ou globs (ex.: 'sheets/**/*.png').")
+    common.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Número de processos (padrão: número de CPUs).")
+    common.add_argument("--png", choices=sprite_core.PNG_PRESETS, default="balanced", help="Gravação dos PNGs: none (save padrão), fast, balanced ou smallest.")
+    common.add_argument("--profile", help="Salva os tempos de cada etapa (spans e resumo) neste arquivo JSON.")
+    common.add_argument("--trace", help="Salva os tempos no formato de trace do Chrome (chrome://tracing, Perfetto).")
+    common.add_argument("--manifest", help="Arquivo JSON Lines com um registro por entrada ('-' para a saída padrão).")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    split = sub.add_parser("split", parents=[common], help="Divide folhas de sprites em blocos.")
+    split.add_argument("-o", "--output", required=True, help="Pasta de saída.")
+    split.add_argument("--block", type=int, default=16, help="Tamanho do bloco em pixels.")
+    split.add_argument("--scale", type=int, default=1, help="Fator de escala dos blocos.")
+    split.add_argument("--name", help="Prefixo dos arquivos (padrão: nome da imagem; com várias entradas, o nome da imagem é acrescentado).")
+    split.add_argument("--dedup", action="store_true", help="Salva blocos repetidos uma única vez e gera o tilemap.")
+    split.add_argument("--match-transforms", action="store_true", help="No dedup, considera giros/espelhamentos.")
+    split.add_argument("--atlas", action="store_true", help="Gera atlas empacotados em vez de um PNG por bloco.")
+
+    slice_ = sub.add_parser("slice", parents=[common], help="Divide folhas irregulares detectando os sprites pelo canal alpha.")
+    slice_.add_argument("-o", "--output", required=True, help="Pasta de saída.")
+    slice_.add_argument("--scale", type=int, default=1, help="Fator de escala dos sprites.")
+    slice_.add_argument("--padding", type=int, default=0, help="Margem (px) acrescentada em volta de cada sprite.")
+    slice_.add_argument("--merge-distance", type=int, default=0, help="Une partes separadas por até N pixels transparentes.")
+
+    animate = sub.add_parser("animate", parents=[common], help="Exporta os blocos não vazios como animação, sem arquivos intermediários.")
+    animate.add_argument("-o", "--output", required=True, help="Pasta de saída.")
+    animate.add_argument("-f", "--format", choices=["gif", "apng", "webp"], default="gif", help="Formato da animação.")
+    animate.add_argument("--block", type=int, default=16, help="Tamanho de cada quadro em pixels.")
+    animate.add_argument("--scale", type=int, default=1, help="Fator de escala dos quadros.")
+    animate.add_argument("--duration", type=int, default=100, help="Duração de cada quadro (ms).")
+    animate.add_argument("--order", choices=["rows", "columns"], default="rows", help="Ordem de leitura dos quadros.")
+    animate.add_argument("--reverse", action="store_true", help="Inverte a ordem dos quadros.")
+    animate.add_argument("--pingpong", action="store_true", help="Acrescenta os quadros de volta (ida e volta).")
+
+    convert = sub.add_parser("convert", parents=[common], help="Converte o formato das imagens.")
+    convert.add_argument("-o", "--output", required=True, help="Pasta de saída.")
+    convert.add_argument("-f", "--format", required=True, help="Formato de destino (png, jpg, bmp, tiff, gif, webp...).")
+
+    resize = sub.add_parser("resize", parents=[common], help="Redimensiona imagens (vizinho mais próximo, fator inteiro ou scale2x/scale3x).")
+    resize.add_argument("-o", "--output", required=True, help="Pasta de saída.")
+    resize.add_argument("--width", type=int, help="Nova largura (px).")
+    resize.add_argument("--height", type=int, help="Nova altura (px).")
+    resize.add_argument("--scale", type=float, help="Fator de escala (no lugar de --width/--height).")
+    resize.add_argument("--method", choices=sprite_core.RESIZE_METHODS, default="nearest", help="Algoritmo de redimensionamento.")
+    resize.add_argument("--no-keep-aspect", action="store_true", help="Usa --width e --height exatamente, sem manter a proporção.")
+
+    recolor = sub.add_parser("recolor", parents=[common], help="Substitui cores.")
+    recolor.add_argument("-o", "--output", required=True, help="Pasta de saída.")
+    recolor.add_argument("--map", type=parse_color_edit, action="append", required=True, help="Substituição '#antiga=#nova[:tolerância]' (pode repetir).")
+    recolor.add_argument("--metric", choices=sprite_core.COLOR_METRICS, default="legacy", help="Métrica de distância usada pela tolerância.")
+
+    palette = sub.add_parser("palette", parents=[common], help="Extrai a paleta de cores.")
+    palette.add_argument("--colors", type=int, default=24, help="Número máximo de cores.")
+    palette.add_argument("--min-distance", type=float, default=20, help="Distância mínima entre as cores.")
+    palette.add_argument("--method", choices=["auto", "median_cut", "colorthief"], default="auto")
+    palette.add_argument("--metric", choices=sprite_core.COLOR_METRICS, default="rgb", help="Métrica de distância usada por --min-distance.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "palette" and not args.manifest:
+        args.manifest = "-"
+    return run(args)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
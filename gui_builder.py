@@ -1,4 +1,7 @@
 import customtkinter as ctk
+import tkinter
+
+import sprite_core
 
 class GUIBuilder:
     """
@@ -29,6 +32,12 @@ class GUIBuilder:
         btn_folder = ctk.CTkButton(app.frame_controles, text="Escolher Pasta de Saída", height=35, command=controller.handle_choose_folder, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER)
         btn_folder.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
 
+        png_frame = ctk.CTkFrame(app.frame_controles, fg_color="transparent")
+        png_frame.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
+        png_frame.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(png_frame, text="Saída PNG:").grid(row=0, column=0, padx=(0, 5), sticky="w")
+        ctk.CTkOptionMenu(png_frame, values=list(sprite_core.PNG_PRESETS), variable=controller.png_preset_var, fg_color=controller.COLOR_SECONDARY_BUTTON, button_color=controller.COLOR_SECONDARY_HOVER).grid(row=0, column=1, sticky="ew")
+
         controller.log_label = ctk.CTkLabel(app.frame_controles, text="", text_color="white", anchor="w")
         controller.log_label.grid(row=6, column=0, padx=20, pady=(50, 0), sticky="ew")
 
@@ -51,29 +60,43 @@ class GUIBuilder:
         tab_log = controller.tabview.add("Log de Atividades")
         tab_split = controller.tabview.add("Divisor de Sprites")
         tab_convert = controller.tabview.add("Conversor de Formato")
-        # tab_resize = controller.tabview.add("Redimensionar Imagem")
+        tab_resize = controller.tabview.add("Redimensionar Imagem")
         tab_palette = controller.tabview.add("Gerador de Paleta de Cores")
         
         GUIBuilder._create_log_tab_widgets(tab_log, controller)
         GUIBuilder._create_split_tab_widgets(tab_split, controller)
         GUIBuilder._create_convert_tab_widgets(tab_convert, controller)
-        # GUIBuilder._create_resize_tab_widgets(tab_resize, controller)
+        GUIBuilder._create_resize_tab_widgets(tab_resize, controller)
         GUIBuilder._create_palette_tab_widgets(tab_palette, controller)
 
-        # controller.progressbar = ctk.CTkProgressBar(app.main_frame, fg_color=controller.COLOR_FRAME, progress_color=controller.COLOR_PRIMARY_BUTTON)
-        # controller.progressbar.set(0)
-        # controller.progressbar.grid(row=1, column=0, sticky="ew", pady=(10, 0), padx=5)
+        controller.progress_frame = ctk.CTkFrame(app.main_frame, fg_color="transparent")
+        controller.progress_frame.grid(row=1, column=0, sticky="ew", pady=(10, 0), padx=5)
+        controller.progress_frame.grid_columnconfigure(0, weight=1)
+        controller.progressbar = ctk.CTkProgressBar(controller.progress_frame, fg_color=controller.COLOR_FRAME, progress_color=controller.COLOR_PRIMARY_BUTTON)
+        controller.progressbar.set(0)
+        controller.progressbar.grid(row=0, column=0, sticky="ew")
+        ctk.CTkButton(
+            controller.progress_frame, text="✖ Cancelar", width=90,
+            command=controller.handle_cancel_jobs,
+            fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER
+        ).grid(row=0, column=1, padx=(10, 0))
+        controller.progress_frame.grid_remove()
         
         # controller.status_label = ctk.CTkLabel(app.main_frame, text="", text_color=controller.COLOR_SUCCESS)
         # controller.status_label.grid(row=2, column=0, sticky="sw", padx=5)
         
-        # controller.progressbar.grid_remove()
         # controller.status_label.grid_remove()
 
 
     @staticmethod
     def _create_log_tab_widgets(tab, controller):
         """Cria e posiciona os widgets dentro da aba Log de Atividades."""
+        profiling_frame = ctk.CTkFrame(tab, fg_color="transparent")
+        profiling_frame.pack(side="bottom", fill="x", pady=(5, 0))
+        ctk.CTkCheckBox(profiling_frame, text="Medir tempos", variable=controller.profiling_var, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).pack(side="left")
+        ctk.CTkButton(profiling_frame, text="Limpar tempos", width=110, command=controller.handle_clear_profile, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).pack(side="right")
+        ctk.CTkButton(profiling_frame, text="⏱ Exportar tempos...", width=150, command=controller.handle_export_profile, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).pack(side="right", padx=(0, 10))
+
         controller.log_textbox = ctk.CTkTextbox(tab, text_color=controller.COLOR_TEXT, fg_color="transparent", activate_scrollbars=True)
         controller.log_textbox.pack(padx=0, pady=0, expand=True, fill="both")
 
@@ -116,7 +139,30 @@ class GUIBuilder:
         controller.output_name_processor = output_name_entry
 
         controller.btn_execute = ctk.CTkButton(controls_frame, text="✨ Dividir Imagem", height=40, font=ctk.CTkFont(size=16, weight="bold"), command=controller.handle_split_image, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER) 
-        controller.btn_execute.grid(row=4, column=0, columnspan=2, padx=0, pady=10, sticky="ew")
+        controller.btn_execute.grid(row=6, column=0, columnspan=2, padx=0, pady=10, sticky="ew")
+
+        ctk.CTkCheckBox(controls_frame, text="Remover blocos duplicados", variable=controller.dedup_var, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=4, column=0, padx=(0, 5), pady=(0, 5), sticky="w")
+        ctk.CTkCheckBox(controls_frame, text="Considerar giros/espelhamentos", variable=controller.dedup_transforms_var, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=4, column=1, padx=(5, 0), pady=(0, 5), sticky="w")
+        ctk.CTkCheckBox(controls_frame, text="Gerar atlas único (PNG + JSON)", variable=controller.atlas_var, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=5, column=0, padx=(0, 5), pady=(5, 0), sticky="w")
+
+        slice_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
+        slice_frame.grid(row=5, column=1, padx=(5, 0), pady=(5, 0), sticky="ew")
+        ctk.CTkCheckBox(slice_frame, text="Detectar sprites (sem grade)", variable=controller.auto_slice_var, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=0, column=0, padx=(0, 5), sticky="w")
+        ctk.CTkLabel(slice_frame, text="Margem:").grid(row=0, column=1, padx=(5, 2), sticky="w")
+        ctk.CTkEntry(slice_frame, textvariable=controller.slice_padding_var, width=40).grid(row=0, column=2, padx=(0, 5))
+        ctk.CTkLabel(slice_frame, text="União:").grid(row=0, column=3, padx=(5, 2), sticky="w")
+        ctk.CTkEntry(slice_frame, textvariable=controller.slice_merge_var, width=40).grid(row=0, column=4)
+
+        animation_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
+        animation_frame.grid(row=7, column=0, columnspan=2, sticky="ew")
+        animation_frame.grid_columnconfigure(4, weight=1)
+        ctk.CTkLabel(animation_frame, text="Animação:").grid(row=0, column=0, padx=(0, 5), sticky="w")
+        ctk.CTkOptionMenu(animation_frame, values=["gif", "apng", "webp"], variable=controller.animation_format_var, width=80, fg_color=controller.COLOR_SECONDARY_BUTTON, button_color=controller.COLOR_SECONDARY_HOVER).grid(row=0, column=1, padx=5)
+        ctk.CTkEntry(animation_frame, textvariable=controller.animation_duration_var, width=60).grid(row=0, column=2, padx=5)
+        ctk.CTkLabel(animation_frame, text="ms").grid(row=0, column=3, padx=(0, 5), sticky="w")
+        ctk.CTkCheckBox(animation_frame, text="Ida e volta", variable=controller.animation_pingpong_var, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=0, column=4, padx=5, sticky="w")
+        controller.btn_animation = ctk.CTkButton(animation_frame, text="🎞️ Exportar Animação", command=controller.handle_export_animation, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER)
+        controller.btn_animation.grid(row=0, column=5, padx=(5, 0), sticky="e")
 
 
 
@@ -154,6 +200,30 @@ class GUIBuilder:
         ctk.CTkButton(action_frame, text="🎨 Criar Paleta de Cores", height=40, font=ctk.CTkFont(size=16, weight="bold"), command=controller.handle_create_palette, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=0, column=0, padx=(0, 5), sticky="ew")
         ctk.CTkButton(action_frame, text="💾 Salvar Imagem Modificada", height=40, font=ctk.CTkFont(size=16, weight="bold"), command=controller.handle_save_modified_image, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).grid(row=0, column=1, padx=(5, 0), sticky="ew")
 
+        tolerance_frame = ctk.CTkFrame(action_frame, fg_color="transparent")
+        tolerance_frame.grid(row=1, column=0, padx=(0, 5), pady=(10, 0), sticky="ew")
+        tolerance_frame.grid_columnconfigure(1, weight=1)
+        controller.tolerance_label = ctk.CTkLabel(tolerance_frame, text=f"Tolerância: {controller.color_tolerance_var.get():.0f}", width=100, anchor="w")
+        controller.tolerance_label.grid(row=0, column=0, sticky="w")
+        ctk.CTkSlider(tolerance_frame, from_=0, to=100, number_of_steps=100, variable=controller.color_tolerance_var, button_color=controller.COLOR_PRIMARY_BUTTON, button_hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=0, column=1, sticky="ew")
+        ctk.CTkOptionMenu(tolerance_frame, values=list(sprite_core.COLOR_METRICS), variable=controller.color_metric_var, width=110, fg_color=controller.COLOR_SECONDARY_BUTTON, button_color=controller.COLOR_SECONDARY_HOVER).grid(row=0, column=2, padx=(5, 0))
+        ctk.CTkButton(action_frame, text="✔️ Aplicar Substituições", height=30, command=controller.handle_commit_color_edits, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).grid(row=1, column=1, padx=(5, 0), pady=(10, 0), sticky="ew")
+        ctk.CTkButton(action_frame, text="↶ Desfazer (Ctrl+Z)", height=30, command=controller.handle_undo, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).grid(row=2, column=0, padx=(0, 5), pady=(10, 0), sticky="ew")
+        ctk.CTkButton(action_frame, text="↷ Refazer (Ctrl+Y)", height=30, command=controller.handle_redo, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).grid(row=2, column=1, padx=(5, 0), pady=(10, 0), sticky="ew")
+        app = tab.winfo_toplevel()
+        app.bind("<Control-z>", lambda event: GUIBuilder._history_shortcut(event, controller.handle_undo))
+        app.bind("<Control-y>", lambda event: GUIBuilder._history_shortcut(event, controller.handle_redo))
+        app.bind("<Control-Shift-Z>", lambda event: GUIBuilder._history_shortcut(event, controller.handle_redo))
+
+
+    @staticmethod
+    def _history_shortcut(event, action):
+        """Atalho de desfazer/refazer da imagem; ignorado enquanto se digita em um campo de texto."""
+        # Os CTkEntry/CTkTextbox entregam o evento ao Entry/Text interno do tkinter
+        if isinstance(event.widget, (tkinter.Entry, tkinter.Text)):
+            return
+        action()
+
 
 
     @staticmethod
@@ -189,48 +259,59 @@ class GUIBuilder:
         output_name_entry.grid(row=1, column=1, padx=(5, 0), pady=10, sticky="ew")
         controller.output_name_conversor = output_name_entry
 
-        controller.btn_execute = ctk.CTkButton(controls_frame,text="↪️ Converter imagem",height=40,font=ctk.CTkFont(size=16, weight="bold"),command=controller._handle_convert_image, fg_color=controller.COLOR_PRIMARY_BUTTON,hover_color=controller.COLOR_PRIMARY_HOVER)
-        controller.btn_execute.grid(row=2, column=0, columnspan=2, padx=0, pady=10, sticky="ew")
-
-
-@staticmethod
-def _create_resize_tab_widgets(tab, controller):
-    """Cria e posiciona os widgets dentro da aba Redimensionar Imagem."""
-    tab.grid_columnconfigure(0, weight=1)
-    tab.grid_rowconfigure(0, weight=1)
-
-    # Frame de preview
-    preview_frame = ctk.CTkFrame(tab, fg_color="transparent")
-    preview_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=(10, 5))
-    preview_frame.grid_columnconfigure(0, weight=1)
-    preview_frame.grid_rowconfigure(0, weight=1)
-
-    controller.preview_label_resize = ctk.CTkLabel(preview_frame, text="Selecione uma imagem para ver o preview", text_color=controller.COLOR_TEXT)
-    controller.preview_label_resize.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
-
-    # Frame para os controles
-    controls_frame = ctk.CTkFrame(tab, fg_color="transparent")
-    controls_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=(5, 10))
-    controls_frame.grid_columnconfigure((0, 1), weight=1)
-
-    ctk.CTkLabel(controls_frame, text="Nova largura (px):").grid(row=0, column=0, padx=(10, 0), pady=(0, 0), sticky="w")
-    ctk.CTkLabel(controls_frame, text="Nova altura (px):").grid(row=1, column=0, padx=(10, 0), pady=(0, 0), sticky="w")
-
-    width_entry = ctk.CTkEntry(controls_frame)
-    width_entry.grid(row=0, column=1, padx=(5, 0), pady=10, sticky="ew")
-    controller.resize_width_entry = width_entry
-
-    height_entry = ctk.CTkEntry(controls_frame)
-    height_entry.grid(row=1, column=1, padx=(5, 0), pady=10, sticky="ew")
-    controller.resize_height_entry = height_entry
-
-    controller.btn_resize = ctk.CTkButton(
-        controls_frame,
-        text="⤢ Redimensionar Imagem",
-        height=40,
-        font=ctk.CTkFont(size=16, weight="bold"),
-        command=controller.handle_resize_image,
-        fg_color=controller.COLOR_PRIMARY_BUTTON,
-        hover_color=controller.COLOR_PRIMARY_HOVER
-    )
-    controller.btn_resize.grid(row=2, column=0, columnspan=2, padx=0, pady=10, sticky="ew")
\ No newline at end of file
+        controller.btn_convert = ctk.CTkButton(controls_frame,text="↪️ Converter imagem",height=40,font=ctk.CTkFont(size=16, weight="bold"),command=controller._handle_convert_image, fg_color=controller.COLOR_PRIMARY_BUTTON,hover_color=controller.COLOR_PRIMARY_HOVER)
+        controller.btn_convert.grid(row=2, column=0, columnspan=2, padx=0, pady=10, sticky="ew")
+
+        ctk.CTkButton(controls_frame, text="📂 Converter vários arquivos...", height=30, command=controller.handle_convert_batch, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).grid(row=3, column=0, columnspan=2, padx=0, pady=(0, 10), sticky="ew")
+
+
+    @staticmethod
+    def _create_resize_tab_widgets(tab, controller):
+        """Cria e posiciona os widgets dentro da aba Redimensionar Imagem."""
+        tab.grid_columnconfigure(0, weight=1)
+        tab.grid_rowconfigure(0, weight=1)
+
+        # Frame de preview
+        preview_frame = ctk.CTkFrame(tab, fg_color="transparent")
+        preview_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=(10, 5))
+        preview_frame.grid_columnconfigure(0, weight=1)
+        preview_frame.grid_rowconfigure(0, weight=1)
+
+        controller.preview_label_resize = ctk.CTkLabel(preview_frame, text="Selecione uma imagem para ver o preview", text_color=controller.COLOR_TEXT)
+        controller.preview_label_resize.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
+
+        # Frame para os controles
+        controls_frame = ctk.CTkFrame(tab, fg_color="transparent")
+        controls_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=(5, 10))
+        controls_frame.grid_columnconfigure((0, 1), weight=1)
+
+        ctk.CTkLabel(controls_frame, text="Nova largura (px):").grid(row=0, column=0, padx=(10, 0), pady=(0, 0), sticky="w")
+        ctk.CTkLabel(controls_frame, text="Nova altura (px):").grid(row=1, column=0, padx=(10, 0), pady=(0, 0), sticky="w")
+
+        width_entry = ctk.CTkEntry(controls_frame, textvariable=controller.resize_width_var)
+        width_entry.grid(row=0, column=1, padx=(5, 0), pady=10, sticky="ew")
+        controller.resize_width_entry = width_entry
+
+        height_entry = ctk.CTkEntry(controls_frame, textvariable=controller.resize_height_var)
+        height_entry.grid(row=1, column=1, padx=(5, 0), pady=10, sticky="ew")
+        controller.resize_height_entry = height_entry
+
+        ctk.CTkLabel(controls_frame, text="Método:").grid(row=2, column=0, padx=(10, 0), pady=(0, 0), sticky="w")
+        method_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
+        method_frame.grid(row=2, column=1, padx=(5, 0), pady=(0, 5), sticky="ew")
+        method_frame.grid_columnconfigure(0, weight=1)
+        ctk.CTkOptionMenu(method_frame, values=list(sprite_core.RESIZE_METHODS), variable=controller.resize_method_var, fg_color=controller.COLOR_SECONDARY_BUTTON, button_color=controller.COLOR_SECONDARY_HOVER).grid(row=0, column=0, sticky="ew")
+        ctk.CTkCheckBox(method_frame, text="Manter proporção", variable=controller.resize_keep_aspect_var, fg_color=controller.COLOR_PRIMARY_BUTTON, hover_color=controller.COLOR_PRIMARY_HOVER).grid(row=0, column=1, padx=(10, 0), sticky="w")
+
+        controller.btn_resize = ctk.CTkButton(
+            controls_frame,
+            text="⤢ Redimensionar Imagem",
+            height=40,
+            font=ctk.CTkFont(size=16, weight="bold"),
+            command=controller.handle_resize_image,
+            fg_color=controller.COLOR_PRIMARY_BUTTON,
+            hover_color=controller.COLOR_PRIMARY_HOVER
+        )
+        controller.btn_resize.grid(row=3, column=0, columnspan=2, padx=0, pady=10, sticky="ew")
+
+        ctk.CTkButton(controls_frame, text="📂 Redimensionar vários arquivos...", height=30, command=controller.handle_resize_batch, fg_color=controller.COLOR_SECONDARY_BUTTON, hover_color=controller.COLOR_SECONDARY_HOVER).grid(row=4, column=0, columnspan=2, padx=0, pady=(0, 10), sticky="ew")
@@ -0,0 +1,133 @@
+# job_scheduler.py
+
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class JobCancelled(Exception):
+    """Lançada dentro de um job quando ele é cancelado."""
+
+
+class Job:
+    """
+    Uma operação enviada ao JobScheduler.
+    A operação recebe o próprio job e usa `job.report` como callback de progresso,
+    que também é o ponto onde o cancelamento é verificado.
+    """
+    def __init__(self, job_id: int, name: str, scheduler: "JobScheduler", on_progress: Optional[Callable[[float], None]]) -> None:
+        self.id = job_id
+        self.name = name
+        self.status = "pending"
+        self.future: Optional[Future] = None
+        self._scheduler = scheduler
+        self._on_progress = on_progress
+        self._cancel_event = threading.Event()
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """Cancela o job: se ainda não começou, ele é descartado; se está rodando, para no próximo report."""
+        self._cancel_event.set()
+        if self.future:
+            self.future.cancel()
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled(self.name)
+
+    def report(self, progress: float) -> None:
+        """
+        Informa o progresso (de 0 a 1). As atualizações são enviadas à UI no máximo uma vez
+        a cada `progress_interval` segundos (além da final), para não inundar a fila de eventos.
+        """
+        self.check_cancelled()
+        if self._on_progress is None:
+            return
+        now = time.monotonic()
+        if progress < 1.0 and now - self._last_report < self._scheduler.progress_interval:
+            return
+        self._last_report = now
+        self._scheduler.dispatch(self._on_progress, progress)
+
+
+class JobScheduler:
+    """
+    Executa operações fora da thread da UI, em fila (na ordem de envio), e devolve os
+    resultados para a UI através de `dispatch` (por exemplo, `lambda f, *a: app.after(0, f, *a)`).
+    """
+    def __init__(self, dispatch: Callable[..., Any], max_workers: int = 1, progress_interval: float = 0.1) -> None:
+        self.dispatch = dispatch
+        self.progress_interval = progress_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._ids = itertools.count(1)
+        self._active: Dict[int, Job] = {}
+
+    @property
+    def idle(self) -> bool:
+        """Não há jobs na fila nem rodando."""
+        return not self._active
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args: Any,
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_done: Optional[Callable[[Job], None]] = None,
+        on_progress: Optional[Callable[[float], None]] = None,
+        **kwargs: Any
+    ) -> Job:
+        """
+        Coloca `func(job, *args, **kwargs)` na fila. Os callbacks rodam na thread da UI:
+        on_success(resultado) ou on_error(exceção) e, sempre, on_done(job) ao final
+        (com job.status igual a "done", "error" ou "cancelled").
+        """
+        job = Job(next(self._ids), name, self, on_progress)
+        callbacks = (on_success, on_error, on_done)
+        self._active[job.id] = job
+
+        def run() -> None:
+            job.status = "running"
+            try:
+                job.check_cancelled()
+                result = func(job, *args, **kwargs)
+            except JobCancelled:
+                self.dispatch(self._finish, job, "cancelled", None, None, callbacks)
+            except Exception as e:
+                self.dispatch(self._finish, job, "error", None, e, callbacks)
+            else:
+                self.dispatch(self._finish, job, "done", result, None, callbacks)
+
+        job.future = self._executor.submit(run)
+        job.future.add_done_callback(
+            lambda future: future.cancelled() and self.dispatch(self._finish, job, "cancelled", None, None, callbacks)
+        )
+        return job
+
+    def _finish(self, job: Job, status: str, result: Any, error: Optional[Exception], callbacks: tuple) -> None:
+        """Chamado na thread da UI quando um job termina."""
+        on_success, on_error, on_done = callbacks
+        job.status = status
+        self._active.pop(job.id, None)
+        if status == "done" and on_success:
+            on_success(result)
+        elif status == "error" and on_error:
+            on_error(error)
+        if on_done:
+            on_done(job)
+
+    def cancel_all(self) -> None:
+        """Cancela o job em execução e todos os que estão na fila."""
+        for job in list(self._active.values()):
+            job.cancel()
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
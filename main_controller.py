@@ -1,15 +1,37 @@
 import customtkinter as ctk
 import os
-import threading
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional, Union
 from PIL import Image, ImageOps, ImageDraw
 from tkinter import colorchooser, filedialog
 
-from image_processor import process_and_save_blocks
-from color_palette_generator import get_color_palette
-from file_conversor import convert_image_type
+import sprite_core
+from sprite_core.image_document import ImageCache, ImageDocument
+from sprite_core.profiling import PROFILER, span
+from job_scheduler import Job, JobScheduler
 from utils import update_log, open_output_folder, select_image_path, select_output_folder
-from image_editor import replace_color, hex_to_rgb
+
+if TYPE_CHECKING:
+    # numpy só é carregado na primeira edição
+    from sprite_core.edit_history import EditHistory, IndexedEditHistory
+
+
+class _EditSession:
+    """
+    Edição da imagem carregada vista pelos jobs, que rodam um de cada vez na thread do
+    agendador: o histórico passa de um job da fila para o próximo por aqui, e a thread da UI
+    só recebe os resultados nos callbacks. Trocada a cada imagem carregada.
+    """
+
+    def __init__(self) -> None:
+        self.history: Optional[Union["EditHistory", "IndexedEditHistory"]] = None
+
+    @property
+    def modified_image(self) -> Optional[Image.Image]:
+        # De volta ao estado original, não há modificação a salvar
+        if self.history is None or not self.history.can_undo:
+            return None
+        return self.history.image
 
 
 class MainController:
@@ -39,25 +61,69 @@ class MainController:
         self.image_path: str = ""
         self.end_folder: str = ""
         self.modified_image: Optional[Image.Image] = None
+        self.history: Optional[Union["EditHistory", "IndexedEditHistory"]] = None
+        # Trocada a cada imagem carregada: jobs de edição de uma carga anterior são descartados
+        self._edit_session = _EditSession()
+        self.HISTORY_MEMORY_BUDGET: int = 256 * 1024 * 1024
+        self.image_cache = ImageCache()
         self._after_id: Optional[str] = None
+        self.GRID_PREVIEW_DELAY_MS: int = 150
+        self._grid_overlay_cache: dict = {}
         self.ctk_img_preview: Optional[ctk.CTkImage] = None
         self.palette_colors: list = []
+        self.pending_color_edits: list = []
+        self._recolor_preview: Optional[tuple] = None
+        self._recolor_after_id: Optional[str] = None
+        self.RECOLOR_PREVIEW_DELAY_MS: int = 15
+        self.jobs = JobScheduler(lambda func, *args: self.app.after(0, func, *args))
 
         # Variáveis de controle para os widgets
         self.bloco_px_var = ctk.StringVar(value="16")
         self.scale_factor_var = ctk.StringVar(value="4")
         self.btn_execute = None
+        self.btn_convert = None
         self.preview_label = None
         self.log_textbox = None
         self.tabview = None
         self.status_label = None
+        self.progressbar = None
+        self.progress_frame = None
         self.palette_preview_label = None
         self.output_name_conversor = None
         self.output_name_processor = None
         self.file_type_var = None
         self.palette_frame = None
+        self.tolerance_label = None
+        self.color_tolerance_var = ctk.DoubleVar(value=30)
+        self.color_metric_var = ctk.StringVar(value="legacy")
+        self.dedup_var = ctk.BooleanVar(value=False)
+        self.dedup_transforms_var = ctk.BooleanVar(value=False)
+        self.atlas_var = ctk.BooleanVar(value=False)
+        self.auto_slice_var = ctk.BooleanVar(value=False)
+        self.png_preset_var = ctk.StringVar(value="balanced")
+        # Desligado por padrão: ligado, os spans ficam guardados (até MAX_SPANS) entre os jobs
+        self.profiling_var = ctk.BooleanVar(value=False)
+        self.preview_label_resize = None
+        self.btn_resize = None
+        self.resize_width_var = ctk.StringVar(value="")
+        self.resize_height_var = ctk.StringVar(value="")
+        self.resize_method_var = ctk.StringVar(value="nearest")
+        self.resize_keep_aspect_var = ctk.BooleanVar(value=True)
+        self._resize_syncing = False
+        self.slice_padding_var = ctk.StringVar(value="0")
+        self.slice_merge_var = ctk.StringVar(value="0")
+        self.btn_animation = None
+        self.animation_format_var = ctk.StringVar(value="gif")
+        self.animation_duration_var = ctk.StringVar(value="100")
+        self.animation_pingpong_var = ctk.BooleanVar(value=False)
         
-        self.bloco_px_var.trace_add("write", lambda *args: self._update_grid_preview())
+        self.bloco_px_var.trace_add("write", lambda *args: self._schedule_grid_preview())
+        self.color_tolerance_var.trace_add("write", lambda *args: self._schedule_recolor_preview())
+        self.color_metric_var.trace_add("write", lambda *args: self._schedule_recolor_preview())
+        self.profiling_var.trace_add("write", lambda *args: setattr(PROFILER, "enabled", self.profiling_var.get()))
+        PROFILER.enabled = self.profiling_var.get()
+        self.resize_width_var.trace_add("write", lambda *args: self._sync_resize_aspect(self.resize_width_var))
+        self.resize_height_var.trace_add("write", lambda *args: self._sync_resize_aspect(self.resize_height_var))
 
     # ======================
     #  Inicialização / Utils
@@ -82,6 +148,12 @@ class MainController:
         self.app.clipboard_append(text)
         update_log(self.log_textbox, f"'{text}' copiado para a área de transferência", self.log_label)
 
+
+    @property
+    def document(self) -> ImageDocument:
+        """Documento (decodificado uma única vez e mantido em cache) da imagem selecionada"""
+        return self.image_cache.get(self.image_path)
+
     # ======================
     #  Arquivos e Pastas
     # ======================
@@ -95,19 +167,19 @@ class MainController:
 
             self.image_path = path
             self.modified_image = None
+            self.history = None
+            self._edit_session = _EditSession()
+            self.pending_color_edits = []
 
-            # define um tamanho para a imagem
-            if(Image.open(self.image_path).width > 1920 or Image.open(self.image_path).height > 1920):
-                update_log(self.log_textbox, f"A imagem selecionada é muito grande. Aceitamos até 1920x1920.", self.log_label)
-                self.image_path = ""
-                self.log_label.configure(text="Erro: A imagem é muito grande. Máximo 1920x1920.")
-                self._safe_configure_preview(text="Erro: A imagem é muito grande. Máximo 1920x1920.")
-                return
+            document = self.image_cache.get(path)
 
             update_log(self.log_textbox, f"Imagem selecionada: {os.path.basename(self.image_path)}", self.log_label)
+            if document.is_large:
+                update_log(self.log_textbox, f"Imagem grande ({document.width}x{document.height}): previews e paleta usam uma versão reduzida; a divisão é feita em faixas.", self.log_label)
             self._update_grid_preview()
             self._update_convert_preview(path)
             self._update_palette_preview_from_path(path)
+            self._reset_resize_fields(document)
 
 
     def handle_choose_image(self) -> None:
@@ -144,63 +216,94 @@ class MainController:
             pass
 
 
-    def _update_preview_from_image_object(self, image: Image.Image, preview_label: ctk.CTkLabel) -> None:
-        """Atualiza um label de preview com um objeto de imagem PIL."""
+    def _preview_box(self, preview_label: ctk.CTkLabel) -> tuple:
+        """Tamanho disponível no label de preview (ou um padrão, antes de a janela ser desenhada)."""
+        preview_box_w = preview_label.winfo_width()
+        preview_box_h = preview_label.winfo_height()
+        if preview_box_w <= 0 or preview_box_h <= 0:
+            return 400, 300
+        return preview_box_w, preview_box_h
+
+
+    def _fit_preview(self, image: Union[Image.Image, ImageDocument], box: tuple) -> Image.Image:
+        """Versão da imagem (ou o preview em cache de um documento) que cabe na caixa."""
+        if isinstance(image, ImageDocument):
+            return image.preview(*box)
+        scale = min(box[0] / image.width, box[1] / image.height)
+        new_w = max(1, int(image.width * scale))
+        new_h = max(1, int(image.height * scale))
+        preview = image.resize((new_w, new_h), Image.Resampling.NEAREST)
+        # Imagens indexadas são reduzidas nos índices e só o preview é convertido (o Tk não usa o tRNS)
+        return preview if preview.mode == "RGBA" else preview.convert("RGBA")
+
+
+    def _show_preview(self, preview_image: Image.Image, preview_label: ctk.CTkLabel) -> None:
+        ctk_image = ctk.CTkImage(light_image=preview_image, size=preview_image.size)
+        preview_label.configure(image=ctk_image, text="")
+        preview_label.image = ctk_image
+
+
+    def _update_preview_from_image_object(self, image: Union[Image.Image, ImageDocument], preview_label: ctk.CTkLabel) -> None:
+        """Atualiza um label de preview com um objeto de imagem PIL (ou com o preview em cache de um documento)."""
         try:
-            preview_box_w = preview_label.winfo_width()
-            preview_box_h = preview_label.winfo_height()
-
-            if preview_box_w <= 0 or preview_box_h <= 0:
-                preview_box_w = 400
-                preview_box_h = 300
-            scale = min(preview_box_w / image.width, preview_box_h / image.height)
-            new_w = max(1, int(image.width * scale))
-            new_h = max(1, int(image.height * scale))
-            
-            preview_image = image.resize((new_w, new_h), Image.Resampling.NEAREST)
-            ctk_image = ctk.CTkImage(light_image=preview_image, size=preview_image.size)
-            
-            preview_label.configure(image=ctk_image, text="")
-            preview_label.image = ctk_image
+            self._show_preview(self._fit_preview(image, self._preview_box(preview_label)), preview_label)
         except Exception as e:
             preview_label.configure(text=f"Erro ao atualizar preview: {e}")
 
 
+    def _schedule_grid_preview(self, delay_ms: Optional[int] = None) -> None:
+        """Agenda a atualização do preview da grade, agrupando edições rápidas no campo do bloco"""
+        if self._after_id:
+            self.app.after_cancel(self._after_id)
+        self._after_id = self.app.after(self.GRID_PREVIEW_DELAY_MS if delay_ms is None else delay_ms, self._update_grid_preview)
+
+
+    def _grid_overlay(self, size: tuple, orig_size: tuple, bloco_px: int) -> Image.Image:
+        """Retorna (em cache) a camada transparente com as linhas da grade para um tamanho de preview"""
+        key = (size, orig_size, bloco_px)
+        overlay = self._grid_overlay_cache.get(key)
+        if overlay is None:
+            if len(self._grid_overlay_cache) >= 16:
+                self._grid_overlay_cache.clear()
+            new_w, new_h = size
+            orig_w, orig_h = orig_size
+            overlay = Image.new("RGBA", size, (0, 0, 0, 0))
+            draw = ImageDraw.Draw(overlay)
+            scale_w, scale_h = new_w / orig_w, new_h / orig_h
+            for x in range(bloco_px, orig_w, bloco_px):
+                draw.line([(x * scale_w, 0), (x * scale_w, new_h)], fill=self.COLOR_GRID, width=1)
+            for y in range(bloco_px, orig_h, bloco_px):
+                draw.line([(0, y * scale_h), (new_w, y * scale_h)], fill=self.COLOR_GRID, width=1)
+            self._grid_overlay_cache[key] = overlay
+        return overlay
+
+
     def _update_grid_preview(self) -> None:
         """Atualiza o preview da grade com base na imagem e tamanho do bloco"""
         self._after_id = None
         if not self.image_path: return
         
         try:
-            self.app.update_idletasks()
             bloco_px = int(self.bloco_px_var.get())
             if bloco_px <= 0:
                 self._safe_configure_preview(text="Erro: Digite um tamanho de bloco válido")
                 self.log_label.configure(text="Erro: Digite um tamanho de bloco válido")
                 return
 
-            original_image = Image.open(self.image_path).convert("RGBA")
-            orig_w, orig_h = original_image.size
-            
-            image_for_preview = self.modified_image if self.modified_image else original_image
+            document = self.document
+            orig_w, orig_h = document.size
 
             preview_box_w = self.preview_label_split.winfo_width() - 40
             preview_box_h = self.preview_label_split.winfo_height() - 40
             if preview_box_w <= 1 or preview_box_h <= 1:
-                self._after_id = self.app.after(200, self._update_grid_preview)
+                self._schedule_grid_preview(200)
                 return
 
-            scale = min(preview_box_w / orig_w, preview_box_h / orig_h)
-            new_w = max(1, int(orig_w * scale))
-            new_h = max(1, int(orig_h * scale))
-            preview_image = original_image.resize((new_w, new_h), Image.Resampling.NEAREST)
-            
-            draw = ImageDraw.Draw(preview_image)
-            scale_w, scale_h = new_w / orig_w, new_h / orig_h
-            for x in range(bloco_px, orig_w, bloco_px):
-                draw.line([(x * scale_w, 0), (x * scale_w, new_h)], fill=self.COLOR_GRID, width=1)
-            for y in range(bloco_px, orig_h, bloco_px):
-                draw.line([(0, y * scale_h), (new_w, y * scale_h)], fill=self.COLOR_GRID, width=1)
+            # a imagem reduzida e a camada da grade ficam em cache; só a composição é refeita
+            with span("preview.grid"):
+                base_image = document.preview(preview_box_w, preview_box_h)
+                overlay = self._grid_overlay(base_image.size, (orig_w, orig_h), bloco_px)
+                preview_image = Image.alpha_composite(base_image, overlay)
 
             self.ctk_img_preview = ctk.CTkImage(light_image=preview_image, size=preview_image.size)
             self._safe_configure_preview(self.ctk_img_preview)
@@ -211,24 +314,58 @@ class MainController:
     def _update_palette_preview_from_path(self, path: str) -> None:
         """Atualiza o preview da paleta de cores a partir de um caminho de arquivo."""
         try:
-            image_to_preview = self.modified_image if self.modified_image else Image.open(path).convert("RGBA")
-            self._update_preview_from_image_object(image_to_preview, self.palette_preview_label)
+            self._update_recolor_preview()
         except Exception as e:
             self.palette_preview_label.configure(text=f"Erro ao carregar preview: {e}")
 
 
+    def _pending_edits(self) -> list:
+        """Substituições pendentes, com a tolerância atual do controle deslizante."""
+        tolerance = self.color_tolerance_var.get()
+        return [(old, new, tolerance) for old, new, *_ in self.pending_color_edits]
+
+
+    def _schedule_recolor_preview(self) -> None:
+        """Agenda a atualização do preview da paleta, agrupando os eventos do controle de tolerância"""
+        if self.tolerance_label:
+            self.tolerance_label.configure(text=f"Tolerância: {self.color_tolerance_var.get():.0f}")
+        if self._recolor_after_id:
+            self.app.after_cancel(self._recolor_after_id)
+        self._recolor_after_id = self.app.after(self.RECOLOR_PREVIEW_DELAY_MS, self._update_recolor_preview)
+
+
+    def _update_recolor_preview(self) -> None:
+        """
+        Mostra o preview da paleta com as substituições pendentes aplicadas apenas aos pixels
+        do preview; a imagem em resolução original só é alterada ao aplicar ou salvar.
+        """
+        self._recolor_after_id = None
+        if not self.image_path or not self.palette_preview_label:
+            return
+        source = self.modified_image if self.modified_image else self.document
+        box = self._preview_box(self.palette_preview_label)
+        cached = self._recolor_preview
+        if cached is None or cached[0] is not source or cached[1] != box:
+            cached = self._recolor_preview = (source, box, self._fit_preview(source, box), None)
+
+        edits = self._pending_edits()
+        if not edits:
+            self._show_preview(cached[2], self.palette_preview_label)
+            return
+        if cached[3] is None:
+            # Cores únicas do preview, calculadas uma vez para todos os ajustes seguintes
+            cached = self._recolor_preview = cached[:3] + (sprite_core.RecolorPreview(cached[2]),)
+        self._show_preview(cached[3].apply(edits, self.color_metric_var.get()), self.palette_preview_label)
+
+
     def _update_convert_preview(self, path: str) -> None:
         """Atualiza o preview da imagem convertida"""
         try:
-            original_image = Image.open(path).convert("RGBA")
             preview_box_w = self.preview_label_convert.winfo_width() - 20
             preview_box_h = 250
             if preview_box_w <= 0:
                 preview_box_w = 300
-            scale = min(preview_box_w / original_image.width, preview_box_h / original_image.height)
-            new_w = max(1, int(original_image.width * scale))
-            new_h = max(1, int(original_image.height * scale))
-            preview_image = original_image.resize((new_w, new_h), Image.Resampling.NEAREST)
+            preview_image = self.image_cache.get(path).preview(preview_box_w, preview_box_h)
             self.ctk_convert_preview = ctk.CTkImage(light_image=preview_image, size=preview_image.size)
             self.preview_label_convert.configure(image=self.ctk_convert_preview, text="")
         except Exception as e:
@@ -258,45 +395,226 @@ class MainController:
             update_log(self.log_textbox, "Erro: Tamanho do bloco ou fator de escala inválido", self.log_label)
             self.log_label.configure(text="Erro: Tamanho do bloco ou fator de escala inválido")
             return
+        if self.auto_slice_var.get():
+            try:
+                padding = int(self.slice_padding_var.get())
+                merge_distance = int(self.slice_merge_var.get())
+                if padding < 0 or merge_distance < 0:
+                    raise ValueError("Margem e distância de união não podem ser negativas.")
+            except (ValueError, TypeError):
+                update_log(self.log_textbox, "Erro: Margem ou distância de união inválida", self.log_label)
+                self.log_label.configure(text="Erro: Margem ou distância de união inválida")
+                return
+            self._start_auto_slice(scale, padding, merge_distance)
+            return
         self._start_threaded_processing(bloco_px, scale)
 
 
     def _start_threaded_processing(self, bloco_px: int, scale: int) -> None:
-        """Inicia o processamento em uma thread separada para evitar travamento da UI"""
+        """Envia a divisão ao agendador de jobs para evitar travamento da UI"""
         self.btn_execute.configure(state="disabled")
         update_log(self.log_textbox, "Iniciando processamento...", self.log_label)
         if self.log_label:
             self.log_label.configure(text="Iniciando processamento...", text_color=self.COLOR_TEXT)
-        processing_thread = threading.Thread(
-            target=self._thread_processing,
-            args=(self.image_path, self.end_folder, bloco_px, scale)
+        # Os valores dos widgets são lidos aqui, na thread da UI
+        self._submit_job(
+            "Divisão",
+            self._job_processing,
+            self.image_path,
+            self.end_folder,
+            self.output_name_processor.get(),
+            bloco_px,
+            scale,
+            self.dedup_var.get(),
+            self.dedup_transforms_var.get(),
+            self.atlas_var.get(),
+            self.png_preset_var.get(),
+            on_success=lambda outcome: self._end_processing(outcome[1], f"✨ Processamento concluído! {len(outcome[0])} arquivo(s) gerado(s)."),
+            on_done=lambda job: self.btn_execute.configure(state="normal"),
+            show_progress=True
+        )
+
+
+    def _start_auto_slice(self, scale: int, padding: int, merge_distance: int) -> None:
+        """Envia a divisão por detecção automática dos sprites (componentes conexos) ao agendador de jobs"""
+        self.btn_execute.configure(state="disabled")
+        update_log(self.log_textbox, "Detectando sprites...", self.log_label)
+        self._submit_job(
+            "Detecção de sprites",
+            self._job_auto_slice,
+            self.image_path,
+            self.end_folder,
+            self.output_name_processor.get(),
+            scale,
+            padding,
+            merge_distance,
+            self.png_preset_var.get(),
+            on_success=lambda outcome: self._end_processing(outcome[1], f"✨ {len(outcome[0]) - 1} sprite(s) encontrado(s) e salvo(s), com os retângulos em JSON."),
+            on_done=lambda job: self.btn_execute.configure(state="normal"),
+            show_progress=True
+        )
+
+
+    def _job_auto_slice(self, job: Job, image_path: str, output_folder: str, output_name: str, scale: int,
+                        padding: int, merge_distance: int, png_preset: str) -> tuple:
+        """Detecta e salva os sprites (roda fora da thread da UI); devolve os arquivos e as estatísticas dos PNGs"""
+        stats = sprite_core.SaveStats()
+        outputs = sprite_core.auto_slice(
+            image_path, output_folder, output_name, scale, padding, merge_distance,
+            progress_callback=job.report, png_options=png_preset, png_stats=stats
         )
-        processing_thread.start()
+        return outputs, stats
+
+
+    def _job_processing(self, job: Job, image_path: str, output_folder: str, output_name: str, bloco_px: int, scale: int,
+                        dedup: bool, match_transforms: bool, atlas: bool, png_preset: str) -> tuple:
+        """Processa a imagem em blocos e salva na pasta de saída (roda fora da thread da UI)"""
+        stats = sprite_core.SaveStats()
+        outputs = sprite_core.process_and_save_blocks(
+            image_path,
+            output_folder,
+            output_name,
+            bloco_px,
+            scale,
+            job.report,
+            dedup=dedup,
+            match_transforms=match_transforms,
+            atlas=atlas,
+            png_options=png_preset,
+            png_stats=stats
+        )
+        return outputs, stats
+
+
+    def _end_processing(self, stats, message: str) -> None:
+        """Registra o tamanho e o tempo de codificação dos PNGs e a mensagem final do job"""
+        update_log(self.log_textbox, f"PNG ({self.png_preset_var.get()}): {stats.summary()}")
+        update_log(self.log_textbox, message, self.log_label)
 
+    def handle_export_animation(self) -> None:
+        """Exporta os blocos não vazios como GIF/APNG/WebP animado, sem gravar os quadros"""
+        if not self.image_path:
+            update_log(self.log_textbox, "Erro: Selecione a imagem", self.log_label)
+            self.log_label.configure(text="Erro: Selecione a imagem")
+            return
 
-    def _thread_processing(self, image_path: str, output_folder: str, bloco_px: int, scale: int) -> None:
-        """Processa a imagem em blocos e salva na pasta de saída"""
-        output_name = self.output_name_processor.get() 
+        if not self.end_folder:
+            update_log(self.log_textbox, "Erro: Selecione a pasta de saída", self.log_label)
+            self.log_label.configure(text="Erro: Selecione a pasta de saída")
+            return
         try:
-            process_and_save_blocks(
-                image_path,
-                output_folder,
-                output_name,
-                bloco_px,
-                scale,
-                None # Removido o callback
-            )
-            self.app.after(0, update_log, self.log_textbox, "✨ Processamento concluído!", self.log_label)
-            self.log_label.configure(text="Peocessamento concluído!")
-        except Exception as e:
-            self.app.after(0, update_log, self.log_textbox, f"ERRO: {e}", self.log_label)
-        finally:
-            self.app.after(0, self._end_processing)
+            bloco_px = int(self.bloco_px_var.get())
+            scale = int(self.scale_factor_var.get())
+            duration = int(self.animation_duration_var.get())
+            if bloco_px <= 0 or scale <= 0 or duration <= 0:
+                raise ValueError("Tamanho do bloco, escala e duração devem ser maiores que zero.")
+        except (ValueError, TypeError):
+            update_log(self.log_textbox, "Erro: Tamanho do bloco, fator de escala ou duração inválido", self.log_label)
+            self.log_label.configure(text="Erro: Tamanho do bloco, fator de escala ou duração inválido")
+            return
+
+        file_format = self.animation_format_var.get()
+        extension = "png" if file_format == "apng" else file_format
+        output_path = os.path.join(self.end_folder, f"{self.output_name_processor.get()}.{extension}")
+        image_path, pingpong = self.image_path, self.animation_pingpong_var.get()
+        self.btn_animation.configure(state="disabled")
+        update_log(self.log_textbox, f"Exportando animação ({file_format.upper()})...", self.log_label)
+        self._submit_job(
+            "Animação",
+            lambda job: sprite_core.export_animation(
+                image_path, output_path, bloco_px, scale, duration, pingpong=pingpong, progress_callback=job.report
+            ),
+            on_success=lambda path: update_log(self.log_textbox, f"🎞️ Animação salva em: {path}", self.log_label),
+            on_done=lambda job: self.btn_animation.configure(state="normal"),
+            show_progress=True
+        )
+
+    # ======================
+    #  Jobs em segundo plano
+    # ======================
+
+    def _submit_job(self, name: str, func, *args, on_success=None, on_done=None, show_progress: bool = False) -> Job:
+        """
+        Envia uma operação ao agendador. Ela roda fora da thread da UI, na ordem de envio;
+        os erros vão para o log e a barra de progresso some quando a fila esvazia.
+        """
+        # Posição do perfilador no início do job, para resumir apenas as etapas dele
+        profile_start = [None]
+
+        def run(job: Job, *args):
+            profile_start[0] = PROFILER.mark()
+            with span("job", job=name):
+                return func(job, *args)
+
+        def done(job: Job) -> None:
+            if job.status == "cancelled":
+                update_log(self.log_textbox, f"{job.name}: cancelado.", self.log_label)
+            if on_done:
+                on_done(job)
+            if PROFILER.enabled and profile_start[0] is not None:
+                summary = PROFILER.format_summary(profile_start[0])
+                if summary:
+                    update_log(self.log_textbox, f"⏱ Tempos ({job.name}):\n{summary}")
+            if self.jobs.idle:
+                self._hide_progress()
+
+        self._show_progress()
+        return self.jobs.submit(
+            name, run, *args,
+            on_success=on_success,
+            on_error=lambda e: update_log(self.log_textbox, f"ERRO ({name}): {e}", self.log_label),
+            on_done=done,
+            on_progress=self._update_progress if show_progress else None
+        )
+
+
+    def handle_export_profile(self) -> None:
+        """Exporta os tempos registrados em JSON ou no formato de trace do Chrome (pela extensão escolhida)"""
+        if not PROFILER.spans():
+            update_log(self.log_textbox, "Nenhum tempo registrado. Ative \"Medir tempos\" e execute uma operação.", self.log_label)
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="Exportar tempos como...",
+            defaultextension=".json",
+            filetypes=[("JSON (spans e resumo)", "*.json"), ("Chrome trace (chrome://tracing, Perfetto)", "*.trace.json"), ("Todos os arquivos", "*.*")]
+        )
+        if not file_path:
+            return
+        if file_path.endswith(".trace.json"):
+            PROFILER.export_chrome_trace(file_path)
+        else:
+            PROFILER.export_json(file_path)
+        update_log(self.log_textbox, f"Tempos exportados em: {file_path}", self.log_label)
+
 
+    def handle_clear_profile(self) -> None:
+        PROFILER.clear()
+        update_log(self.log_textbox, "Tempos registrados apagados.", self.log_label)
+
+
+    def handle_cancel_jobs(self) -> None:
+        """Cancela o job em execução e os que estão na fila"""
+        if self.jobs.idle:
+            return
+        update_log(self.log_textbox, "Cancelando...", self.log_label)
+        self.jobs.cancel_all()
 
-    def _end_processing(self) -> None:
-        """Finaliza o processamento e atualiza a UI"""
-        self.btn_execute.configure(state="normal")
+
+    def _show_progress(self) -> None:
+        if self.progress_frame and self.jobs.idle:
+            self.progressbar.set(0)
+            self.progress_frame.grid()
+
+
+    def _hide_progress(self) -> None:
+        if self.progress_frame:
+            self.progress_frame.grid_remove()
+
+
+    def _update_progress(self, progress: float) -> None:
+        """Atualiza a barra de progresso (chamado na thread da UI)"""
+        if self.progressbar:
+            self.progressbar.set(progress)
 
     # ======================
     #  Paleta de Cores / Edição
@@ -314,38 +632,48 @@ class MainController:
 
         for widget in self.palette_frame.winfo_children():
             widget.destroy()
-        try:
-            image_for_palette = self.modified_image if self.modified_image else Image.open(path).convert("RGBA")
-            self.palette_colors = get_color_palette(image_for_palette) 
-            
-            self._update_palette_preview_from_path(path)
-            max_cols = 8
-            num_rows = (len(self.palette_colors) + max_cols - 1) // max_cols
-
-            for idx, color_hex in enumerate(self.palette_colors): 
-                row = idx // max_cols
-                col = idx % max_cols
-                color_button = ctk.CTkButton(
-                    self.palette_frame, text=color_hex, fg_color=color_hex, 
-                    text_color="black" if self._is_light_color(color_hex) else "white",
-                    hover_color=color_hex, 
-                    command=lambda c_hex=color_hex, btn=None: self.handle_replace_color_request(c_hex, btn)
-                )
-                color_button.configure(command=lambda c_hex=color_hex, btn=color_button: self.handle_replace_color_request(c_hex, btn))
-                color_button.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-            for col in range(max_cols):
-                self.palette_frame.grid_columnconfigure(col, weight=1)
-            for row in range(num_rows):
-                self.palette_frame.grid_rowconfigure(row, weight=1)
-        except Exception as e:
-            self.palette_colors = []
-            update_log(self.log_textbox, f"ERRO ao criar paleta de cores: {e}", self.log_label)
+        self.pending_color_edits = []
+        self.palette_colors = []
+        document = self.document
+        session = self._edit_session
+        self._submit_job(
+            "Paleta de cores",
+            # Parte das substituições ainda na fila, e não só das que já voltaram para a UI
+            lambda job: sprite_core.get_color_palette(session.modified_image or document.mip),
+            on_success=lambda colors: self._show_palette(path, colors)
+        )
+
+
+    def _show_palette(self, path: str, colors: list) -> None:
+        """Cria os botões da paleta (chamado na thread da UI quando o job termina)"""
+        if path != self.image_path:
+            return
+        self.palette_colors = colors
+        self._update_palette_preview_from_path(path)
+        max_cols = 8
+        num_rows = (len(self.palette_colors) + max_cols - 1) // max_cols
+
+        for idx, color_hex in enumerate(self.palette_colors): 
+            row = idx // max_cols
+            col = idx % max_cols
+            color_button = ctk.CTkButton(
+                self.palette_frame, text=color_hex, fg_color=color_hex, 
+                text_color="black" if self._is_light_color(color_hex) else "white",
+                hover_color=color_hex, 
+                command=lambda c_hex=color_hex, btn=None: self.handle_replace_color_request(c_hex, btn)
+            )
+            color_button.configure(command=lambda c_hex=color_hex, btn=color_button: self.handle_replace_color_request(c_hex, btn))
+            color_button.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+        for col in range(max_cols):
+            self.palette_frame.grid_columnconfigure(col, weight=1)
+        for row in range(num_rows):
+            self.palette_frame.grid_rowconfigure(row, weight=1)
         update_log(self.log_textbox, "Paleta de cores criada! Clique em uma cor para substituí-la.", self.log_label)
         self.log_label.configure(text="Paleta de cores criada com sucesso!")
 
 
     def handle_replace_color_request(self, old_color_hex: str, clicked_button: ctk.CTkButton) -> None:
-        """Solicita ao usuário uma nova cor e inicia a substituição."""
+        """Solicita ao usuário uma nova cor e mostra a substituição no preview (aplicada ao aplicar ou salvar)."""
         if not self.image_path:
             update_log(self.log_textbox, "Erro: Nenhuma imagem carregada.", self.log_label)
             return
@@ -355,46 +683,176 @@ class MainController:
             new_color_rgb = tuple(int(c) for c in color_data[0])
             new_color_hex = color_data[1]
 
-            update_log(self.log_textbox, f"Substituindo {old_color_hex} por {new_color_hex}...", self.log_label)
-
-            image_to_process = self.modified_image.copy() if self.modified_image else Image.open(self.image_path).convert("RGBA")
-            old_color_rgb = hex_to_rgb(old_color_hex)
+            # O botão e a cor anterior ficam junto da edição, para que desfazê-la restaure o botão
+            self.pending_color_edits.append((sprite_core.hex_to_rgb(old_color_hex), new_color_rgb, clicked_button, old_color_hex))
 
-            self.modified_image = replace_color(image_to_process, old_color_rgb, new_color_rgb)
-            
-            self._update_preview_from_image_object(self.modified_image, self.palette_preview_label)
-            
             if clicked_button:
-                clicked_button.configure(
-                    fg_color=new_color_hex,
-                    text_color="black" if self._is_light_color(new_color_hex) else "white",
-                    text=new_color_hex, 
-                    hover_color=new_color_hex
-                )
-            
-            update_log(self.log_textbox, "Substituição concluída. Preview e botão atualizados.", self.log_label)
+                self._set_palette_button(clicked_button, new_color_hex)
+
+            self._update_recolor_preview()
+            update_log(self.log_textbox, f"{old_color_hex} → {new_color_hex} no preview ({len(self.pending_color_edits)} pendente(s)). Aplique ou salve para alterar a imagem.", self.log_label)
         else:
             update_log(self.log_textbox, "Seleção de nova cor cancelada.", self.log_label)
 
 
+    def _set_palette_button(self, button: ctk.CTkButton, color_hex: str) -> None:
+        """Mostra a cor no botão da paleta; o próximo clique substitui essa cor."""
+        button.configure(
+            fg_color=color_hex,
+            text_color="black" if self._is_light_color(color_hex) else "white",
+            text=color_hex,
+            hover_color=color_hex,
+            command=lambda c_hex=color_hex, btn=button: self.handle_replace_color_request(c_hex, btn)
+        )
+
+
+    def handle_commit_color_edits(self) -> None:
+        """Aplica de uma só vez, em segundo plano, todas as substituições de cor pendentes."""
+        if not self.pending_color_edits:
+            update_log(self.log_textbox, "Nenhuma substituição pendente.", self.log_label)
+            return
+
+        edits, self.pending_color_edits = self._pending_edits(), []
+        update_log(self.log_textbox, f"Aplicando {len(edits)} substituição(ões) de cor à imagem inteira...", self.log_label)
+        session = self._edit_session
+        self._submit_job(
+            "Substituição de cores",
+            self._job_commit_color_edits,
+            session,
+            self.document,
+            edits,
+            self.color_metric_var.get(),
+            on_success=lambda outcome: self._end_commit_color_edits(session, *outcome)
+        )
+
+
+    def _job_commit_color_edits(self, job: Job, session: _EditSession, document: ImageDocument, edits: list, metric: str) -> tuple:
+        """
+        Aplica as substituições (fora da thread da UI) no histórico da sessão, criado no primeiro
+        commit. Devolve o histórico e a imagem, atribuídos ao controlador na thread da UI. Se
+        outra imagem foi carregada depois que o job entrou na fila, nada é feito.
+        """
+        if session is not self._edit_session:
+            return None, None
+        if session.history is None:
+            session.history = self._new_history(document)
+        label = ", ".join(f"{sprite_core.rgb_to_hex(old)} → {sprite_core.rgb_to_hex(new)}" for old, new, *_ in edits)
+        return session.history, session.history.recolor(edits, label, metric)
+
+
+    def _new_history(self, document: ImageDocument):
+        """
+        Histórico de edições do documento: imagens com até 256 cores são editadas em cores
+        indexadas (cada substituição altera só a paleta); as demais, no buffer RGBA do
+        documento, compartilhado com o histórico como estado original (sem cópia).
+        """
+        indexed = document.indexed
+        if indexed is not None:
+            return sprite_core.IndexedEditHistory(indexed)
+        return sprite_core.EditHistory(document.pixels, self.HISTORY_MEMORY_BUDGET)
+
+
+    def _end_commit_color_edits(self, session: _EditSession, history: Optional[Union["EditHistory", "IndexedEditHistory"]], image: Optional[Image.Image]) -> None:
+        if image is None or session is not self._edit_session:
+            return
+        self.history = history
+        self.modified_image = image
+        self._update_recolor_preview()
+        if image.mode == "P":
+            update_log(self.log_textbox, f"Substituição concluída na paleta ({len(self.history.indexed.palette)} cores indexadas, sem percorrer os pixels). Preview atualizado.", self.log_label)
+        else:
+            update_log(self.log_textbox, "Substituição concluída. Preview atualizado.", self.log_label)
+
+
+    def handle_undo(self) -> None:
+        """Desfaz a última substituição pendente ou, sem pendências, a última edição da imagem."""
+        if self.pending_color_edits:
+            old, new, button, old_hex = self.pending_color_edits.pop()
+            if button and button.winfo_exists():
+                self._set_palette_button(button, old_hex)
+            self._update_recolor_preview()
+            update_log(self.log_textbox, f"Desfeito (pendente): {sprite_core.rgb_to_hex(old)} → {sprite_core.rgb_to_hex(new)}", self.log_label)
+            return
+        self._submit_history_step(undo=True)
+
+
+    def handle_redo(self) -> None:
+        """Refaz a última edição desfeita."""
+        self._submit_history_step(undo=False)
+
+
+    def _submit_history_step(self, undo: bool) -> None:
+        # Com jobs na fila, o histórico ainda pode mudar; a verificação é refeita no job
+        if self.jobs.idle and not (self.history and (self.history.can_undo if undo else self.history.can_redo)):
+            update_log(self.log_textbox, "Nada para desfazer." if undo else "Nada para refazer.", self.log_label)
+            return
+        session = self._edit_session
+        self._submit_job(
+            "Desfazer" if undo else "Refazer",
+            self._job_history_step,
+            session,
+            undo,
+            on_success=lambda outcome: self._end_history_step(session, undo, *outcome)
+        )
+
+
+    def _job_history_step(self, job: Job, session: _EditSession, undo: bool) -> tuple:
+        """Desfaz ou refaz no histórico da sessão; ignorado se outra imagem foi carregada."""
+        if session is not self._edit_session:
+            return None, None, None
+        history = session.history
+        if not history or not (history.can_undo if undo else history.can_redo):
+            raise IndexError("Nada para desfazer." if undo else "Nada para refazer.")
+        label = history.undo_label if undo else history.redo_label
+        image = history.undo() if undo else history.redo()
+        return label, image, session.modified_image
+
+
+    def _end_history_step(self, session: _EditSession, undo: bool, label: Optional[str], image: Optional[Image.Image], modified: Optional[Image.Image]) -> None:
+        if image is None or session is not self._edit_session:
+            return
+        self.history = session.history
+        self.modified_image = modified
+        self._update_recolor_preview()
+        update_log(self.log_textbox, f"{'Desfeito' if undo else 'Refeito'}: {label}", self.log_label)
+
+
     def handle_save_modified_image(self) -> None:
         """Salva a imagem que teve suas cores modificadas."""
-        if not self.modified_image:
+        if self.pending_color_edits:
+            self.handle_commit_color_edits()
+
+        if not self.modified_image and self.jobs.idle:
             update_log(self.log_textbox, "Nenhuma modificação para salvar. Substitua uma cor primeiro.", self.log_label)
             return
 
         file_path = filedialog.asksaveasfilename(
             title="Salvar imagem modificada como...",
             defaultextension=".png",
-            filetypes=[("PNG", "*.png"), ("JPEG", "*.jpg"), ("BMP", "*.bmp"), ("Todos os arquivos", "*.*")]
+            filetypes=[("PNG", "*.png"), ("GIF", "*.gif"), ("JPEG", "*.jpg"), ("BMP", "*.bmp"), ("Todos os arquivos", "*.*")]
         )
 
         if file_path:
-            try:
-                self.modified_image.save(file_path)
-                update_log(self.log_textbox, f"Imagem modificada salva em: {file_path}", self.log_label)
-            except Exception as e:
-                update_log(self.log_textbox, f"Erro ao salvar a imagem: {e}", self.log_label)
+            # Roda depois das substituições que ainda estão na fila
+            self._submit_job(
+                "Salvar imagem",
+                self._job_save_modified_image,
+                self._edit_session,
+                file_path,
+                self.png_preset_var.get(),
+                on_success=lambda outcome: self._end_processing(outcome[1], f"Imagem modificada salva em: {outcome[0]}")
+            )
+
+
+    def _job_save_modified_image(self, job: Job, session: _EditSession, file_path: str, png_preset: str) -> tuple:
+        # Lida da sessão: os callbacks das substituições na fila podem ainda não ter rodado na UI
+        image = session.modified_image
+        if image is None:
+            raise ValueError("Nenhuma modificação para salvar.")
+        stats = sprite_core.SaveStats()
+        # Imagens indexadas vão direto para PNG/GIF indexado; JPEG e BMP recebem o modo adequado
+        sprite_core.save_image(image, file_path, png_preset, stats)
+        return file_path, stats
 
     # ======================
     #  Conversão de Imagem
@@ -424,13 +882,197 @@ class MainController:
             self.log_label.configure(text="Erro: Digite um nome para o arquivo convertido")
             return
         
+        self._start_conversion([self.image_path], file_type, [output_name])
+
+
+    def handle_convert_batch(self) -> None:
+        """Converte vários arquivos de uma vez para o formato escolhido"""
+        if not self.end_folder:
+            update_log(self.log_textbox, "Erro: Selecione a pasta de saída", self.log_label)
+            self.log_label.configure(text="Erro: Selecione a pasta de saída")
+            return
+
+        file_type = self.file_type_var.get()
+        if not file_type:
+            update_log(self.log_textbox, "Erro: Selecione um formato de arquivo válido", self.log_label)
+            self.log_label.configure(text="Erro: Selecione um formato de arquivo válido")
+            return
+
+        paths = filedialog.askopenfilenames(
+            title="Selecione as imagens a converter",
+            filetypes=[("Imagens", "*.png *.jpg *.jpeg *.bmp *.tiff *.gif *.webp"), ("Todos os arquivos", "*.*")]
+        )
+        if paths:
+            self._start_conversion(list(paths), file_type)
+
+
+    def _start_conversion(self, paths: list, file_type: str, output_names: Optional[list] = None) -> None:
+        """Envia a conversão ao agendador de jobs; a codificação roda em um pool de processos"""
+        self.btn_convert.configure(state="disabled")
+        update_log(self.log_textbox, f"Convertendo {len(paths)} arquivo(s) para {file_type.upper()}...", self.log_label)
+        self._submit_job(
+            "Conversão",
+            self._job_conversion,
+            paths,
+            self.end_folder,
+            file_type,
+            output_names,
+            self.png_preset_var.get(),
+            on_success=lambda outcome: self._end_conversion(*outcome),
+            on_done=lambda job: self.btn_convert.configure(state="normal"),
+            show_progress=True
+        )
+
+
+    def _job_conversion(self, job: Job, paths: list, output_folder: str, file_type: str, output_names: Optional[list], png_preset: str) -> tuple:
+        """Converte os arquivos (fora da thread da UI) e devolve os resultados e o tempo gasto"""
+        start = time.perf_counter()
+        results = sprite_core.convert_images(paths, output_folder, file_type, output_names, progress_callback=job.report, png_options=png_preset)
+        return results, time.perf_counter() - start
+
+
+    def _end_conversion(self, results: list, seconds: float, verb: str = "converter", done: str = "convertido(s)") -> None:
+        """Mostra o resultado de cada arquivo"""
+        for result in results:
+            if not result.ok:
+                update_log(self.log_textbox, f"Falha ao {verb} {os.path.basename(result.input_path)}: {result.error}", self.log_label)
+        converted = [result for result in results if result.ok]
+        if len(results) == 1 and converted:
+            update_log(self.log_textbox, f"Arquivo salvo em: {converted[0].output_path}", self.log_label)
+        total_bytes = sum(result.bytes_written for result in converted)
+        update_log(self.log_textbox, f"{len(converted)}/{len(results)} arquivo(s) {done} em {seconds:.2f}s ({total_bytes / 1024:.1f} KB)", self.log_label)
+
+    # ======================
+    #  Redimensionamento
+    # ======================
+
+    def _reset_resize_fields(self, document: ImageDocument) -> None:
+        """Preenche a aba de redimensionamento com o tamanho da imagem selecionada"""
+        self._resize_syncing = True
+        self.resize_width_var.set(str(document.width))
+        self.resize_height_var.set(str(document.height))
+        self._resize_syncing = False
+        if self.preview_label_resize:
+            self._update_preview_from_image_object(document, self.preview_label_resize)
+
+
+    def _sync_resize_aspect(self, changed: ctk.StringVar) -> None:
+        """Com a proporção travada, recalcula o outro lado quando largura ou altura é editada"""
+        if self._resize_syncing or not self.image_path or not self.resize_keep_aspect_var.get():
+            return
         try:
-            result_path = convert_image_type(self.image_path, self.end_folder, output_name, file_type)
-            self.log_label.configure(text=result_path)
-            # update_log(self.log_textbox, f"Imagem convertida para {file_type.upper()} com sucesso!", self.log_label)
-            # self.log_label.configure(text="Imagem convertida com sucesso!")
-            # if result_path:
-            #     update_log(self.log_textbox, f"Arquivo salvo em: {result_path}", self.log_label)
-        except Exception as e:
-            update_log(self.log_textbox, f"Erro ao converter a imagem: {e}", self.log_label)
-            self.log_label.configure(text="Erro ao converter a imagem")
\ No newline at end of file
+            value = int(changed.get())
+        except ValueError:
+            return
+        width, height = self.document.size
+        self._resize_syncing = True
+        if changed is self.resize_width_var:
+            self.resize_height_var.set(str(max(1, round(value * height / width))))
+        else:
+            self.resize_width_var.set(str(max(1, round(value * width / height))))
+        self._resize_syncing = False
+
+
+    def _resize_parameters(self) -> Optional[tuple]:
+        """Largura, altura e método da aba (lidos na thread da UI), ou None se forem inválidos"""
+        if not self.end_folder:
+            update_log(self.log_textbox, "Erro: Selecione a pasta de saída", self.log_label)
+            self.log_label.configure(text="Erro: Selecione a pasta de saída")
+            return None
+        try:
+            width = int(self.resize_width_var.get())
+            height = int(self.resize_height_var.get())
+            if width <= 0 or height <= 0:
+                raise ValueError("Largura e altura devem ser maiores que zero.")
+        except (ValueError, TypeError):
+            update_log(self.log_textbox, "Erro: Largura ou altura inválida", self.log_label)
+            self.log_label.configure(text="Erro: Largura ou altura inválida")
+            return None
+        return width, height, self.resize_method_var.get(), self.resize_keep_aspect_var.get()
+
+
+    def handle_resize_image(self) -> None:
+        """Redimensiona a imagem selecionada e salva o PNG na pasta de saída"""
+        if not self.image_path:
+            update_log(self.log_textbox, "Erro: Selecione a imagem", self.log_label)
+            self.log_label.configure(text="Erro: Selecione a imagem")
+            return
+        parameters = self._resize_parameters()
+        if parameters is None:
+            return
+        width, height, method, keep_aspect = parameters
+        self.btn_resize.configure(state="disabled")
+        update_log(self.log_textbox, f"Redimensionando para {width}x{height} ({method})...", self.log_label)
+        self._submit_job(
+            "Redimensionamento",
+            self._job_resize,
+            self.image_path,
+            self.end_folder,
+            width,
+            height,
+            method,
+            keep_aspect,
+            self.png_preset_var.get(),
+            self._preview_box(self.preview_label_resize),
+            on_success=self._end_resize,
+            on_done=lambda job: self.btn_resize.configure(state="normal"),
+            show_progress=True
+        )
+
+
+    def _job_resize(self, job: Job, image_path: str, output_folder: str, width: int, height: int, method: str,
+                    keep_aspect: bool, png_preset: str, preview_box: tuple) -> tuple:
+        """Redimensiona e salva (fora da thread da UI); devolve o caminho, as estatísticas do PNG e o preview do resultado"""
+        stats = sprite_core.SaveStats()
+        path = sprite_core.resize_file(image_path, output_folder, None, width, height, None, method, keep_aspect, png_preset, stats)
+        job.report(0.9)
+        with Image.open(path) as result:
+            preview = self._fit_preview(result, preview_box)
+        return path, stats, preview
+
+
+    def _end_resize(self, outcome: tuple) -> None:
+        path, stats, preview = outcome
+        self._show_preview(preview, self.preview_label_resize)
+        self._end_processing(stats, f"Imagem redimensionada salva em: {path}")
+
+
+    def handle_resize_batch(self) -> None:
+        """Redimensiona vários arquivos de uma vez; com a proporção travada, cada um cabe em largura x altura"""
+        parameters = self._resize_parameters()
+        if parameters is None:
+            return
+        paths = filedialog.askopenfilenames(
+            title="Selecione as imagens a redimensionar",
+            filetypes=[("Imagens", "*.png *.jpg *.jpeg *.bmp *.tiff *.gif *.webp"), ("Todos os arquivos", "*.*")]
+        )
+        if not paths:
+            return
+        width, height, method, keep_aspect = parameters
+        self.btn_resize.configure(state="disabled")
+        update_log(self.log_textbox, f"Redimensionando {len(paths)} arquivo(s) para {width}x{height} ({method})...", self.log_label)
+        self._submit_job(
+            "Redimensionamento em lote",
+            self._job_resize_batch,
+            list(paths),
+            self.end_folder,
+            width,
+            height,
+            method,
+            keep_aspect,
+            self.png_preset_var.get(),
+            on_success=lambda outcome: self._end_conversion(*outcome, verb="redimensionar", done="redimensionado(s)"),
+            on_done=lambda job: self.btn_resize.configure(state="normal"),
+            show_progress=True
+        )
+
+
+    def _job_resize_batch(self, job: Job, paths: list, output_folder: str, width: int, height: int, method: str,
+                          keep_aspect: bool, png_preset: str) -> tuple:
+        """Redimensiona os arquivos em um pool de processos (fora da thread da UI)"""
+        start = time.perf_counter()
+        results = sprite_core.resize_images(
+            paths, output_folder, width, height, None, method, keep_aspect,
+            progress_callback=job.report, png_options=png_preset
+        )
+        return results, time.perf_counter() - start
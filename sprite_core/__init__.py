@@ -0,0 +1,71 @@
+# sprite_core/__init__.py
+"""
+Operações de imagem do Editor de Sprites, sem dependência de tkinter/customtkinter.
+
+Os submódulos (e, com eles, Pillow, numpy e colorthief) são importados apenas quando
+um de seus nomes é acessado pela primeira vez, para que `import sprite_core` seja instantâneo.
+"""
+
+import importlib
+from typing import Any
+
+# Métricas de distância de cor aceitas por replace_color(s) e get_color_palette (ver color_metrics),
+# definidas aqui para que a CLI e a GUI possam listá-las sem carregar numpy
+COLOR_METRICS = ("legacy", "rgb", "weighted_rgb", "cie76", "ciede2000", "hue")
+# Presets de gravação de PNG (ver png_writer): do save() padrão do Pillow ao menor arquivo
+PNG_PRESETS = ("none", "fast", "balanced", "smallest")
+# Métodos de redimensionamento (ver resizer)
+RESIZE_METHODS = ("nearest", "integer", "scale2x", "scale3x")
+# Extensões reconhecidas como imagem ao expandir pastas (ver file_conversor.list_images)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif", ".gif", ".webp")
+
+_EXPORTS = {
+    "process_and_save_blocks": "image_processor",
+    "find_non_empty_blocks": "image_processor",
+    "TileDeduper": "image_processor",
+    "auto_slice": "auto_slicer",
+    "find_sprite_rects": "auto_slicer",
+    "export_animation": "animation_exporter",
+    "save_atlas": "atlas_packer",
+    "pack_rects": "atlas_packer",
+    "replace_color": "image_editor",
+    "replace_colors": "image_editor",
+    "hex_to_rgb": "image_editor",
+    "RecolorPreview": "image_editor",
+    "color_distance": "color_metrics",
+    "rgb_to_lab": "color_metrics",
+    "get_color_palette": "color_palette_generator",
+    "exact_palette": "color_palette_generator",
+    "rgb_to_hex": "color_palette_generator",
+    "convert_image_type": "file_conversor",
+    "convert_images": "file_conversor",
+    "save_image": "file_conversor",
+    "list_images": "file_conversor",
+    "ConversionResult": "file_conversor",
+    "ImageDocument": "image_document",
+    "ImageCache": "image_document",
+    "EditHistory": "edit_history",
+    "IndexedEditHistory": "edit_history",
+    "IndexedImage": "indexed_image",
+    "resize_image": "resizer",
+    "resize_file": "resizer",
+    "resize_images": "resizer",
+    "save_png": "png_writer",
+    "PngOptions": "png_writer",
+    "SaveStats": "png_writer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
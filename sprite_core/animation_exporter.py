@@ -0,0 +1,139 @@
+# animation_exporter.py
+
+import os
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+from .color_palette_generator import ALPHA_THRESHOLD, MAX_SAMPLES
+from .image_processor import find_non_empty_blocks, iter_block_rows
+from .profiling import profiled
+
+# Formato do Pillow por extensão de saída
+ANIMATION_FORMATS = {"gif": "GIF", "png": "PNG", "apng": "PNG", "webp": "WEBP"}
+FRAME_ORDERS = ("rows", "columns")
+# Índice da paleta do GIF reservado para os pixels transparentes
+GIF_TRANSPARENT_INDEX = 255
+
+
+def collect_frames(
+    imagem: Image.Image,
+    bloco_px: int,
+    order: str = "rows",
+    progress_callback: Optional[Callable[[float], None]] = None
+) -> List[Tuple[Tuple[int, int], Image.Image]]:
+    """
+    Recorta os blocos não vazios da imagem, faixa por faixa, e retorna [((x, y), bloco RGBA)]
+    na ordem pedida: "rows" (ordem de leitura) ou "columns" (coluna por coluna).
+    """
+    if order not in FRAME_ORDERS:
+        raise ValueError(f"Ordem de quadros desconhecida: {order} (use {', '.join(FRAME_ORDERS)})")
+    largura, altura = imagem.size
+    if largura % bloco_px != 0 or altura % bloco_px != 0:
+        raise ValueError(f"Dimensões ({largura}x{altura}) não são múltiplas de {bloco_px}px.")
+
+    frames = []
+    total_rows = altura // bloco_px
+    for row, (y, faixa) in enumerate(iter_block_rows(imagem, bloco_px)):
+        for x, _ in find_non_empty_blocks(faixa, bloco_px):
+            frames.append(((x, y), faixa.crop((x, 0, x + bloco_px, bloco_px))))
+        if progress_callback:
+            progress_callback((row + 1) / total_rows)
+    if order == "columns":
+        frames.sort(key=lambda frame: (frame[0][0], frame[0][1]))
+    return frames
+
+
+def shared_gif_palette(frames: List[Image.Image]) -> Image.Image:
+    """
+    Paleta única (até 255 cores; o índice GIF_TRANSPARENT_INDEX fica livre para a transparência),
+    calculada uma vez a partir dos pixels opacos de todos os quadros.
+    """
+    pixels = np.concatenate([np.asarray(frame).reshape(-1, 4) for frame in frames])
+    opaque = pixels[pixels[:, 3] >= ALPHA_THRESHOLD, :3]
+    if len(opaque) == 0:
+        opaque = np.zeros((1, 3), dtype=np.uint8)
+    amostra = Image.fromarray(np.ascontiguousarray(opaque[::max(1, len(opaque) // MAX_SAMPLES)]).reshape(-1, 1, 3))
+    return amostra.quantize(GIF_TRANSPARENT_INDEX, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+
+
+def _to_gif_frame(frame: Image.Image, palette: Image.Image) -> Image.Image:
+    """Indexa o quadro na paleta compartilhada, marcando os pixels transparentes."""
+    indexed = frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+    transparent = frame.getchannel("A").point(lambda a: 255 if a < ALPHA_THRESHOLD else 0, "1")
+    indexed.paste(GIF_TRANSPARENT_INDEX, mask=transparent)
+    return indexed
+
+
+@profiled("animation")
+def export_animation(
+    image_path: str,
+    output_path: str,
+    bloco_px: int,
+    scale: int = 1,
+    duration: int = 100,
+    order: str = "rows",
+    reverse: bool = False,
+    pingpong: bool = False,
+    loop: int = 0,
+    progress_callback: Optional[Callable[[float], None]] = None
+) -> str:
+    """
+    Exporta os blocos não vazios de uma tira/folha de animação diretamente para um GIF,
+    APNG ou WebP animado, sem gravar os quadros em arquivos intermediários.
+
+    Args:
+        image_path: Caminho para a imagem de entrada.
+        output_path: Arquivo de saída; o formato vem da extensão (.gif, .png/.apng, .webp).
+        bloco_px: O tamanho de cada quadro em pixels.
+        scale: O fator de escala (NEAREST) dos quadros.
+        duration: Duração de cada quadro em milissegundos.
+        order: "rows" (ordem de leitura) ou "columns".
+        reverse: Inverte a ordem dos quadros.
+        pingpong: Acrescenta os quadros de volta (1..N..2), sem repetir as pontas.
+        loop: Número de repetições (0 = infinito).
+        progress_callback: Uma função para notificar o progresso (de 0 a 1), ou None.
+
+    Returns:
+        O caminho do arquivo gerado.
+    """
+    extension = os.path.splitext(output_path)[1].lower().lstrip(".")
+    pil_format = ANIMATION_FORMATS.get(extension)
+    if pil_format is None:
+        raise ValueError(f"Formato de animação não suportado: .{extension} (use .gif, .png, .apng ou .webp)")
+
+    with Image.open(image_path) as imagem:
+        frames = [frame for _, frame in collect_frames(
+            imagem, bloco_px, order,
+            (lambda progress: progress_callback(0.7 * progress)) if progress_callback else None
+        )]
+    if not frames:
+        raise ValueError("Nenhum bloco não vazio encontrado.")
+
+    if reverse:
+        frames.reverse()
+    if pingpong and len(frames) > 2:
+        frames += frames[-2:0:-1]
+
+    if pil_format == "GIF":
+        # A paleta é calculada uma vez, nos quadros originais; a escala não cria cores novas
+        palette = shared_gif_palette(frames)
+        frames = [_to_gif_frame(frame, palette) for frame in frames]
+    if scale > 1:
+        frames = [frame.resize((frame.width * scale, frame.height * scale), Image.Resampling.NEAREST) for frame in frames]
+    if progress_callback:
+        progress_callback(0.8)
+
+    save_args = {"save_all": True, "append_images": frames[1:], "duration": duration, "loop": loop}
+    if pil_format == "GIF":
+        save_args.update(transparency=GIF_TRANSPARENT_INDEX, disposal=2, optimize=False)
+    elif pil_format == "PNG":
+        # Cada quadro substitui o anterior (sem mesclar), preservando a transparência
+        save_args.update(disposal=1, blend=0)
+    else:
+        save_args.update(lossless=True)
+    frames[0].save(output_path, pil_format, **save_args)
+
+    if progress_callback:
+        progress_callback(1.0)
+    return output_path
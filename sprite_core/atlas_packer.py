@@ -0,0 +1,168 @@
+# atlas_packer.py
+
+import os
+import json
+from PIL import Image
+from typing import Dict, List, Optional, Tuple
+
+from .png_writer import DEFAULT_PRESET, PngSetting, SaveStats, save_png
+from .profiling import span
+
+
+def _next_power_of_two(value: int) -> int:
+    """Menor potência de dois maior ou igual a `value`."""
+    return 1 << max(0, value - 1).bit_length()
+
+
+class SkylinePacker:
+    """
+    Empacotador de retângulos pelo algoritmo skyline (bottom-left).
+    Mantém o "horizonte" da página como segmentos (x, y, largura) e posiciona cada
+    retângulo onde o topo resultante fica mais baixo.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.skyline: List[List[int]] = [[0, 0, width]]
+        self.used_width = 0
+        self.used_height = 0
+
+    def _fit(self, index: int, w: int, h: int) -> Optional[int]:
+        """Retorna o y em que um retângulo w x h cabe a partir do segmento `index`, ou None."""
+        x = self.skyline[index][0]
+        if x + w > self.width:
+            return None
+        y = 0
+        remaining = w
+        i = index
+        while remaining > 0:
+            if i >= len(self.skyline):
+                return None
+            y = max(y, self.skyline[i][1])
+            if y + h > self.height:
+                return None
+            remaining -= self.skyline[i][2]
+            i += 1
+        return y
+
+    def insert(self, w: int, h: int) -> Optional[Tuple[int, int]]:
+        """Posiciona um retângulo w x h e retorna (x, y), ou None se não couber."""
+        best = None
+        for index, (x, _, _) in enumerate(self.skyline):
+            y = self._fit(index, w, h)
+            if y is not None and (best is None or (y + h, x) < (best[2] + h, best[1])):
+                best = (index, x, y)
+        if best is None:
+            return None
+
+        index, x, y = best
+        self.skyline.insert(index, [x, y + h, w])
+        # remove ou encurta os segmentos cobertos pelo novo retângulo
+        i = index + 1
+        while i < len(self.skyline):
+            seg = self.skyline[i]
+            prev_end = self.skyline[i - 1][0] + self.skyline[i - 1][2]
+            if seg[0] >= prev_end:
+                break
+            shrink = prev_end - seg[0]
+            seg[0] += shrink
+            seg[2] -= shrink
+            if seg[2] <= 0:
+                self.skyline.pop(i)
+            else:
+                break
+        # junta segmentos vizinhos na mesma altura
+        i = 0
+        while i < len(self.skyline) - 1:
+            if self.skyline[i][1] == self.skyline[i + 1][1]:
+                self.skyline[i][2] += self.skyline.pop(i + 1)[2]
+            else:
+                i += 1
+
+        self.used_width = max(self.used_width, x + w)
+        self.used_height = max(self.used_height, y + h)
+        return x, y
+
+
+def pack_rects(sizes: List[Tuple[int, int]], max_size: int = 2048, padding: int = 1) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int]]]:
+    """
+    Distribui retângulos em uma ou mais páginas de no máximo max_size x max_size.
+
+    Returns:
+        Para cada retângulo (na ordem de entrada), a tupla (página, x, y), e o tamanho
+        (potência de dois) de cada página.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    placements: List[Optional[Tuple[int, int, int]]] = [None] * len(sizes)
+    packers: List[SkylinePacker] = []
+
+    for i in order:
+        w, h = sizes[i][0] + padding, sizes[i][1] + padding
+        if w > max_size or h > max_size:
+            raise ValueError(f"Bloco de {sizes[i][0]}x{sizes[i][1]}px não cabe em um atlas de {max_size}px.")
+        for page, packer in enumerate(packers):
+            pos = packer.insert(w, h)
+            if pos:
+                break
+        else:
+            packers.append(SkylinePacker(max_size, max_size))
+            page, pos = len(packers) - 1, packers[-1].insert(w, h)
+        placements[i] = (page, pos[0], pos[1])
+
+    page_sizes = [(_next_power_of_two(p.used_width), _next_power_of_two(p.used_height)) for p in packers]
+    return placements, page_sizes
+
+
+def save_atlas(
+    frames: List[Tuple[str, Image.Image, Tuple[int, int], Tuple[int, int]]],
+    output_folder: str,
+    output_name: str,
+    max_size: int = 2048,
+    padding: int = 1,
+    png_options: PngSetting = DEFAULT_PRESET,
+    png_stats: Optional[SaveStats] = None
+) -> List[str]:
+    """
+    Empacota os quadros em atlas PNG e salva, para cada página, um mapa de quadros em JSON
+    (formato "hash" do TexturePacker: frame, spriteSourceSize, sourceSize).
+
+    Args:
+        frames: Lista de (nome, imagem recortada, deslocamento do recorte, tamanho original).
+        output_folder: Pasta onde os atlas serão salvos.
+        output_name: Prefixo dos arquivos `<nome>_atlas_N.png/.json`.
+        max_size: Lado máximo de cada página.
+        padding: Espaço em pixels entre os quadros.
+        png_options: Preset ou PngOptions da gravação das páginas (ver png_writer).
+        png_stats: Acumula o tamanho e o tempo de codificação das páginas, se informado.
+
+    Returns:
+        Os caminhos dos arquivos salvos (imagem e mapa JSON de cada página).
+    """
+    with span("atlas.pack", frames=len(frames)):
+        placements, page_sizes = pack_rects([img.size for _, img, _, _ in frames], max_size, padding)
+    pages = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in page_sizes]
+    frame_maps: List[Dict[str, dict]] = [{} for _ in pages]
+
+    for (name, img, (off_x, off_y), (src_w, src_h)), (page, x, y) in zip(frames, placements):
+        pages[page].paste(img, (x, y))
+        frame_maps[page][name] = {
+            "frame": {"x": x, "y": y, "w": img.width, "h": img.height},
+            "rotated": False,
+            "trimmed": img.size != (src_w, src_h),
+            "spriteSourceSize": {"x": off_x, "y": off_y, "w": img.width, "h": img.height},
+            "sourceSize": {"w": src_w, "h": src_h},
+        }
+
+    paths = []
+    for index, (page, frame_map) in enumerate(zip(pages, frame_maps)):
+        image_name = f"{output_name}_atlas_{index}.png"
+        image_path = os.path.join(output_folder, image_name)
+        save_png(page, image_path, png_options, png_stats)
+        map_path = os.path.join(output_folder, f"{output_name}_atlas_{index}.json")
+        with open(map_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "frames": frame_map,
+                "meta": {"image": image_name, "format": "RGBA8888", "size": {"w": page.width, "h": page.height}, "scale": "1"},
+            }, f, indent=1)
+        paths.extend((image_path, map_path))
+    return paths
@@ -0,0 +1,199 @@
+# auto_slicer.py
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+from .png_writer import DEFAULT_PRESET, PngSetting, SaveStats, save_png
+from .profiling import profiled, span
+
+Rect = Tuple[int, int, int, int]
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sequências horizontais de pixels opacos: (linha, início, fim exclusivo), em ordem de leitura."""
+    altura, largura = mask.shape
+    padded = np.zeros((altura, largura + 2), dtype=np.bool_)
+    padded[:, 1:-1] = mask
+    # Em cada linha as bordas se alternam entre início e fim, então uma única varredura basta
+    bordas = np.flatnonzero(padded[:, 1:] != padded[:, :-1])
+    linhas, colunas = np.divmod(bordas, largura + 1)
+    return linhas[::2], colunas[::2], colunas[1::2]
+
+
+def _merge_row_gaps(linhas: np.ndarray, inicios: np.ndarray, fins: np.ndarray, merge_distance: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Une as sequências da mesma linha separadas por até merge_distance pixels no intervalo que
+    as cobre. O resultado é o mesmo (elas pertenceriam ao mesmo sprite de qualquer forma)
+    e há menos sequências a ligar entre as linhas.
+    """
+    novo_grupo = np.ones(len(linhas), dtype=bool)
+    novo_grupo[1:] = (linhas[1:] != linhas[:-1]) | (inicios[1:] - fins[:-1] > merge_distance)
+    primeiros = np.flatnonzero(novo_grupo)
+    ultimos = np.append(primeiros[1:], len(linhas)) - 1
+    return linhas[primeiros], inicios[primeiros], fins[ultimos]
+
+
+def _link_runs(linhas: np.ndarray, inicios: np.ndarray, fins: np.ndarray, largura: int, merge_distance: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pares (a, b) de sequências que pertencem ao mesmo sprite: separadas por no máximo
+    merge_distance pixels na horizontal e na vertical (com 0, vizinhança de 8).
+    As buscas são feitas com searchsorted sobre chaves (linha, coluna) globais, sem laço por linha.
+    """
+    d = merge_distance
+    # Passo por linha grande o bastante para que as buscas de uma linha não invadam as vizinhas
+    passo = largura + 2 * d + 3
+    chaves_inicio = linhas * passo + inicios + d + 1
+    chaves_fim = linhas * passo + fins + d + 1
+
+    pares_a, pares_b = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    # Linhas abaixo, até d + 1 linhas de distância (na mesma linha, ver _merge_row_gaps)
+    for k in range(1, d + 2):
+        base = (linhas + k) * passo + d + 1
+        # b.fim >= a.inicio - d  e  b.inicio <= a.fim + d
+        lo = np.searchsorted(chaves_fim, base + inicios - d, side="left")
+        hi = np.searchsorted(chaves_inicio, base + fins + d, side="right")
+        contagem = np.maximum(hi - lo, 0)
+        if not contagem.any():
+            continue
+        a = np.repeat(np.arange(len(linhas)), contagem)
+        deslocamento = np.arange(len(a)) - np.repeat(np.cumsum(contagem) - contagem, contagem)
+        pares_a.append(a)
+        pares_b.append(np.repeat(lo, contagem) + deslocamento)
+    return np.concatenate(pares_a), np.concatenate(pares_b)
+
+
+def _union_labels(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Componentes conexos de um grafo de n nós (arestas a-b) por união vetorizada com compressão de caminhos."""
+    pai = np.arange(n)
+    while True:
+        pa, pb = pai[a], pai[b]
+        diferentes = pa != pb
+        if not diferentes.any():
+            return pai
+        pa, pb = pa[diferentes], pb[diferentes]
+        menor = np.minimum(pa, pb)
+        np.minimum.at(pai, pa, menor)
+        np.minimum.at(pai, pb, menor)
+        while True:
+            proximo = pai[pai]
+            if np.array_equal(proximo, pai):
+                break
+            pai = proximo
+
+
+@profiled("slice.detect", pixels=lambda imagem, *args, **kwargs: imagem.width * imagem.height)
+def find_sprite_rects(imagem: Image.Image, padding: int = 0, merge_distance: int = 0, alpha_threshold: int = 1) -> List[Rect]:
+    """
+    Encontra os retângulos (x, y, largura, altura) dos sprites de uma folha irregular por
+    componentes conexos no canal alpha (pixels com alpha >= alpha_threshold).
+
+    Os componentes são rotulados sobre as sequências horizontais de pixels opacos, e não
+    pixel a pixel: as ligações entre sequências próximas saem de buscas vetorizadas e a
+    união é resolvida com numpy. Sprites separados por até merge_distance pixels são unidos.
+    Os retângulos são expandidos em padding pixels (limitados à imagem) e retornados
+    em ordem de leitura (topo, depois esquerda).
+    """
+    largura, altura = imagem.size
+    if "A" in imagem.getbands():
+        mask = np.asarray(imagem.getchannel("A")) >= alpha_threshold
+    else:
+        mask = np.asarray(imagem.convert("RGBA").getchannel("A")) >= alpha_threshold
+    linhas, inicios, fins = _runs(mask)
+    if len(linhas) == 0:
+        return []
+    linhas, inicios, fins = _merge_row_gaps(linhas, inicios, fins, merge_distance)
+
+    a, b = _link_runs(linhas, inicios, fins, largura, merge_distance)
+    rotulos = _union_labels(len(linhas), a, b)
+    raizes, componente = np.unique(rotulos, return_inverse=True)
+
+    n = len(raizes)
+    x0 = np.full(n, largura)
+    y0 = np.full(n, altura)
+    x1 = np.zeros(n, dtype=np.int64)
+    y1 = np.zeros(n, dtype=np.int64)
+    np.minimum.at(x0, componente, inicios)
+    np.minimum.at(y0, componente, linhas)
+    np.maximum.at(x1, componente, fins)
+    np.maximum.at(y1, componente, linhas + 1)
+
+    x0 = np.maximum(x0 - padding, 0)
+    y0 = np.maximum(y0 - padding, 0)
+    x1 = np.minimum(x1 + padding, largura)
+    y1 = np.minimum(y1 + padding, altura)
+    ordem = np.lexsort((x0, y0))
+    return [(int(x0[i]), int(y0[i]), int(x1[i] - x0[i]), int(y1[i] - y0[i])) for i in ordem]
+
+
+def write_rects(path: str, image_path: str, image_size: Tuple[int, int], scale: int, padding: int, merge_distance: int, nomes: List[str], rects: List[Rect]) -> None:
+    """Salva os retângulos dos sprites (na imagem original) em JSON, junto com o arquivo de cada um."""
+    metadata = {
+        "image": os.path.basename(image_path),
+        "size": list(image_size),
+        "scale": scale,
+        "padding": padding,
+        "merge_distance": merge_distance,
+        "sprites": [
+            {"name": nome, "x": x, "y": y, "w": w, "h": h}
+            for nome, (x, y, w, h) in zip(nomes, rects)
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def _save_rect(imagem: Image.Image, rect: Rect, scale: int, path: str, png_options: PngSetting, png_stats: Optional[SaveStats]) -> None:
+    x, y, w, h = rect
+    with span("slice.crop_resize", pixels=w * h * scale * scale):
+        sprite = imagem.crop((x, y, x + w, y + h))
+        if scale > 1:
+            sprite = sprite.resize((w * scale, h * scale), Image.Resampling.NEAREST)
+    save_png(sprite, path, png_options, png_stats)
+
+
+def auto_slice(
+    image_path: str,
+    output_folder: str,
+    output_name: str,
+    scale: int = 1,
+    padding: int = 0,
+    merge_distance: int = 0,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    workers: Optional[int] = None,
+    png_options: PngSetting = DEFAULT_PRESET,
+    png_stats: Optional[SaveStats] = None
+) -> List[str]:
+    """
+    Divide uma folha irregular nos sprites encontrados por find_sprite_rects, salvando um PNG
+    por sprite (`<nome>_NNN.png`, em ordem de leitura) e os retângulos em `<nome>_rects.json`.
+    Ao contrário de process_and_save_blocks, as dimensões da imagem não precisam ser
+    múltiplas de um tamanho de bloco. png_options e png_stats funcionam como em process_and_save_blocks.
+
+    Returns:
+        Os caminhos de todos os arquivos gerados.
+    """
+    with Image.open(image_path) as imagem:
+        imagem = imagem if imagem.mode == "RGBA" else imagem.convert("RGBA")
+        rects = find_sprite_rects(imagem, padding, merge_distance)
+        if progress_callback:
+            progress_callback(0.1)
+
+        nomes = [f"{output_name}_{i:03}.png" for i in range(len(rects))]
+        arquivos = [os.path.join(output_folder, nome) for nome in nomes]
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            futures = [executor.submit(_save_rect, imagem, rect, scale, path, png_options, png_stats) for rect, path in zip(rects, arquivos)]
+            for done, future in enumerate(futures, start=1):
+                future.result()
+                if progress_callback:
+                    progress_callback(0.1 + 0.9 * done / len(futures))
+
+    rects_path = os.path.join(output_folder, f"{output_name}_rects.json")
+    write_rects(rects_path, image_path, imagem.size, scale, padding, merge_distance, nomes, rects)
+    arquivos.append(rects_path)
+    if progress_callback:
+        progress_callback(1.0)
+    return arquivos
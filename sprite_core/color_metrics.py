@@ -0,0 +1,176 @@
+# color_metrics.py
+"""
+Métricas de distância entre cores, vetorizadas com numpy.
+
+Cada métrica trabalha sobre uma representação própria das cores (RGB, Lab ou matiz),
+obtida com `prepare`. A conversão é feita uma vez por cor única (ou por faixa de pixels)
+e atualizada apenas para os pixels alterados, em vez de repetida a cada comparação.
+"""
+
+from typing import Sequence, Tuple
+import numpy as np
+
+from . import COLOR_METRICS as METRICS
+
+# "legacy" é a métrica original do editor: (distância RGB ao quadrado) ** 0.8
+DEFAULT_METRIC = "legacy"
+
+# Branco de referência D65 e matriz sRGB -> XYZ
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+_SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+# sRGB (0-255) -> valor linear, tabelado para os 256 níveis de cada canal
+_channels = np.arange(256) / 255.0
+_SRGB_LINEAR = np.where(_channels <= 0.04045, _channels / 12.92, ((_channels + 0.055) / 1.055) ** 2.4)
+
+
+def _distance_threshold(tolerance: float) -> int:
+    """
+    Retorna a maior distância quadrática inteira d tal que d ** 0.8 <= tolerance.
+    Comparar a distância quadrática (inteira) com esse limite equivale à métrica original.
+    """
+    if tolerance < 0:
+        return -1
+    limit = int(tolerance ** 1.25)
+    while (limit + 1) ** 0.8 <= tolerance:
+        limit += 1
+    while limit >= 0 and limit ** 0.8 > tolerance:
+        limit -= 1
+    return limit
+
+
+def _check_metric(metric: str) -> None:
+    if metric not in METRICS:
+        raise ValueError(f"Métrica de cor desconhecida: {metric} (use {', '.join(METRICS)})")
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Converte cores sRGB (..., 3) uint8 em CIE Lab (D65), em float32."""
+    linear = _SRGB_LINEAR[np.asarray(rgb, dtype=np.uint8)]
+    xyz = linear @ _SRGB_TO_XYZ.T / _WHITE_D65
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    lab = np.empty(f.shape, dtype=np.float32)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def rgb_to_hue(rgb: np.ndarray) -> np.ndarray:
+    """
+    Matiz HSV em graus (..., 2) float32: [matiz, acromática], onde acromática vale 1
+    para tons de cinza (sem matiz definida).
+    """
+    rgb = np.asarray(rgb, dtype=np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    high = rgb.max(axis=-1)
+    delta = high - rgb.min(axis=-1)
+    safe = np.where(delta == 0, 1, delta)
+    hue = np.where(high == r, (g - b) / safe % 6, np.where(high == g, (b - r) / safe + 2, (r - g) / safe + 4)) * 60
+    out = np.empty(rgb.shape[:-1] + (2,), dtype=np.float32)
+    out[..., 0] = np.where(delta == 0, 0, hue)
+    out[..., 1] = delta == 0
+    return out
+
+
+def prepare(colors: np.ndarray, metric: str = DEFAULT_METRIC) -> np.ndarray:
+    """Representação das cores (..., 3) uint8 usada pela métrica: RGB em int32, Lab ou matiz."""
+    _check_metric(metric)
+    if metric in ("cie76", "ciede2000"):
+        return rgb_to_lab(colors)
+    if metric == "hue":
+        return rgb_to_hue(colors)
+    return np.asarray(colors).astype(np.int32)
+
+
+def distances(prepared: np.ndarray, reference: np.ndarray, metric: str = DEFAULT_METRIC) -> np.ndarray:
+    """
+    Distância entre cores já preparadas com `prepare` (as formas são combinadas por broadcasting,
+    o que permite comparar com uma cor ou montar matrizes de distância).
+
+    legacy: (distância RGB ao quadrado) ** 0.8; rgb: euclidiana; weighted_rgb: aproximação
+    "redmean" da percepção; cie76 e ciede2000: ΔE em Lab; hue: diferença de matiz em graus
+    (tons de cinza só são próximos de outros tons de cinza).
+    """
+    _check_metric(metric)
+    if metric in ("legacy", "rgb", "weighted_rgb"):
+        diff = (prepared - reference).astype(np.float64)
+        if metric == "weighted_rgb":
+            mean_r = (prepared[..., 0] + reference[..., 0]) / 2
+            weights = np.stack([2 + mean_r / 256, np.full_like(mean_r, 4.0), 2 + (255 - mean_r) / 256], axis=-1)
+            return np.sqrt((weights * diff * diff).sum(axis=-1))
+        dist2 = (diff * diff).sum(axis=-1)
+        return dist2 ** 0.8 if metric == "legacy" else np.sqrt(dist2)
+    if metric == "cie76":
+        return np.sqrt(((prepared - reference) ** 2).sum(axis=-1))
+    if metric == "ciede2000":
+        return _ciede2000(prepared, reference)
+
+    difference = np.abs(prepared[..., 0] - reference[..., 0])
+    difference = np.minimum(difference, 360 - difference)
+    achromatic_a, achromatic_b = prepared[..., 1] > 0, reference[..., 1] > 0
+    return np.where(achromatic_a & achromatic_b, 0, np.where(achromatic_a | achromatic_b, np.inf, difference))
+
+
+def within_tolerance(prepared: np.ndarray, reference_rgb: Sequence[int], tolerance: float, metric: str = DEFAULT_METRIC) -> np.ndarray:
+    """Máscara das cores preparadas que estão a no máximo `tolerance` de `reference_rgb`."""
+    reference = prepare(np.array(reference_rgb[:3], dtype=np.uint8), metric)
+    if metric in ("legacy", "rgb"):
+        # Comparação exata em inteiros, sem raiz nem potência por pixel
+        diff = prepared - reference
+        dist2 = np.einsum("...k,...k->...", diff, diff)
+        return dist2 <= (_distance_threshold(tolerance) if metric == "legacy" else tolerance * tolerance)
+    return distances(prepared, reference, metric) <= tolerance
+
+
+def color_distance(c1: Tuple[int, int, int], c2: Tuple[int, int, int], metric: str = "rgb") -> float:
+    """Distância entre duas cores RGB pela métrica escolhida."""
+    pair = prepare(np.array([c1[:3], c2[:3]], dtype=np.uint8), metric)
+    return float(distances(pair[0], pair[1], metric))
+
+
+def _ciede2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """ΔE CIEDE2000 (Sharma, Wu e Dalal, 2005), vetorizado."""
+    # float32 basta para comparar com a tolerância e reduz pela metade a memória temporária
+    lab1 = np.asarray(lab1, dtype=np.float32)
+    lab2 = np.asarray(lab2, dtype=np.float32)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    c_mean7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_mean7 / (c_mean7 + np.float32(25.0 ** 7))))
+    a1p, a2p = (1 + g) * a1, (1 + g) * a2
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+    chroma_zero = c1p * c2p == 0
+
+    dlp = L2 - L1
+    dcp = c2p - c1p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, np.where(dhp < -180, dhp + 360, dhp))
+    dhp = np.where(chroma_zero, 0, dhp)
+    dHp = 2 * np.sqrt(c1p * c2p) * np.sin(np.radians(dhp / 2))
+
+    l_mean = (L1 + L2) / 2
+    c_mean_p = (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    h_mean = np.where(
+        chroma_zero, h_sum,
+        np.where(np.abs(h1p - h2p) <= 180, h_sum / 2, np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2))
+    )
+    t = (1 - 0.17 * np.cos(np.radians(h_mean - 30)) + 0.24 * np.cos(np.radians(2 * h_mean))
+         + 0.32 * np.cos(np.radians(3 * h_mean + 6)) - 0.20 * np.cos(np.radians(4 * h_mean - 63)))
+    delta_theta = 30 * np.exp(-(((h_mean - 275) / 25) ** 2))
+    c_mean_p7 = c_mean_p ** 7
+    rc = 2 * np.sqrt(c_mean_p7 / (c_mean_p7 + np.float32(25.0 ** 7)))
+    sl = 1 + 0.015 * (l_mean - 50) ** 2 / np.sqrt(20 + (l_mean - 50) ** 2)
+    sc = 1 + 0.045 * c_mean_p
+    sh = 1 + 0.015 * c_mean_p * t
+    rt = -np.sin(np.radians(2 * delta_theta)) * rc
+
+    dl, dc, dh = dlp / sl, dcp / sc, dHp / sh
+    return np.sqrt(dl * dl + dc * dc + dh * dh + rt * dc * dh)
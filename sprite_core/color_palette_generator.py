@@ -0,0 +1,171 @@
+from PIL import Image
+from typing import List, Optional, Tuple
+import numpy as np
+import io
+
+from .color_metrics import distances, prepare
+from .profiling import profiled, span
+
+# Número máximo de pixels amostrados para a quantização
+MAX_SAMPLES = 100_000
+# Pixels com alpha abaixo deste valor são ignorados
+ALPHA_THRESHOLD = 128
+# Até este número de cores distintas a paleta é exata (histograma), sem quantização
+EXACT_MAX_COLORS = 256
+# A amostragem percorre a imagem em faixas de linhas, sem copiá-la inteira
+STRIP_ROWS = 256
+
+
+def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
+    """Converte RGB em hexadecimal."""
+    return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
+
+
+def _sample_pixels(image: Image.Image, max_samples: int = MAX_SAMPLES) -> np.ndarray:
+    """
+    Retorna até max_samples pixels RGB (N, 3) não transparentes, amostrados de forma uniforme.
+    A imagem é lida em faixas de STRIP_ROWS linhas e só os pixels amostrados são guardados.
+    """
+    if image.mode == "P" and "transparency" in image.info:
+        image = image.convert("RGBA")
+    has_alpha = image.mode in ("RGBA", "LA", "PA")
+    # Total de pixels considerados, para o passo da amostragem (pelo histograma do alpha, sem cópia)
+    total = sum(image.histogram()[-256:][ALPHA_THRESHOLD:]) if has_alpha else image.width * image.height
+    step = max(1, total // max_samples)
+
+    samples, seen = [], 0
+    for y in range(0, image.height, STRIP_ROWS):
+        strip = image.crop((0, y, image.width, min(y + STRIP_ROWS, image.height)))
+        if has_alpha:
+            rgba = np.asarray(strip if strip.mode == "RGBA" else strip.convert("RGBA")).reshape(-1, 4)
+            pixels = rgba[rgba[:, 3] >= ALPHA_THRESHOLD, :3]
+        else:
+            pixels = np.asarray(strip if strip.mode == "RGB" else strip.convert("RGB")).reshape(-1, 3)
+        # Mesmos pixels de pixels_da_imagem[::step]: a posição global continua entre as faixas
+        samples.append(pixels[-seen % step::step])
+        seen += len(pixels)
+    return np.concatenate(samples) if samples else np.empty((0, 3), dtype=np.uint8)
+
+
+def exact_palette(image: Image.Image, max_colors: int = EXACT_MAX_COLORS) -> Optional[List[Tuple[Tuple[int, int, int], int]]]:
+    """
+    Histograma exato das cores em uma única passada (Image.getcolors), ignorando pixels
+    transparentes e somando as variações de alpha de uma mesma cor RGB.
+
+    Returns:
+        Lista de (cor, número de pixels), da mais para a menos frequente, ou None se a
+        imagem tiver mais de max_colors cores.
+    """
+    rgba = image if image.mode == "RGBA" else image.convert("RGBA")
+    # a mesma cor RGB pode aparecer com vários valores de alpha
+    colors = rgba.getcolors(max_colors * 4)
+    if colors is None:
+        return None
+
+    counts = {}
+    for count, (r, g, b, a) in colors:
+        if a >= ALPHA_THRESHOLD:
+            counts[(r, g, b)] = counts.get((r, g, b), 0) + count
+    if len(counts) > max_colors:
+        return None
+    return sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+
+def median_cut(pixels: np.ndarray, num_colors: int) -> List[Tuple[Tuple[int, int, int], int]]:
+    """
+    Quantiza os pixels (N, 3) por corte na mediana: divide repetidamente a caixa mais
+    populosa e extensa ao meio, no canal de maior amplitude.
+
+    Returns:
+        Lista de (cor média, número de pixels), da mais para a menos frequente.
+    """
+    if len(pixels) == 0:
+        return []
+
+    def extent(box: np.ndarray) -> np.ndarray:
+        return box.max(axis=0).astype(np.int32) - box.min(axis=0)
+
+    boxes = [pixels]
+    extents = [extent(pixels)]
+    while len(boxes) < num_colors:
+        index = max(range(len(boxes)), key=lambda i: int(extents[i].max()) * len(boxes[i]))
+        if extents[index].max() == 0:
+            break
+        box = boxes.pop(index)
+        channel = int(np.argmax(extents.pop(index)))
+        half = len(box) // 2
+        order = np.argpartition(box[:, channel], half)
+        for part in (box[order[:half]], box[order[half:]]):
+            boxes.append(part)
+            extents.append(extent(part))
+
+    colors = [(tuple(int(round(c)) for c in box.mean(axis=0)), len(box)) for box in boxes]
+    return sorted(colors, key=lambda item: item[1], reverse=True)
+
+
+def filter_similar_colors(colors: List[Tuple[int, int, int]], num_colors: int, min_distance: float, metric: str = "rgb") -> List[Tuple[int, int, int]]:
+    """
+    Mantém, na ordem dada, as cores que estão a pelo menos min_distance de todas as já mantidas.
+    A matriz de distâncias (pela métrica escolhida, ver color_metrics) é calculada de uma só vez.
+    """
+    if not colors:
+        return []
+    prepared = prepare(np.array(colors, dtype=np.uint8), metric)
+    distance_matrix = distances(prepared[:, None, :], prepared[None, :, :], metric)
+
+    kept = []
+    suppressed = np.zeros(len(colors), dtype=bool)
+    for i in range(len(colors)):
+        if suppressed[i]:
+            continue
+        kept.append(colors[i])
+        if len(kept) >= num_colors:
+            break
+        suppressed |= distance_matrix[i] < min_distance
+    return kept
+
+
+def _colorthief_palette(image: Image.Image, color_count: int) -> List[Tuple[int, int, int]]:
+    """Paleta pelo ColorThief (pipeline original, com codificação PNG intermediária)."""
+    from colorthief import ColorThief
+
+    with io.BytesIO() as stream:
+        image_rgb = image.convert("RGB")
+        image_rgb.save(stream, format='PNG')
+        stream.seek(0)
+
+        color_thief = ColorThief(stream)
+        return color_thief.get_palette(color_count=color_count, quality=9)
+
+
+@profiled("palette", pixels=lambda image, *args, **kwargs: image.width * image.height)
+def get_color_palette(image: Image.Image, num_colors: int = 24, min_distance: int = 20, method: str = "auto", metric: str = "rgb") -> List[str]:
+    """
+    Gera uma paleta de cores a partir de uma imagem, removendo cores muito parecidas.
+
+    O método padrão ("auto") usa o histograma exato das cores quando a imagem tem até
+    EXACT_MAX_COLORS cores distintas (o caso da pixel art) e, acima disso, o corte na mediana
+    ("median_cut") sobre uma amostra dos pixels não transparentes. "colorthief" mantém o
+    comportamento anterior. `metric` define como a distância mínima entre as cores é medida.
+    """
+    try:
+        with span("palette.histogram"):
+            exact = exact_palette(image) if method == "auto" else None
+        with span("palette.quantize", method=method):
+            if exact is not None:
+                raw_palette = [color for color, _ in exact]
+            elif method == "colorthief":
+                raw_palette = _colorthief_palette(image, num_colors * 3)
+            elif method in ("auto", "median_cut"):
+                raw_palette = [color for color, _ in median_cut(_sample_pixels(image), num_colors * 3)]
+            else:
+                raise ValueError(f"Método de paleta desconhecido: {method}")
+
+        if not raw_palette:
+            return []
+
+        with span("palette.filter", colors=len(raw_palette)):
+            filtered_palette = filter_similar_colors(raw_palette, num_colors, min_distance, metric)
+        return [rgb_to_hex(color) for color in filtered_palette]
+    except Exception as e:
+        raise Exception(f"Erro ao gerar a paleta de cores: {e}")
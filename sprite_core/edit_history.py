@@ -0,0 +1,303 @@
+# edit_history.py
+
+import functools
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+from PIL import Image
+
+from .color_metrics import DEFAULT_METRIC
+from .image_editor import ColorEdit, STRIP_ROWS, replace_colors, replace_colors_inplace, rgba_array
+from .indexed_image import IndexedImage
+
+# Memória máxima (em bytes) usada pelos deltas e quadros-chave de um histórico, além do
+# estado original e do atual
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# A cada quantas edições o estado completo é guardado, limitando o replay das operações
+KEYFRAME_INTERVAL = 8
+
+Operation = Callable[[Image.Image], Image.Image]
+# Versão da operação que altera um buffer RGBA (H, W, 4) no lugar, sem passar por imagens do Pillow
+InPlaceOperation = Callable[[np.ndarray], object]
+
+
+class PixelDelta(NamedTuple):
+    """Pixels alterados por uma edição: índices lineares e os valores RGBA (como uint32) antes e depois."""
+    indices: np.ndarray
+    before: np.ndarray
+    after: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.indices.nbytes + self.before.nbytes + self.after.nbytes
+
+
+class _Entry:
+    """Uma edição do histórico: a operação (sempre mantida, para replay) e o delta de pixels (descartável)."""
+    def __init__(self, label: str, operation: Operation, in_place: Optional[InPlaceOperation], delta: Optional[PixelDelta]) -> None:
+        self.label = label
+        self.operation = operation
+        self.in_place = in_place
+        self.delta = delta
+
+    def run(self, pixels: np.ndarray) -> np.ndarray:
+        """Novo estado a partir de `pixels`, que não é alterado."""
+        if self.in_place is not None:
+            after = pixels.copy()
+            self.in_place(after)
+            return after
+        return rgba_array(self.operation(Image.fromarray(pixels)))
+
+
+class EditHistory:
+    """
+    Histórico de edições não destrutivo com desfazer/refazer.
+
+    Cada edição guarda a operação que a produziu (por exemplo, os parâmetros de uma
+    substituição de cores) e, quando compensa, apenas os pixels que ela alterou.
+    Desfazer/refazer aplica esse delta em O(pixels alterados). Quando um delta foi
+    descartado para respeitar o orçamento de memória, o estado é reconstruído a partir
+    do quadro-chave (estado completo) mais próximo, refazendo as operações seguintes.
+
+    Os estados são buffers RGBA do próprio histórico, compartilhados sem cópia com a imagem
+    devolvida (`image`) e com os quadros-chave; o buffer atual só é copiado antes de ser
+    alterado no lugar enquanto estiver compartilhado (cópia na escrita). Assim, uma edição
+    aloca um único buffer do tamanho da imagem (o novo estado), além do delta.
+
+    `base` pode ser um buffer RGBA (H, W, 4) uint8, como ImageDocument.pixels: ele vira o
+    estado original sem cópia e nunca é alterado.
+    """
+    def __init__(self, base: Union[Image.Image, np.ndarray], memory_budget: int = DEFAULT_MEMORY_BUDGET, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        self.memory_budget = memory_budget
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._pixels = base if isinstance(base, np.ndarray) else rgba_array(base)
+        self._entries: List[_Entry] = []
+        # Estado completo por posição no histórico; o estado 0 (imagem original) nunca é descartado
+        self._keyframes: Dict[int, np.ndarray] = {0: self._pixels}
+        self._position = 0
+        self._image: Optional[Image.Image] = None
+        # O buffer atual também está em uma imagem devolvida ou em um quadro-chave
+        self._shared = True
+
+    @property
+    def image(self) -> Image.Image:
+        """Imagem no estado atual (compartilhada; não deve ser modificada)."""
+        if self._image is None:
+            # Somente leitura para o Pillow: operações que alteram a imagem trabalham em uma cópia
+            self._image = Image.fromarray(self._pixels)
+            self._shared = True
+        return self._image
+
+    @property
+    def can_undo(self) -> bool:
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._position < len(self._entries)
+
+    @property
+    def undo_label(self) -> Optional[str]:
+        return self._entries[self._position - 1].label if self.can_undo else None
+
+    @property
+    def redo_label(self) -> Optional[str]:
+        return self._entries[self._position].label if self.can_redo else None
+
+    @property
+    def memory_used(self) -> int:
+        """
+        Bytes ocupados pelos deltas e quadros-chave descartáveis. O estado original (quadro 0,
+        nunca descartado) e o estado atual ficam de fora: eles existem de qualquer forma, e
+        contá-los faria uma imagem do tamanho do orçamento descartar todos os deltas.
+        """
+        deltas = sum(entry.delta.nbytes for entry in self._entries if entry.delta is not None)
+        return deltas + sum(
+            frame.nbytes for state, frame in self._keyframes.items()
+            if state != 0 and frame is not self._pixels
+        )
+
+    def apply(self, label: str, operation: Operation, in_place: Optional[InPlaceOperation] = None) -> Image.Image:
+        """
+        Aplica a operação ao estado atual, descartando o que havia para refazer, e devolve a nova imagem.
+        `in_place`, se informado, é a mesma operação sobre um buffer RGBA (ver replace_colors_inplace),
+        usada no lugar de `operation` para não converter o estado em imagem e de volta.
+        """
+        del self._entries[self._position:]
+        for state in [state for state in self._keyframes if state > self._position]:
+            del self._keyframes[state]
+
+        entry = _Entry(label, operation, in_place, None)
+        before = self._pixels
+        after = entry.run(before)
+        entry.delta = _pixel_delta(before, after)
+        self._entries.append(entry)
+        self._set_pixels(after)
+        self._position += 1
+        if self._position % self.keyframe_interval == 0:
+            self._keyframes[self._position] = after
+            self._shared = True
+        self._enforce_budget()
+        return self.image
+
+    def recolor(self, edits: Sequence[ColorEdit], label: Optional[str] = None, metric: str = DEFAULT_METRIC) -> Image.Image:
+        """Atalho para registrar uma substituição de cores (ver replace_colors)."""
+        edits = list(edits)
+        return self.apply(
+            label or f"Substituição de {len(edits)} cor(es)",
+            functools.partial(replace_colors, mapping=edits, metric=metric),
+            functools.partial(replace_colors_inplace, mapping=edits, metric=metric)
+        )
+
+    def undo(self) -> Image.Image:
+        if not self.can_undo:
+            raise IndexError("Nada para desfazer.")
+        entry = self._entries[self._position - 1]
+        self._position -= 1
+        if entry.delta is not None:
+            self._put(entry.delta.indices, entry.delta.before)
+        elif self._position in self._keyframes:
+            self._set_pixels(self._keyframes[self._position], shared=True)
+        else:
+            self._set_pixels(self._rebuild(self._position))
+        return self.image
+
+    def redo(self) -> Image.Image:
+        if not self.can_redo:
+            raise IndexError("Nada para refazer.")
+        entry = self._entries[self._position]
+        self._position += 1
+        if entry.delta is not None:
+            self._put(entry.delta.indices, entry.delta.after)
+        elif self._position in self._keyframes:
+            self._set_pixels(self._keyframes[self._position], shared=True)
+        else:
+            self._set_pixels(entry.run(self._pixels))
+        return self.image
+
+    def _set_pixels(self, pixels: np.ndarray, shared: bool = False) -> None:
+        self._pixels = pixels
+        self._image = None
+        self._shared = shared
+
+    def _put(self, indices: np.ndarray, values: np.ndarray) -> None:
+        """Escreve os valores dos pixels alterados no estado atual (copiado antes, se estiver compartilhado)."""
+        if self._shared:
+            self._set_pixels(self._pixels.copy())
+        self._pixels.reshape(-1).view(np.uint32)[indices] = values
+        self._image = None
+
+    def _rebuild(self, state: int) -> np.ndarray:
+        """Reconstrói um estado a partir do quadro-chave anterior mais próximo, refazendo as operações."""
+        start = max(s for s in self._keyframes if s <= state)
+        entries = self._entries[start:state]
+        pixels = entries[0].run(self._keyframes[start])
+        for entry in entries[1:]:
+            if entry.in_place is not None:
+                # O buffer intermediário é do próprio replay: pode ser alterado no lugar
+                entry.in_place(pixels)
+            else:
+                pixels = entry.run(pixels)
+        return pixels
+
+    def _enforce_budget(self) -> None:
+        """
+        Descarta deltas e quadros-chave, das edições mais antigas para as mais recentes, até caber
+        no orçamento: as edições recentes, as mais desfeitas, continuam com desfazer em O(delta).
+        """
+        used = self.memory_used
+        for state, entry in enumerate(self._entries):
+            if used <= self.memory_budget:
+                return
+            frame = self._keyframes.get(state)
+            if state != 0 and frame is not None and frame is not self._pixels:
+                used -= self._keyframes.pop(state).nbytes
+            if entry.delta is not None:
+                used -= entry.delta.nbytes
+                entry.delta = None
+
+
+class IndexedEditHistory:
+    """
+    Histórico de edições de uma imagem indexada (ver IndexedImage), com a mesma interface de
+    EditHistory para substituições de cores. Como cada edição só troca a paleta, cada estado
+    guarda apenas a paleta (no máximo 1 KB) e desfazer/refazer não percorre os pixels.
+    """
+    def __init__(self, base: IndexedImage) -> None:
+        self._states: List[IndexedImage] = [base]
+        self._labels: List[str] = []
+        self._position = 0
+
+    @property
+    def image(self) -> Image.Image:
+        """Imagem P no estado atual (compartilhada; não deve ser modificada)."""
+        return self._states[self._position].image
+
+    @property
+    def indexed(self) -> IndexedImage:
+        return self._states[self._position]
+
+    @property
+    def can_undo(self) -> bool:
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._position < len(self._labels)
+
+    @property
+    def undo_label(self) -> Optional[str]:
+        return self._labels[self._position - 1] if self.can_undo else None
+
+    @property
+    def redo_label(self) -> Optional[str]:
+        return self._labels[self._position] if self.can_redo else None
+
+    @property
+    def memory_used(self) -> int:
+        """Bytes ocupados pelas paletas (o buffer de índices é o mesmo em todos os estados)."""
+        return sum(state.palette.nbytes for state in self._states)
+
+    def recolor(self, edits: Sequence[ColorEdit], label: Optional[str] = None, metric: str = DEFAULT_METRIC) -> Image.Image:
+        """Registra uma substituição de cores sobre a paleta, descartando o que havia para refazer."""
+        edits = list(edits)
+        del self._states[self._position + 1:]
+        del self._labels[self._position:]
+        self._states.append(self.indexed.recolor(edits, metric))
+        self._labels.append(label or f"Substituição de {len(edits)} cor(es)")
+        self._position += 1
+        return self.image
+
+    def undo(self) -> Image.Image:
+        if not self.can_undo:
+            raise IndexError("Nada para desfazer.")
+        self._position -= 1
+        return self.image
+
+    def redo(self) -> Image.Image:
+        if not self.can_redo:
+            raise IndexError("Nada para refazer.")
+        self._position += 1
+        return self.image
+
+
+def _pixel_delta(before: np.ndarray, after: np.ndarray) -> Optional[PixelDelta]:
+    """
+    Delta entre dois estados RGBA, ou None quando guardar os pixels alterados (12 bytes cada)
+    custaria mais que um estado completo (4 bytes por pixel); nesse caso vale o replay.
+    """
+    if before.shape != after.shape:
+        return None
+    old = before.reshape(-1).view(np.uint32)
+    new = after.reshape(-1).view(np.uint32)
+    # Comparação por faixas: os índices em int64 de flatnonzero nunca existem para a imagem inteira
+    step = STRIP_ROWS * before.shape[1]
+    dtype = np.uint32 if old.size <= np.iinfo(np.uint32).max else np.int64
+    chunks, changed = [], 0
+    for start in range(0, old.size, step):
+        found = np.flatnonzero(old[start:start + step] != new[start:start + step])
+        changed += found.size
+        if changed * 3 > old.size:
+            return None
+        chunks.append((found + start).astype(dtype))
+    indices = np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+    return PixelDelta(indices, old[indices], new[indices])
@@ -0,0 +1,242 @@
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+import os
+import time
+
+from . import IMAGE_EXTENSIONS
+from .png_writer import DEFAULT_PRESET, PngSetting, SaveStats, save_png
+from .profiling import PROFILER, span
+
+# Nomes de formato do Pillow para as extensões que não coincidem com eles
+FORMAT_ALIASES = {"jpg": "JPEG", "jpeg": "JPEG", "tif": "TIFF"}
+# Formatos sem canal alpha: a transparência é achatada sobre esta cor
+FLATTEN_BACKGROUND = (255, 255, 255)
+
+
+class ConversionResult(NamedTuple):
+    """Resultado do processamento (conversão ou redimensionamento) de um arquivo em lote."""
+    input_path: str
+    output_path: Optional[str]
+    ok: bool
+    error: Optional[str]
+    seconds: float
+    bytes_written: int
+
+
+def _has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+
+def prepare_for_format(img: Image.Image, file_type: str) -> Image.Image:
+    """
+    Ajusta o modo da imagem ao formato de destino:
+    JPEG não tem alpha (a transparência é achatada sobre FLATTEN_BACKGROUND), GIF é
+    indexado (até 255 cores, com um índice reservado para os pixels transparentes) e,
+    nos demais formatos, imagens P com transparência são gravadas em RGBA.
+    """
+    pil_format = FORMAT_ALIASES.get(file_type.lower(), file_type.upper())
+
+    if pil_format == "JPEG":
+        if _has_alpha(img):
+            rgba = img.convert("RGBA")
+            flattened = Image.new("RGB", rgba.size, FLATTEN_BACKGROUND)
+            flattened.paste(rgba, mask=rgba.getchannel("A"))
+            return flattened
+        return img if img.mode in ("RGB", "L", "CMYK") else img.convert("RGB")
+
+    if pil_format == "GIF":
+        if img.mode == "P":
+            return _gif_palette_image(img)
+        if _has_alpha(img):
+            rgba = img.convert("RGBA")
+            indexed = rgba.convert("RGB").quantize(255)
+            transparent = rgba.getchannel("A").point(lambda a: 255 if a < 128 else 0, "1")
+            indexed.paste(255, mask=transparent)
+            indexed.info["transparency"] = 255
+            return indexed
+        return img.convert("RGB").quantize(256)
+
+    # Fora do PNG e do GIF, o alpha por entrada da paleta se perderia: a imagem vai em RGBA
+    if img.mode == "P" and _has_alpha(img) and pil_format != "PNG":
+        return img.convert("RGBA")
+    return img
+
+
+def _gif_palette_image(img: Image.Image) -> Image.Image:
+    """
+    Cópia de uma imagem P pronta para o GIF, que aceita um único índice transparente: com o
+    alpha por entrada do PNG (tRNS em bytes), as entradas com alpha < 128 passam a usar a
+    primeira delas (apenas os índices são remapeados) e as demais ficam opacas. A paleta é
+    regravada em RGB, porque o convert("RGBA") do Pillow deixa o alpha na paleta da imagem
+    de origem e o codificador do GIF a leria deslocada.
+    """
+    transparency = img.info.get("transparency")
+    if isinstance(transparency, bytes):
+        clear = [i for i, alpha in enumerate(transparency) if alpha < 128]
+    else:
+        clear = [transparency] if isinstance(transparency, int) else []
+    if len(clear) > 1:
+        lut = list(range(256))
+        for i in clear[1:]:
+            lut[i] = clear[0]
+        result = img.point(lut)
+    else:
+        result = img.copy()
+    result.putpalette(img.getpalette())
+    result.info.pop("transparency", None)
+    if clear:
+        result.info["transparency"] = clear[0]
+    return result
+
+
+def save_image(image: Image.Image, path: str, png_options: PngSetting = DEFAULT_PRESET, png_stats: Optional[SaveStats] = None) -> str:
+    """
+    Grava a imagem no formato indicado pela extensão do caminho, ajustando o modo ao formato
+    (ver prepare_for_format). PNGs passam por save_png; imagens P são gravadas indexadas
+    direto em PNG e GIF. Retorna o caminho gravado.
+    """
+    file_type = os.path.splitext(path)[1].lstrip(".")
+    pil_format = FORMAT_ALIASES.get(file_type.lower(), file_type.upper())
+    with span("convert.prepare", pixels=image.width * image.height):
+        prepared = prepare_for_format(image, file_type)
+    if pil_format == "PNG":
+        return save_png(prepared, path, png_options, png_stats)
+    save_args = {"transparency": prepared.info["transparency"]} if pil_format == "GIF" and "transparency" in prepared.info else {}
+    with span("convert.encode", pixels=image.width * image.height) as encode:
+        prepared.save(path, pil_format, **save_args)
+        encode["bytes"] = os.path.getsize(path)
+    return path
+
+
+def convert_image_type(image_path: str, output_folder: str, output_name: str, file_type: str, png_options: PngSetting = DEFAULT_PRESET) -> str:
+    """
+    Converte a imagem para o formato escolhido e salva na pasta de saída.
+    PNGs são gravados com png_options (ver png_writer).
+    Retorna o caminho do arquivo convertido ou lança uma exceção.
+    """
+    pil_format = FORMAT_ALIASES.get(file_type.lower(), file_type.upper())
+    output_path = os.path.join(output_folder, f"{output_name}.{file_type}")
+    with Image.open(image_path) as img, span("convert", pixels=img.width * img.height, format=pil_format) as attrs:
+        with span("convert.decode", pixels=img.width * img.height):
+            img.load()
+        save_image(img, output_path, png_options)
+        attrs["bytes"] = os.path.getsize(output_path)
+    return output_path
+
+
+def _run_one(func: Callable[..., str], image_path: str, *args) -> ConversionResult:
+    """Processa um arquivo com func(image_path, *args) e devolve o resultado estruturado (nunca lança exceção)."""
+    start = time.perf_counter()
+    try:
+        output_path = func(image_path, *args)
+        return ConversionResult(image_path, output_path, True, None, time.perf_counter() - start, os.path.getsize(output_path))
+    except Exception as e:
+        return ConversionResult(image_path, None, False, str(e), time.perf_counter() - start, 0)
+
+
+def _run_one_in_pool(profile: bool, func: Callable[..., str], image_path: str, *args) -> Tuple[ConversionResult, List[dict]]:
+    """
+    _run_one em um processo do pool, com o perfilador no estado do processo principal: os spans
+    registrados voltam junto com o resultado, para serem juntados aos do processo principal.
+    """
+    PROFILER.enabled = profile
+    start = PROFILER.mark()
+    result = _run_one(func, image_path, *args)
+    spans = PROFILER.spans(start) if profile else []
+    # O processo do pool só transporta os spans: não precisa guardá-los
+    PROFILER.clear()
+    return result, spans
+
+
+def list_images(paths: Sequence[str]) -> List[str]:
+    """Expande as pastas da lista nas imagens contidas diretamente nelas."""
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            images.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        else:
+            images.append(path)
+    return images
+
+
+def _unique_output_names(image_paths: Sequence[str]) -> List[str]:
+    """Usa o nome de cada arquivo, acrescentando um sufixo quando dois arquivos têm o mesmo nome."""
+    used, names = set(), []
+    for path in image_paths:
+        base = name = os.path.splitext(os.path.basename(path))[0]
+        suffix = 1
+        while name in used:
+            name = f"{base}_{suffix}"
+            suffix += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def convert_images(
+    image_paths: Sequence[str],
+    output_folder: str,
+    file_type: str,
+    output_names: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    png_options: PngSetting = DEFAULT_PRESET
+) -> List[ConversionResult]:
+    """
+    Converte vários arquivos (ou pastas de imagens) em paralelo, em um pool de processos.
+
+    Args:
+        image_paths: Arquivos e/ou pastas de entrada.
+        output_folder: Pasta onde os arquivos convertidos serão salvos.
+        file_type: Extensão de destino (png, jpg, gif, webp...).
+        output_names: Nomes de saída (sem extensão); por padrão, o nome de cada arquivo.
+        workers: Número de processos (padrão: número de CPUs). Com 1, roda no processo atual.
+        progress_callback: Uma função para notificar o progresso (de 0 a 1), ou None.
+        png_options: Preset ou PngOptions usado quando o destino é PNG (ver png_writer).
+
+    Returns:
+        Um ConversionResult por arquivo, na ordem de entrada.
+    """
+    paths = list_images(image_paths)
+    names = list(output_names) if output_names else _unique_output_names(paths)
+    jobs = [(path, output_folder, name, file_type, png_options) for path, name in zip(paths, names)]
+    return run_file_jobs(convert_image_type, jobs, workers, progress_callback)
+
+
+def run_file_jobs(
+    func: Callable[..., str],
+    jobs: Sequence[tuple],
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[float], None]] = None
+) -> List[ConversionResult]:
+    """
+    Roda func(caminho, *args) -> caminho de saída para cada job (caminho, *args) em um pool
+    de processos (func deve ser uma função de módulo). Com workers=1 ou um único job, roda no
+    processo atual. Com o perfilador ligado, os spans dos processos do pool são juntados aos
+    do processo atual. Retorna um ConversionResult por job, na ordem de entrada.
+    """
+    results: List[Optional[ConversionResult]] = [None] * len(jobs)
+    if (workers or os.cpu_count() or 1) == 1 or len(jobs) <= 1:
+        for done, job in enumerate(jobs, start=1):
+            results[done - 1] = _run_one(func, *job)
+            if progress_callback:
+                progress_callback(done / len(jobs))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_one_in_pool, PROFILER.enabled, func, *job): i for i, job in enumerate(jobs)}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]], spans = future.result()
+                PROFILER.extend(spans)
+                if progress_callback:
+                    progress_callback(done / len(jobs))
+        except BaseException:
+            # Se o callback interromper o lote (cancelamento), descarta os arquivos ainda na fila
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    return results
@@ -0,0 +1,181 @@
+# image_document.py
+
+import os
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
+from PIL import Image
+
+from .profiling import span
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .indexed_image import IndexedImage
+
+# Quantidade de tamanhos de preview guardados por documento
+MAX_PREVIEWS = 8
+# Acima deste número de pixels o documento é tratado como imagem grande
+LARGE_IMAGE_PIXELS = 1920 * 1920
+# Lado máximo do nível reduzido (mip) usado para previews e amostragem de imagens grandes
+MIP_MAX_SIDE = 2048
+# Memória máxima (em bytes) dos documentos guardados pelo ImageCache
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class ImageDocument:
+    """
+    Imagem aberta no editor. O arquivo é decodificado uma única vez; o buffer RGBA
+    e as versões reduzidas usadas nos previews ficam em cache.
+    As imagens retornadas são compartilhadas e não devem ser modificadas.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        # Apenas o cabeçalho é lido aqui; os pixels são decodificados sob demanda
+        with Image.open(path) as img:
+            self.size: Tuple[int, int] = img.size
+            self.mode: str = img.mode
+        self._rgba: Optional[Image.Image] = None
+        self._pixels: Optional["np.ndarray"] = None
+        self._indexed: Optional["IndexedImage"] = None
+        self._indexed_checked = False
+        self._mip: Optional[Image.Image] = None
+        self._previews: "OrderedDict[Tuple[int, int], Image.Image]" = OrderedDict()
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    @property
+    def is_large(self) -> bool:
+        """Imagens grandes não são decodificadas em RGBA para previews nem para amostragem."""
+        return self.width * self.height > LARGE_IMAGE_PIXELS
+
+    @property
+    def mip(self) -> Image.Image:
+        """
+        Versão reduzida em RGBA, com lado máximo MIP_MAX_SIDE (a própria imagem RGBA se ela
+        não for grande). A redução é feita no modo original do arquivo (usando a decodificação
+        reduzida do JPEG quando disponível), e só o resultado é convertido para RGBA.
+        """
+        if not self.is_large:
+            return self.rgba
+        if self._mip is None:
+            factor = -(-max(self.size) // MIP_MAX_SIDE)
+            target = (max(1, self.width // factor), max(1, self.height // factor))
+            with Image.open(self.path) as img, span("preview.mip", pixels=self.width * self.height):
+                img.draft(img.mode, target)
+                self._mip = img.resize(target, Image.Resampling.NEAREST).convert("RGBA")
+        return self._mip
+
+    @property
+    def rgba(self) -> Image.Image:
+        """A imagem completa em RGBA, decodificada na primeira chamada."""
+        if self._rgba is None:
+            with Image.open(self.path) as img, span("document.decode", pixels=self.width * self.height):
+                # convert() para o mesmo modo é uma cópia: um PNG RGBA fica com o buffer decodificado
+                img.load()
+                self._rgba = img if img.mode == "RGBA" else img.convert("RGBA")
+        return self._rgba
+
+    @property
+    def pixels(self) -> "np.ndarray":
+        """
+        Buffer RGBA (H, W, 4) somente leitura da imagem completa. Depois da primeira chamada,
+        `rgba` passa a ser uma view dele, e o histórico de edições o usa como estado original
+        sem cópia: o documento e o histórico guardam um único buffer do tamanho da imagem.
+        """
+        if self._pixels is None:
+            # numpy só é carregado quando o documento é editado
+            from .image_editor import rgba_array
+            pixels = rgba_array(self.rgba)
+            pixels.flags.writeable = False
+            self._pixels = pixels
+            self._rgba = Image.fromarray(pixels)
+        return self._pixels
+
+    @property
+    def nbytes(self) -> int:
+        """Memória aproximada dos buffers decodificados em cache (imagem completa, mip, previews e índices)."""
+        total = self.width * self.height * 4 if self._rgba is not None else 0
+        if self._mip is not None:
+            total += self._mip.width * self._mip.height * 4
+        total += sum(preview.width * preview.height * 4 for preview in self._previews.values())
+        if self._indexed is not None:
+            total += self._indexed.indices.nbytes
+        return total
+
+    @property
+    def indexed(self) -> Optional["IndexedImage"]:
+        """
+        Versão em cores indexadas (ver IndexedImage), ou None se a imagem tiver mais de 256 cores.
+        Arquivos P são indexados direto dos índices decodificados, sem passar por RGBA.
+        """
+        if not self._indexed_checked:
+            # numpy só é carregado quando o documento é editado
+            from .indexed_image import IndexedImage
+            if self.mode == "P":
+                with Image.open(self.path) as img, span("document.decode", pixels=self.width * self.height):
+                    img.load()
+                    self._indexed = IndexedImage.from_image(img)
+            else:
+                self._indexed = IndexedImage.from_image(self.rgba)
+            self._indexed_checked = True
+        return self._indexed
+
+    def is_stale(self) -> bool:
+        """Verifica se o arquivo foi alterado ou removido desde a decodificação."""
+        try:
+            return os.path.getmtime(self.path) != self.mtime
+        except OSError:
+            return True
+
+    def fit_size(self, box_w: int, box_h: int) -> Tuple[int, int]:
+        """Tamanho da imagem escalada para caber em uma caixa box_w x box_h."""
+        scale = min(box_w / self.width, box_h / self.height)
+        return max(1, int(self.width * scale)), max(1, int(self.height * scale))
+
+    def preview(self, box_w: int, box_h: int) -> Image.Image:
+        """Versão reduzida (NEAREST) que cabe na caixa, guardada por tamanho."""
+        size = self.fit_size(box_w, box_h)
+        if size in self._previews:
+            self._previews.move_to_end(size)
+        else:
+            mip = self.mip
+            with span("preview.resize", pixels=size[0] * size[1]):
+                self._previews[size] = mip.resize(size, Image.Resampling.NEAREST)
+            if len(self._previews) > MAX_PREVIEWS:
+                self._previews.popitem(last=False)
+        return self._previews[size]
+
+
+class ImageCache:
+    """
+    Cache LRU de documentos, invalidado pelo caminho e pela data de modificação do arquivo e
+    limitado pelo número de documentos e pela memória já decodificada (ver ImageDocument.nbytes).
+    O documento pedido por último nunca é descartado.
+    """
+    def __init__(self, max_documents: int = 4, max_bytes: int = MAX_CACHE_BYTES) -> None:
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self._documents: "OrderedDict[str, ImageDocument]" = OrderedDict()
+
+    def get(self, path: str) -> ImageDocument:
+        """Retorna o documento do caminho, decodificando-o novamente apenas se necessário."""
+        key = os.path.abspath(path)
+        document = self._documents.get(key)
+        if document is None or document.is_stale():
+            document = ImageDocument(path)
+        self._documents[key] = document
+        self._documents.move_to_end(key)
+        while len(self._documents) > self.max_documents or (
+            len(self._documents) > 1 and sum(doc.nbytes for doc in self._documents.values()) > self.max_bytes
+        ):
+            self._documents.popitem(last=False)
+        return document
+
+    def clear(self) -> None:
+        self._documents.clear()
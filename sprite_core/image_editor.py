@@ -0,0 +1,194 @@
+from PIL import Image
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .color_metrics import DEFAULT_METRIC, prepare, within_tolerance
+from .profiling import profiled, span
+
+RGB = Tuple[int, int, int]
+# Uma entrada de remapeamento: (cor antiga, cor nova) ou (cor antiga, cor nova, tolerância)
+ColorEdit = Union[Tuple[RGB, RGB], Tuple[RGB, RGB, float]]
+DEFAULT_TOLERANCE = 30
+# Acima deste número de cores distintas a imagem não é tratada como "tipo paleta"
+PALETTE_LIKE_MAX_COLORS = 65536
+# Os temporários (diferenças em int32, máscaras) são calculados por faixas de linhas
+STRIP_ROWS = 256
+# Imagens até este número de pixels, ou edições que alteram até SPARSE_REMAP_MAX_COLORS cores
+# da tabela, são remapeadas por busca binária nas cores alteradas; as demais usam um índice
+# de 24 bits (32 MB) alocado só durante a chamada
+DENSE_INDEX_MIN_PIXELS = 1 << 16
+SPARSE_REMAP_MAX_COLORS = 8
+
+
+def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+    """Converte uma cor hexadecimal em uma tupla RGB."""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+def _color_mask(rgb: np.ndarray, old_color_rgb: Tuple[int, int, int], tolerance: float, metric: str = DEFAULT_METRIC) -> np.ndarray:
+    """Máscara booleana das cores de `rgb` (..., 3) dentro da tolerância de `old_color_rgb`."""
+    return within_tolerance(prepare(rgb, metric), old_color_rgb, tolerance, metric)
+
+
+def _apply_edits(colors: np.ndarray, edits: list, metric: str, prepared: Optional[np.ndarray] = None) -> None:
+    """
+    Aplica as substituições, em ordem, sobre `colors` (..., 3), no lugar. A representação
+    da métrica (RGB, Lab ou matiz) é calculada uma vez e, a cada substituição, atualizada
+    apenas nas cores alteradas, que passam a ter todas a mesma cor nova.
+    """
+    prepared = prepare(colors, metric) if prepared is None else prepared
+    for old_color, new_color, tolerance in edits:
+        mask = within_tolerance(prepared, old_color, tolerance, metric)
+        colors[mask] = new_color
+        prepared[mask] = prepare(np.array(new_color, dtype=np.uint8), metric)
+
+
+def _row_strips(data: np.ndarray) -> Iterator[np.ndarray]:
+    """Percorre o buffer (H, W, C) em faixas de STRIP_ROWS linhas (views, sem cópia)."""
+    for y in range(0, data.shape[0], STRIP_ROWS):
+        yield data[y:y + STRIP_ROWS]
+
+
+def rgba_array(image: Image.Image) -> np.ndarray:
+    """
+    Cópia RGBA (H, W, 4) gravável da imagem, com uma única alocação do tamanho da imagem.
+    `np.array(image)` passa por `tobytes()` (duas cópias inteiras ao mesmo tempo) e
+    `convert("RGBA")` cria mais uma; aqui a imagem é lida (e convertida) em faixas de linhas.
+    """
+    width, height = image.size
+    data = np.empty((height, width, 4), dtype=np.uint8)
+    for y in range(0, height, STRIP_ROWS):
+        strip = image.crop((0, y, width, min(y + STRIP_ROWS, height)))
+        data[y:y + STRIP_ROWS] = np.asarray(strip if strip.mode == "RGBA" else strip.convert("RGBA"))
+    return data
+
+
+def _normalize_edits(mapping: Sequence[ColorEdit]) -> list:
+    """Normaliza as entradas do remapeamento para (antiga, nova, tolerância)."""
+    edits = []
+    for entry in mapping:
+        old_color, new_color = tuple(entry[0][:3]), tuple(entry[1][:3])
+        tolerance = entry[2] if len(entry) > 2 else DEFAULT_TOLERANCE
+        edits.append((old_color, new_color, tolerance))
+    return edits
+
+
+@profiled("recolor", pixels=lambda image, *args, **kwargs: image.width * image.height)
+def replace_color(image: Image.Image, old_color_rgb: Tuple[int, int, int], new_color_rgb: Tuple[int, int, int], tolerance: int = 30, metric: str = DEFAULT_METRIC) -> Image.Image:
+    """
+    Substitui todas as ocorrências de uma cor por outra em uma imagem, com tolerância.
+    A máscara de distância (pela métrica escolhida, ver color_metrics) é calculada de forma
+    vetorizada sobre o buffer RGBA, em faixas de linhas para limitar a memória temporária
+    em imagens grandes; o alpha é preservado. A imagem de entrada não é alterada: o único
+    buffer do tamanho da imagem é o do resultado, que o compartilha com a imagem devolvida.
+    """
+    data = rgba_array(image)
+    for strip in _row_strips(data):
+        _apply_edits(strip[..., :3], [(old_color_rgb[:3], new_color_rgb[:3], tolerance)], metric)
+    return Image.fromarray(data)
+
+
+@profiled("recolor", pixels=lambda image, *args, **kwargs: image.width * image.height)
+def replace_colors(image: Image.Image, mapping: Sequence[ColorEdit], metric: str = DEFAULT_METRIC) -> Image.Image:
+    """
+    Aplica várias substituições de cor (antiga -> nova, com tolerância por entrada) em uma única passada.
+    O resultado é o mesmo de chamar replace_color para cada entrada, na ordem.
+
+    Em imagens tipo paleta (até PALETTE_LIKE_MAX_COLORS cores distintas) as substituições são
+    resolvidas sobre a tabela (ordenada) de cores únicas e os pixels são remapeados
+    uma única vez por essa tabela; assim, a conversão para Lab das métricas perceptuais é
+    feita por cor única, e não por pixel. Como em replace_color, o resultado é o único
+    buffer do tamanho da imagem (ver replace_colors_inplace).
+    """
+    return Image.fromarray(replace_colors_inplace(rgba_array(image), mapping, metric))
+
+
+def replace_colors_inplace(data: np.ndarray, mapping: Sequence[ColorEdit], metric: str = DEFAULT_METRIC) -> np.ndarray:
+    """
+    replace_colors sobre um buffer RGBA (H, W, 4) uint8 do chamador, alterado no lugar e
+    devolvido. Além dele, só são alocados temporários do tamanho de uma faixa de
+    STRIP_ROWS linhas e a tabela de cores únicas; em imagens tipo paleta grandes em que muitas
+    cores mudam, também o índice de cores, liberado ao final (ver SPARSE_REMAP_MAX_COLORS).
+    """
+    edits = _normalize_edits(mapping)
+    rgb = data[..., :3]
+    if not edits:
+        return data
+
+    with span("recolor.unique_colors"):
+        palette = _unique_rgb(data)
+    if palette is not None:
+        # As cores únicas vêm ordenadas, e portanto as chaves empacotadas também
+        keys = _pack_rgb(palette)
+        lut = palette.copy()
+        with span("recolor.match", colors=len(palette)):
+            _apply_edits(lut, edits, metric)
+        changed = np.flatnonzero((lut != palette).any(axis=1))
+        pixels = rgb.shape[0] * rgb.shape[1]
+        with span("recolor.remap", pixels=pixels, colors=len(changed)):
+            if not changed.size:
+                return data
+            if pixels <= DENSE_INDEX_MIN_PIXELS or changed.size <= SPARSE_REMAP_MAX_COLORS:
+                # Só os pixels das cores alteradas são escritos (as chaves continuam ordenadas)
+                changed_keys, new_colors = keys[changed], lut[changed]
+                for strip in _row_strips(rgb):
+                    packed = _pack_rgb(strip)
+                    position = np.minimum(np.searchsorted(changed_keys, packed), changed.size - 1)
+                    hit = changed_keys[position] == packed
+                    strip[hit] = new_colors[position[hit]]
+            else:
+                index = np.empty(1 << 24, dtype=np.uint16)
+                index[keys] = np.arange(len(keys), dtype=np.uint16)
+                for strip in _row_strips(rgb):
+                    strip[...] = lut[index[_pack_rgb(strip)]]
+    else:
+        with span("recolor.match", pixels=rgb.shape[0] * rgb.shape[1]):
+            for strip in _row_strips(rgb):
+                _apply_edits(strip, edits, metric)
+    return data
+
+
+class RecolorPreview:
+    """
+    Remapeamento repetido de uma mesma imagem pequena (o preview), por exemplo enquanto a
+    tolerância é ajustada. As cores únicas, o índice de cada pixel nessa tabela e a
+    representação das cores em cada métrica são calculados uma vez; cada `apply` só
+    percorre a tabela e remonta os pixels a partir dela, com o mesmo resultado de replace_colors.
+    """
+    def __init__(self, image: Image.Image) -> None:
+        data = np.array(image if image.mode == "RGBA" else image.convert("RGBA"))
+        keys, inverse = np.unique(_pack_rgb(data[..., :3]), return_inverse=True)
+        self._palette = np.stack([keys >> 16, (keys >> 8) & 0xFF, keys & 0xFF], axis=-1).astype(np.uint8)
+        self._inverse = inverse.reshape(data.shape[:2])
+        self._alpha = data[..., 3]
+        self._prepared: Dict[str, np.ndarray] = {}
+
+    @profiled("preview.recolor", pixels=lambda self, *args, **kwargs: self._inverse.size)
+    def apply(self, mapping: Sequence[ColorEdit], metric: str = DEFAULT_METRIC) -> Image.Image:
+        if metric not in self._prepared:
+            self._prepared[metric] = prepare(self._palette, metric)
+        lut = self._palette.copy()
+        _apply_edits(lut, _normalize_edits(mapping), metric, self._prepared[metric].copy())
+        data = np.empty(self._inverse.shape + (4,), dtype=np.uint8)
+        data[..., :3] = lut[self._inverse]
+        data[..., 3] = self._alpha
+        return Image.fromarray(data)
+
+
+def _pack_rgb(rgb: np.ndarray) -> np.ndarray:
+    """Empacota cores (..., 3) uint8 em inteiros de 24 bits."""
+    return (rgb[..., 0].astype(np.uint32) << 16) | (rgb[..., 1].astype(np.uint32) << 8) | rgb[..., 2]
+
+
+def _unique_rgb(data: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Retorna as cores RGB distintas do buffer RGBA como um array (N, 3) uint8,
+    ou None se houver mais de PALETTE_LIKE_MAX_COLORS cores.
+    """
+    # fromarray compartilha o buffer: getcolors o percorre sem cópia
+    colors = Image.fromarray(data).getcolors(PALETTE_LIKE_MAX_COLORS)
+    if colors is None:
+        return None
+    rgba = np.array([color for _, color in colors], dtype=np.uint8).reshape(-1, 4)
+    return np.unique(rgba[:, :3], axis=0)
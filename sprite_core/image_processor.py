@@ -0,0 +1,252 @@
+# image_processor.py
+
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .png_writer import DEFAULT_PRESET, PngSetting, SaveStats, save_png
+from .profiling import span
+
+
+def find_non_empty_blocks(imagem: Image.Image, bloco_px: int) -> List[Tuple[int, int]]:
+    """
+    Varre o canal alpha uma única vez e retorna a posição (x, y) de cada bloco
+    com algum pixel não transparente, em ordem de leitura (linha a linha).
+    """
+    largura, altura = imagem.size
+    alpha = np.asarray(imagem.getchannel("A"))
+    ocupados = alpha.reshape(altura // bloco_px, bloco_px, largura // bloco_px, bloco_px).any(axis=(1, 3))
+    linhas, colunas = np.nonzero(ocupados)
+    return [(int(col) * bloco_px, int(lin) * bloco_px) for lin, col in zip(linhas, colunas)]
+
+
+def _dihedral_variants(tile: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Gera as 8 variantes de um bloco (giros de 90° com e sem espelhamento horizontal).
+    O código de cada variante é `giros + 4 * espelhado`: a variante é np.rot90(espelho(bloco), giros).
+    """
+    for flip in (0, 1):
+        base = tile[:, ::-1] if flip else tile
+        for k in range(4):
+            yield k + 4 * flip, np.rot90(base, k)
+
+
+def _tile_key(tile: np.ndarray, match_transforms: bool) -> bytes:
+    """Hash dos bytes RGBA do bloco; com match_transforms, o menor hash entre as 8 variantes."""
+    if not match_transforms:
+        return hashlib.blake2b(tile.tobytes(), digest_size=16).digest()
+    return min(hashlib.blake2b(np.ascontiguousarray(variant).tobytes(), digest_size=16).digest()
+               for _, variant in _dihedral_variants(tile))
+
+
+class TileDeduper:
+    """
+    Agrupa blocos idênticos pelo hash dos bytes RGBA, à medida que são encontrados.
+    Guarda apenas uma cópia de cada bloco único, para confirmar os candidatos pixel a pixel.
+    """
+    def __init__(self, match_transforms: bool = False) -> None:
+        self.match_transforms = match_transforms
+        self.unicos: List[np.ndarray] = []
+        self.atribuicao: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self._candidatos: Dict[bytes, List[int]] = {}
+
+    def add(self, tile: np.ndarray, posicao: Tuple[int, int]) -> Tuple[int, bool]:
+        """
+        Registra o bloco da posição (x, y) da imagem.
+
+        Returns:
+            O ID do bloco único correspondente e se ele é novo. Em `atribuicao`, cada posição
+            recebe (ID, transformação), em que a transformação é o código de _dihedral_variants
+            que leva o bloco único ao bloco da posição (0 = idêntico).
+        """
+        key = _tile_key(tile, self.match_transforms)
+        for tile_id in self._candidatos.get(key, []):
+            unico = self.unicos[tile_id]
+            variantes = _dihedral_variants(unico) if self.match_transforms else [(0, unico)]
+            codigo = next((c for c, v in variantes if np.array_equal(v, tile)), None)
+            if codigo is not None:
+                self.atribuicao[posicao] = (tile_id, codigo)
+                return tile_id, False
+
+        tile_id = len(self.unicos)
+        self._candidatos.setdefault(key, []).append(tile_id)
+        self.unicos.append(np.array(tile))
+        self.atribuicao[posicao] = (tile_id, 0)
+        return tile_id, True
+
+
+def write_tilemap(
+    path: str,
+    image_size: Tuple[int, int],
+    bloco_px: int,
+    scale: int,
+    nomes: List[str],
+    atribuicao: Dict[Tuple[int, int], Tuple[int, int]],
+    match_transforms: bool
+) -> None:
+    """
+    Salva o índice do tilemap em JSON: a lista de arquivos dos blocos únicos e uma grade
+    (linhas x colunas) com o ID de cada posição (-1 para blocos vazios). Com match_transforms,
+    inclui também a grade de transformações (ver _dihedral_variants).
+    """
+    colunas, linhas = image_size[0] // bloco_px, image_size[1] // bloco_px
+    grade = [[-1] * colunas for _ in range(linhas)]
+    transformacoes = [[0] * colunas for _ in range(linhas)]
+    for (x, y), (tile_id, codigo) in atribuicao.items():
+        grade[y // bloco_px][x // bloco_px] = tile_id
+        transformacoes[y // bloco_px][x // bloco_px] = codigo
+
+    tilemap = {
+        "tile_size": bloco_px * max(scale, 1),
+        "columns": colunas,
+        "rows": linhas,
+        "tiles": nomes,
+        "map": grade,
+    }
+    if match_transforms:
+        tilemap["transforms"] = transformacoes
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tilemap, f, separators=(",", ":"))
+
+
+def iter_block_rows(imagem: Image.Image, bloco_px: int) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Percorre a imagem em faixas de bloco_px linhas, retornando (y, faixa em RGBA).
+    Apenas a faixa atual é convertida para RGBA; o restante permanece no modo original.
+    """
+    largura, altura = imagem.size
+    for y in range(0, altura, bloco_px):
+        # A primeira faixa inclui a decodificação do arquivo (o Pillow carrega a imagem no primeiro crop)
+        with span("split.decode", pixels=largura * bloco_px):
+            faixa = imagem.crop((0, y, largura, y + bloco_px))
+            faixa = faixa if faixa.mode == "RGBA" else faixa.convert("RGBA")
+        yield y, faixa
+
+
+def _save_block(imagem: Image.Image, x: int, y: int, bloco_px: int, scale: int, path: str,
+                png_options: PngSetting = DEFAULT_PRESET, png_stats: Optional[SaveStats] = None) -> None:
+    """Recorta, escala e salva um único bloco."""
+    with span("split.crop_resize", pixels=bloco_px * bloco_px * scale * scale):
+        bloco = imagem.crop((x, y, x + bloco_px, y + bloco_px))
+        if scale > 1:
+            bloco = bloco.resize((bloco_px * scale, bloco_px * scale), Image.Resampling.NEAREST)
+    save_png(bloco, path, png_options, png_stats)
+
+
+def _trimmed_block(imagem: Image.Image, x: int, y: int, bloco_px: int, scale: int) -> Tuple[Image.Image, Tuple[int, int]]:
+    """Recorta o bloco até a área não transparente, escala e retorna (imagem, deslocamento do recorte)."""
+    with span("split.trim", pixels=bloco_px * bloco_px):
+        bloco = imagem.crop((x, y, x + bloco_px, y + bloco_px))
+        left, top, right, bottom = bloco.getbbox()
+        bloco = bloco.crop((left, top, right, bottom))
+        if scale > 1:
+            bloco = bloco.resize(((right - left) * scale, (bottom - top) * scale), Image.Resampling.NEAREST)
+    return bloco, (left * scale, top * scale)
+
+
+def process_and_save_blocks(
+    image_path: str,
+    output_folder: str,
+    output_name: str,
+    bloco_px: int,
+    scale: int,
+    progress_callback: Optional[Callable[[float], None]],
+    workers: Optional[int] = None,
+    dedup: bool = False,
+    match_transforms: bool = False,
+    atlas: bool = False,
+    atlas_max_size: int = 2048,
+    png_options: PngSetting = DEFAULT_PRESET,
+    png_stats: Optional[SaveStats] = None
+) -> List[str]:
+    """
+    Processa uma imagem, dividindo-a em blocos e salvando-os.
+
+    A imagem é percorrida em faixas de uma linha de blocos, convertendo para RGBA apenas a
+    faixa atual, o que permite processar folhas muito grandes. Em cada faixa, os blocos vazios
+    são descartados em uma única passada sobre o canal alpha; o recorte, a escala e a
+    codificação PNG dos demais são distribuídos em um pool de threads.
+    A numeração `_NNN` segue a ordem de leitura, independente da ordem de término.
+
+    Args:
+        image_path: Caminho para a imagem de entrada.
+        output_folder: Caminho da pasta onde os blocos serão salvos.
+        bloco_px: O tamanho de cada bloco em pixels.
+        scale: O fator de escala para redimensionar os blocos.
+        progress_callback: Uma função para notificar o progresso (de 0 a 1), ou None.
+        workers: Número de threads de codificação (padrão: número de CPUs).
+        dedup: Salva cada bloco distinto uma única vez e gera `<nome>_tilemap.json`.
+        match_transforms: No modo dedup, trata cópias giradas/espelhadas como duplicatas.
+        atlas: Em vez de um PNG por bloco, empacota os blocos (recortados) em atlas
+            `<nome>_atlas_N.png` com potência de dois, mais o mapa de quadros em JSON.
+        atlas_max_size: Lado máximo de cada página do atlas.
+        png_options: Preset ou PngOptions da gravação dos PNGs; no padrão, blocos com até
+            256 cores são gravados em modo paleta (ver png_writer).
+        png_stats: Acumula o tamanho e o tempo de codificação dos PNGs, se informado.
+
+    Returns:
+        Os caminhos de todos os arquivos gerados.
+    """
+    with Image.open(image_path) as imagem, span("split", pixels=imagem.width * imagem.height):
+        largura, altura = imagem.size
+
+        if largura % bloco_px != 0 or altura % bloco_px != 0:
+            raise ValueError(f"Dimensões ({largura}x{altura}) não são múltiplas de {bloco_px}px.")
+
+        deduper = TileDeduper(match_transforms) if dedup else None
+        nomes: List[str] = []
+        frames = []
+        total_rows = altura // bloco_px
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            anteriores: list = []
+            for row, (y, faixa) in enumerate(iter_block_rows(imagem, bloco_px)):
+                pixels = np.asarray(faixa)
+                atuais = []
+                with span("split.find_blocks", pixels=largura * bloco_px):
+                    ocupados = find_non_empty_blocks(faixa, bloco_px)
+                for x, _ in ocupados:
+                    if deduper:
+                        with span("split.dedup", pixels=bloco_px * bloco_px):
+                            novo = deduper.add(pixels[:, x:x + bloco_px], (x, y))[1]
+                        if not novo:
+                            continue
+                    nome = f"{output_name}_{len(nomes):03}.png"
+                    nomes.append(nome)
+                    if atlas:
+                        bloco, offset = _trimmed_block(faixa, x, 0, bloco_px, scale)
+                        frames.append((nome, bloco, offset, (bloco_px * scale, bloco_px * scale)))
+                    else:
+                        atuais.append(executor.submit(
+                            _save_block, faixa, x, 0, bloco_px, scale, os.path.join(output_folder, nome),
+                            png_options, png_stats
+                        ))
+
+                # no máximo duas faixas em memória: espera a codificação da faixa anterior
+                for future in anteriores:
+                    future.result()
+                anteriores = atuais
+
+                if progress_callback:
+                    progress_callback((0.9 if atlas else 1.0) * (row + 1) / total_rows)
+
+            for future in anteriores:
+                future.result()
+
+    arquivos = [] if atlas else [os.path.join(output_folder, nome) for nome in nomes]
+    if deduper:
+        tilemap_path = os.path.join(output_folder, f"{output_name}_tilemap.json")
+        write_tilemap(tilemap_path, (largura, altura), bloco_px, scale, nomes, deduper.atribuicao, match_transforms)
+        arquivos.append(tilemap_path)
+    if atlas and frames:
+        from .atlas_packer import save_atlas
+        arquivos.extend(save_atlas(frames, output_folder, output_name, atlas_max_size,
+                                   png_options=png_options, png_stats=png_stats))
+    if progress_callback:
+        progress_callback(1.0)
+    return arquivos
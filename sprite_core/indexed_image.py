@@ -0,0 +1,86 @@
+# indexed_image.py
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from PIL import Image
+
+from .color_metrics import DEFAULT_METRIC
+from .image_editor import ColorEdit, _apply_edits, _normalize_edits
+from .png_writer import to_indexed
+from .profiling import profiled
+
+
+class IndexedImage:
+    """
+    Imagem em cores indexadas: o buffer de índices (H, W) uint8 e a paleta RGBA (N, 4).
+
+    Sprites costumam ter poucas cores: com a imagem mantida assim, uma substituição de cores
+    altera apenas as entradas da paleta (O(N), sem percorrer os pixels) e o resultado é
+    gravado direto como PNG ou GIF indexado. O buffer de índices nunca é alterado e é
+    compartilhado entre as versões recoloridas e com as imagens devolvidas por `image`.
+    """
+    def __init__(self, indices: np.ndarray, palette: np.ndarray) -> None:
+        self.indices = indices
+        self.palette = palette
+        self._image: Optional[Image.Image] = None
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> Optional["IndexedImage"]:
+        """
+        Versão indexada da imagem, idêntica pixel a pixel: imagens P são usadas como estão
+        (os índices não são copiados) e as demais são indexadas sem perdas se tiverem até
+        256 cores RGBA distintas (ver png_writer.to_indexed). None se não for possível.
+        """
+        if image.mode != "P":
+            indexable = image.mode == "RGBA" or (image.mode == "RGB" and "transparency" not in image.info)
+            image = to_indexed(image if indexable else image.convert("RGBA"))
+            if image is None:
+                return None
+        indices = np.asarray(image)
+        return cls(indices, _rgba_palette(image, int(indices.max(initial=0)) + 1))
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.indices.shape[1], self.indices.shape[0]
+
+    @property
+    def image(self) -> Image.Image:
+        """Imagem P (compartilhada; não deve ser modificada), com o alpha da paleta no chunk tRNS."""
+        if self._image is None:
+            image = Image.frombuffer("P", self.size, self.indices, "raw", "P", 0, 1)
+            image.putpalette(self.palette[:, :3].tobytes())
+            translucent = np.flatnonzero(self.palette[:, 3] < 255)
+            if translucent.size:
+                image.info["transparency"] = self.palette[:translucent[-1] + 1, 3].tobytes()
+            self._image = image
+        return self._image
+
+    @profiled("recolor.palette", pixels=lambda self, *args, **kwargs: len(self.palette))
+    def recolor(self, mapping: Sequence[ColorEdit], metric: str = DEFAULT_METRIC) -> "IndexedImage":
+        """
+        Nova versão com as substituições (ver replace_colors) aplicadas às entradas da paleta.
+        O resultado é o mesmo de replace_colors sobre os pixels, que dependem apenas da
+        própria cor; o alpha de cada entrada é preservado.
+        """
+        palette = self.palette.copy()
+        _apply_edits(palette[:, :3], _normalize_edits(mapping), metric)
+        return IndexedImage(self.indices, palette)
+
+
+def _rgba_palette(image: Image.Image, entries: int) -> np.ndarray:
+    """Paleta RGBA (entries, 4) de uma imagem P, com o alpha de info["transparency"] (bytes por entrada ou um índice)."""
+    palette = np.zeros((max(entries, 1), 4), dtype=np.uint8)
+    palette[:, 3] = 255
+    if image.palette is not None and image.palette.mode == "RGBA":
+        rgba = np.frombuffer(bytes(image.getpalette("RGBA")), dtype=np.uint8).reshape(-1, 4)[:len(palette)]
+        palette[:len(rgba)] = rgba
+        return palette
+    rgb = np.frombuffer(bytes(image.getpalette() or []), dtype=np.uint8).reshape(-1, 3)[:len(palette)]
+    palette[:len(rgb), :3] = rgb
+    transparency = image.info.get("transparency")
+    if isinstance(transparency, bytes):
+        alpha = np.frombuffer(transparency, dtype=np.uint8)[:len(palette)]
+        palette[:len(alpha), 3] = alpha
+    elif isinstance(transparency, int) and transparency < len(palette):
+        palette[transparency, 3] = 0
+    return palette
@@ -0,0 +1,177 @@
+# png_writer.py
+
+import os
+import threading
+import time
+from typing import NamedTuple, Optional, Union
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+from . import PNG_PRESETS
+from .profiling import span
+
+
+class PngOptions(NamedTuple):
+    """
+    Como os PNGs são gravados.
+
+    palette: grava em modo paleta (P) quando a imagem tem até 256 cores RGBA distintas
+        (sem perdas; o alpha vai para o chunk tRNS e o Pillow reduz a profundidade para
+        1, 2 ou 4 bits quando há poucas cores).
+    compress_level: nível do zlib (0-9): mais alto gera arquivos menores, mais devagar.
+    optimize: passada extra do codificador em busca do menor arquivo (bem mais lenta).
+    strip_metadata: descarta perfil ICC, DPI e textos da imagem de origem.
+    """
+    palette: bool = True
+    compress_level: int = 6
+    optimize: bool = False
+    strip_metadata: bool = True
+
+
+# "none" é o save() padrão do Pillow, sem otimização (sempre RGBA, metadados preservados)
+PRESETS = dict(zip(PNG_PRESETS, (
+    None,
+    PngOptions(compress_level=1),
+    PngOptions(),
+    PngOptions(compress_level=9, optimize=True),
+)))
+DEFAULT_PRESET = "balanced"
+# Pixels por busca na conversão para modo paleta (limita os temporários em imagens grandes)
+INDEX_CHUNK = 1 << 20
+
+PngSetting = Union[str, PngOptions, None]
+
+
+def resolve_png_options(options: PngSetting) -> Optional[PngOptions]:
+    """Aceita o nome de um preset, um PngOptions ou None (save padrão)."""
+    if isinstance(options, str):
+        if options not in PRESETS:
+            raise ValueError(f"Preset de PNG desconhecido: {options} (use {', '.join(PRESETS)})")
+        return PRESETS[options]
+    return options
+
+
+class SaveStats:
+    """
+    Totais dos PNGs gravados por um job (seguro entre threads): arquivos, bytes escritos,
+    tamanho bruto dos pixels, quantos foram indexados e o tempo somado de codificação.
+    """
+    def __init__(self) -> None:
+        self.files = 0
+        self.indexed = 0
+        self.raw_bytes = 0
+        self.bytes_written = 0
+        self.encode_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, raw_bytes: int, bytes_written: int, seconds: float, indexed: bool) -> None:
+        with self._lock:
+            self.files += 1
+            self.indexed += indexed
+            self.raw_bytes += raw_bytes
+            self.bytes_written += bytes_written
+            self.encode_seconds += seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "indexed": self.indexed,
+            "raw_bytes": self.raw_bytes,
+            "bytes_written": self.bytes_written,
+            "bytes_saved": self.raw_bytes - self.bytes_written,
+            "encode_seconds": round(self.encode_seconds, 4),
+        }
+
+    def summary(self) -> str:
+        """Resumo de uma linha para o log."""
+        if not self.files:
+            return "Nenhum PNG gravado."
+        ratio = self.bytes_written / self.raw_bytes if self.raw_bytes else 0
+        return (f"{self.files} PNG(s) ({self.indexed} indexado(s)): {self.bytes_written / 1024:.1f} KB "
+                f"({ratio:.0%} dos {self.raw_bytes / 1024:.1f} KB de pixels RGBA, "
+                f"{(self.raw_bytes - self.bytes_written) / 1024:.1f} KB economizados), "
+                f"codificação {self.encode_seconds:.2f}s")
+
+
+def _packed_rgba(image: Image.Image) -> np.ndarray:
+    """Pixels RGBA (H, W) como uint32 little-endian (alpha no byte mais significativo)."""
+    rgba = image if image.mode == "RGBA" else image.convert("RGBA")
+    return np.frombuffer(rgba.tobytes(), dtype="<u4").reshape(image.height, image.width)
+
+
+def to_indexed(image: Image.Image) -> Optional[Image.Image]:
+    """
+    Versão em modo paleta (P), idêntica pixel a pixel, de uma imagem RGB/RGBA com até 256 cores
+    distintas, ou None. As entradas são ordenadas pelo alpha (transparentes primeiro), para
+    que o chunk tRNS termine na última entrada não opaca.
+    """
+    # RGB com cor transparente (tRNS) fica de fora: o alpha não aparece em getcolors
+    indexable = image.mode == "RGBA" or (image.mode == "RGB" and "transparency" not in image.info)
+    colors = image.getcolors(256) if indexable else None
+    if colors is None:
+        return None
+    if image.mode == "RGB":
+        colors = [(count, color + (255,)) for count, color in colors]
+    # Chave little-endian: o alpha é o byte mais significativo, então as chaves ordenadas
+    # já trazem as entradas transparentes primeiro
+    keys = np.sort(np.array([color for _, color in colors], dtype=np.uint8).view("<u4")[:, 0])
+    entries = keys.view(np.uint8).reshape(-1, 4)
+
+    # A imagem é lida por faixas e searchsorted (que devolve int64, 8 bytes por pixel) escreve
+    # direto nos índices uint8: nenhum temporário tem o tamanho da imagem inteira
+    width, height = image.size
+    rows = max(1, INDEX_CHUNK // width)
+    if rows >= height:
+        indices = np.searchsorted(keys, _packed_rgba(image)).astype(np.uint8)
+    else:
+        indices = np.empty((height, width), dtype=np.uint8)
+        for y in range(0, height, rows):
+            indices[y:y + rows] = np.searchsorted(keys, _packed_rgba(image.crop((0, y, width, min(y + rows, height)))))
+    indexed = Image.frombuffer("P", image.size, indices, "raw", "P", 0, 1)
+    indexed.putpalette(entries[:, :3].tobytes())
+    translucent = int(np.count_nonzero(entries[:, 3] < 255))
+    if translucent:
+        indexed.info["transparency"] = entries[:translucent, 3].tobytes()
+    return indexed
+
+
+def _metadata_args(image: Image.Image) -> dict:
+    """Metadados da imagem de origem que o save() do PNG aceita."""
+    args = {key: image.info[key] for key in ("icc_profile", "dpi", "exif") if key in image.info}
+    text = getattr(image, "text", None)
+    if text:
+        pnginfo = PngImagePlugin.PngInfo()
+        for key, value in text.items():
+            pnginfo.add_text(key, value)
+        args["pnginfo"] = pnginfo
+    return args
+
+
+def save_png(image: Image.Image, path: str, options: PngSetting = DEFAULT_PRESET, stats: Optional[SaveStats] = None) -> str:
+    """
+    Grava a imagem como PNG com as opções (ou preset) dadas e, se pedido, acumula o
+    tamanho e o tempo de codificação em `stats`. Retorna o caminho gravado.
+    """
+    opts = resolve_png_options(options)
+    start = time.perf_counter()
+    indexed = None
+    with span("png.encode", pixels=image.width * image.height) as attrs:
+        if opts is None:
+            image.save(path, "PNG")
+        else:
+            if opts.palette:
+                with span("png.index", pixels=image.width * image.height):
+                    indexed = to_indexed(image)
+            target = indexed if indexed is not None else image
+            args = {"compress_level": opts.compress_level, "optimize": opts.optimize}
+            if opts.strip_metadata:
+                args["icc_profile"] = None
+            else:
+                args.update(_metadata_args(image))
+            target.save(path, "PNG", **args)
+        attrs["bytes"] = size = os.path.getsize(path)
+        # Imagens que já estão em modo paleta são gravadas indexadas como estão
+        attrs["indexed"] = is_indexed = indexed is not None or image.mode == "P"
+    if stats is not None:
+        stats.add(image.width * image.height * 4, size, time.perf_counter() - start, is_indexed)
+    return path
@@ -0,0 +1,165 @@
+# profiling.py
+"""
+Medição leve dos tempos das operações (sem dependências além da biblioteca padrão).
+
+As operações de sprite_core abrem spans (`with span("split.encode", pixels=...)`) ou são
+decoradas com `@profiled(...)`. Com o perfilador desligado (o padrão), cada span custa
+apenas a verificação de uma flag. Ligado, cada span registra nome, início, duração,
+processo, thread e atributos (pixels, bytes escritos...), que podem ser resumidos por etapa
+ou exportados em JSON ou no formato de trace do Chrome (chrome://tracing, Perfetto).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Quantidade máxima de spans guardados (os mais antigos são descartados)
+MAX_SPANS = 200_000
+
+
+class Profiler:
+    """Coletor de spans, seguro entre threads."""
+    def __init__(self, enabled: bool = False, max_spans: int = MAX_SPANS) -> None:
+        self.enabled = enabled
+        self._spans: "deque[dict]" = deque(maxlen=max_spans)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[dict]:
+        """
+        Mede o bloco `with`. Os atributos podem ser completados dentro dele pelo dicionário
+        devolvido (por exemplo, `attrs["bytes"] = ...` depois de gravar o arquivo).
+        """
+        if not self.enabled:
+            yield attrs
+            return
+        # O início em tempo de relógio permite juntar spans de processos diferentes
+        start = time.time()
+        t0 = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.add({
+                "name": name,
+                "start": start,
+                "seconds": time.perf_counter() - t0,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "attrs": attrs,
+            })
+
+    def add(self, record: dict) -> None:
+        with self._lock:
+            self._spans.append(record)
+            self._count += 1
+
+    def extend(self, records: List[dict]) -> None:
+        """Junta spans registrados em outro processo (ver spans)."""
+        for record in records:
+            self.add(record)
+
+    def mark(self) -> int:
+        """Posição atual; `spans(mark)` devolve apenas o que foi registrado depois dela."""
+        with self._lock:
+            return self._count
+
+    def dropped(self, since: int = 0) -> int:
+        """Quantos spans registrados depois de `since` já foram descartados (limite max_spans ou clear)."""
+        with self._lock:
+            return max(0, self._count - len(self._spans) - since)
+
+    def spans(self, since: int = 0) -> List[dict]:
+        with self._lock:
+            kept = len(self._spans)
+            first = self._count - kept
+            return list(self._spans)[max(0, since - first):]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self, since: int = 0) -> Dict[str, dict]:
+        """Totais por etapa (nome do span): chamadas, segundos, maior duração, pixels e bytes."""
+        stages: Dict[str, dict] = {}
+        for record in self.spans(since):
+            stage = stages.setdefault(record["name"], {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "pixels": 0, "bytes": 0})
+            stage["count"] += 1
+            stage["seconds"] += record["seconds"]
+            stage["max_seconds"] = max(stage["max_seconds"], record["seconds"])
+            stage["pixels"] += record["attrs"].get("pixels", 0)
+            stage["bytes"] += record["attrs"].get("bytes", 0)
+        return dict(sorted(stages.items(), key=lambda item: item[1]["seconds"], reverse=True))
+
+    def format_summary(self, since: int = 0) -> str:
+        """Resumo legível, uma etapa por linha, da mais demorada para a mais rápida."""
+        lines = []
+        for name, stage in self.summary(since).items():
+            line = f"{name}: {stage['count']}x, {stage['seconds']:.3f}s (máx. {stage['max_seconds'] * 1000:.1f} ms)"
+            if stage["pixels"]:
+                line += f", {stage['pixels'] / 1e6:.2f} MP"
+            if stage["bytes"]:
+                line += f", {stage['bytes'] / 1024:.1f} KB"
+            lines.append(line)
+        dropped = self.dropped(since)
+        if lines and dropped:
+            lines.append(f"({dropped} spans mais antigos descartados pelo limite de {self._spans.maxlen}: o resumo está incompleto)")
+        return "\n".join(lines)
+
+    def export_json(self, path: str, since: int = 0) -> str:
+        """Salva os spans e o resumo por etapa em JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(since), "dropped": self.dropped(since), "spans": self.spans(since)}, f, indent=1)
+        return path
+
+    def export_chrome_trace(self, path: str, since: int = 0) -> str:
+        """Salva os spans no formato Trace Event (eventos completos "X", em microssegundos)."""
+        events = [
+            {
+                "name": record["name"],
+                "cat": record["name"].split(".")[0],
+                "ph": "X",
+                "ts": round(record["start"] * 1e6, 1),
+                "dur": round(record["seconds"] * 1e6, 1),
+                "pid": record["pid"],
+                "tid": record["tid"],
+                "args": record["attrs"],
+            }
+            for record in self.spans(since)
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+# Perfilador usado por sprite_core, pela GUI e pela CLI
+PROFILER = Profiler()
+
+
+def span(name: str, **attrs):
+    """Span no perfilador global (ver Profiler.span)."""
+    return PROFILER.span(name, **attrs)
+
+
+def profiled(name: Optional[str] = None, pixels: Optional[Callable[..., int]] = None) -> Callable:
+    """
+    Decorador que mede cada chamada da função no perfilador global.
+    `pixels`, se informado, recebe os mesmos argumentos e devolve a quantidade de pixels processados.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            attrs = {"pixels": pixels(*args, **kwargs)} if pixels else {}
+            with PROFILER.span(span_name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
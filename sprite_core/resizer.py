@@ -0,0 +1,199 @@
+# resizer.py
+
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+from PIL import Image
+
+from . import RESIZE_METHODS
+from .file_conversor import ConversionResult, _unique_output_names, list_images, run_file_jobs
+from .png_writer import DEFAULT_PRESET, PngSetting, SaveStats, save_png
+from .profiling import profiled
+
+# Fator de cada passada dos algoritmos de ampliação de pixel art
+PIXEL_ART_FACTORS = {"scale2x": 2, "scale3x": 3}
+# Os temporários dos algoritmos scaleNx são calculados por faixas de linhas
+STRIP_ROWS = 512
+
+
+def target_size(
+    size: Tuple[int, int],
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    scale: Optional[float] = None,
+    keep_aspect: bool = True
+) -> Tuple[int, int]:
+    """
+    Tamanho final para uma imagem de tamanho `size`: pelo fator `scale` ou por largura/altura.
+    Com keep_aspect, a imagem cabe em width x height mantendo a proporção (basta informar
+    um dos lados); sem ele, o lado não informado permanece o original.
+    """
+    w, h = size
+    if scale:
+        factor_w = factor_h = scale
+    elif not width and not height:
+        raise ValueError("Informe a largura, a altura ou o fator de escala.")
+    elif keep_aspect:
+        factor_w = factor_h = min(f for f in (width / w if width else None, height / h if height else None) if f)
+    else:
+        factor_w, factor_h = (width or w) / w, (height or h) / h
+    return max(1, round(w * factor_w)), max(1, round(h * factor_h))
+
+
+def integer_size(size: Tuple[int, int], target: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Tamanho mais próximo de `target` obtido com um único fator inteiro (N ou 1/N) nos dois eixos,
+    para que todos os pixels continuem quadrados e do mesmo tamanho.
+    """
+    ratio = min(target[0] / size[0], target[1] / size[1])
+    if ratio >= 1:
+        factor = round(ratio)
+        return size[0] * factor, size[1] * factor
+    divisor = round(1 / ratio)
+    return max(1, size[0] // divisor), max(1, size[1] // divisor)
+
+
+def _pixel_keys(image: Image.Image) -> Tuple[np.ndarray, Callable[[np.ndarray], Image.Image]]:
+    """
+    Valores comparáveis por pixel (H, W) e a função que remonta a imagem a partir deles.
+    Imagens P e L são comparadas pelos próprios índices (a paleta é preservada); as demais,
+    pelo RGBA empacotado em 32 bits.
+    """
+    if image.mode in ("P", "L"):
+        def rebuild(keys: np.ndarray) -> Image.Image:
+            result = Image.frombytes(image.mode, (keys.shape[1], keys.shape[0]), keys.tobytes())
+            if image.mode == "P":
+                result.putpalette(image.getpalette())
+                result.info = dict(image.info)
+            return result
+        return np.asarray(image), rebuild
+    rgba = image if image.mode == "RGBA" else image.convert("RGBA")
+    packed = np.frombuffer(rgba.tobytes(), dtype=np.uint32).reshape(rgba.height, rgba.width)
+    return packed, lambda keys: Image.frombuffer("RGBA", (keys.shape[1], keys.shape[0]), keys, "raw", "RGBA", 0, 1)
+
+
+def _scale2x_strip(p: np.ndarray) -> np.ndarray:
+    """Scale2x/EPX sobre uma faixa com uma linha e uma coluna de borda em cada lado."""
+    a, c, e, b, d = p[:-2, 1:-1], p[1:-1, :-2], p[1:-1, 1:-1], p[1:-1, 2:], p[2:, 1:-1]
+    out = np.empty((2 * e.shape[0], 2 * e.shape[1]), dtype=p.dtype)
+    ab, ac, bd, cd = a == b, a == c, b == d, c == d
+    out[0::2, 0::2] = np.where(ac & ~cd & ~ab, a, e)
+    out[0::2, 1::2] = np.where(ab & ~ac & ~bd, b, e)
+    out[1::2, 0::2] = np.where(cd & ~bd & ~ac, c, e)
+    out[1::2, 1::2] = np.where(bd & ~ab & ~cd, d, e)
+    return out
+
+
+def _scale3x_strip(p: np.ndarray) -> np.ndarray:
+    """Scale3x (AdvMAME3x) sobre uma faixa com uma linha e uma coluna de borda em cada lado."""
+    a, b, c = p[:-2, :-2], p[:-2, 1:-1], p[:-2, 2:]
+    d, e, f = p[1:-1, :-2], p[1:-1, 1:-1], p[1:-1, 2:]
+    g, h, i = p[2:, :-2], p[2:, 1:-1], p[2:, 2:]
+    out = np.empty((3 * e.shape[0], 3 * e.shape[1]), dtype=p.dtype)
+    # Os quatro cantos em que duas bordas vizinhas do pixel central coincidem
+    top_left = (d == b) & (b != f) & (d != h)
+    top_right = (b == f) & (b != d) & (f != h)
+    bottom_left = (d == h) & (d != b) & (h != f)
+    bottom_right = (h == f) & (d != h) & (b != f)
+    out[0::3, 0::3] = np.where(top_left, d, e)
+    out[0::3, 1::3] = np.where((top_left & (e != c)) | (top_right & (e != a)), b, e)
+    out[0::3, 2::3] = np.where(top_right, f, e)
+    out[1::3, 0::3] = np.where((top_left & (e != g)) | (bottom_left & (e != a)), d, e)
+    out[1::3, 1::3] = e
+    out[1::3, 2::3] = np.where((top_right & (e != i)) | (bottom_right & (e != c)), f, e)
+    out[2::3, 0::3] = np.where(bottom_left, d, e)
+    out[2::3, 1::3] = np.where((bottom_left & (e != i)) | (bottom_right & (e != g)), h, e)
+    out[2::3, 2::3] = np.where(bottom_right, f, e)
+    return out
+
+
+def scale_pixel_art(keys: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Uma passada de Scale2x/EPX (factor=2) ou Scale3x (factor=3) sobre os valores (H, W) dos pixels.
+    As regras são avaliadas com numpy para todos os pixels de uma faixa de STRIP_ROWS linhas
+    de uma vez; as bordas da imagem repetem o pixel mais próximo. Nenhuma cor nova é criada.
+    """
+    kernel = {2: _scale2x_strip, 3: _scale3x_strip}[factor]
+    padded = np.pad(keys, 1, mode="edge")
+    out = np.empty((keys.shape[0] * factor, keys.shape[1] * factor), dtype=keys.dtype)
+    for y in range(0, keys.shape[0], STRIP_ROWS):
+        rows = min(STRIP_ROWS, keys.shape[0] - y)
+        out[y * factor:(y + rows) * factor] = kernel(padded[y:y + rows + 2])
+    return out
+
+
+@profiled("resize", pixels=lambda image, width, height, *args, **kwargs: width * height)
+def resize_image(image: Image.Image, width: int, height: int, method: str = "nearest") -> Image.Image:
+    """
+    Redimensiona a imagem para width x height pelo método escolhido (ver RESIZE_METHODS):
+
+    nearest: vizinho mais próximo, para qualquer tamanho.
+    integer: vizinho mais próximo com um fator inteiro; o tamanho é ajustado ao múltiplo
+        (ou divisor) mais próximo, para que todos os pixels tenham o mesmo tamanho.
+    scale2x, scale3x: ampliação de pixel art que suaviza as diagonais sem criar cores novas,
+        aplicada em passadas enquanto couber no tamanho pedido; o ajuste final, se houver,
+        é feito com o vizinho mais próximo.
+    """
+    if method not in RESIZE_METHODS:
+        raise ValueError(f"Método de redimensionamento desconhecido: {method} (use {', '.join(RESIZE_METHODS)})")
+    if method == "integer":
+        return image.resize(integer_size(image.size, (width, height)), Image.Resampling.NEAREST)
+
+    factor = PIXEL_ART_FACTORS.get(method)
+    if factor and image.width * factor <= width and image.height * factor <= height:
+        keys, rebuild = _pixel_keys(image)
+        while keys.shape[1] * factor <= width and keys.shape[0] * factor <= height:
+            keys = scale_pixel_art(keys, factor)
+        image = rebuild(keys)
+    if image.size == (width, height):
+        return image
+    return image.resize((width, height), Image.Resampling.NEAREST)
+
+
+def resize_file(
+    image_path: str,
+    output_folder: str,
+    output_name: Optional[str] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    scale: Optional[float] = None,
+    method: str = "nearest",
+    keep_aspect: bool = True,
+    png_options: PngSetting = DEFAULT_PRESET,
+    png_stats: Optional[SaveStats] = None
+) -> str:
+    """
+    Redimensiona um arquivo (ver target_size e resize_image) e o salva como PNG em
+    `<pasta>/<nome>_<L>x<A>.png` (nome padrão: o do arquivo de entrada). Retorna o caminho gravado.
+    """
+    with Image.open(image_path) as image:
+        image.load()
+        size = target_size(image.size, width, height, scale, keep_aspect)
+        resized = resize_image(image, *size, method)
+    name = output_name or os.path.splitext(os.path.basename(image_path))[0]
+    return save_png(resized, os.path.join(output_folder, f"{name}_{resized.width}x{resized.height}.png"), png_options, png_stats)
+
+
+def resize_images(
+    image_paths: Sequence[str],
+    output_folder: str,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    scale: Optional[float] = None,
+    method: str = "nearest",
+    keep_aspect: bool = True,
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    png_options: PngSetting = DEFAULT_PRESET
+) -> List[ConversionResult]:
+    """
+    Redimensiona vários arquivos (ou pastas de imagens) em paralelo, em um pool de processos,
+    com os mesmos parâmetros de resize_file. Com keep_aspect, cada imagem cabe em width x height
+    segundo a própria proporção. Retorna um ConversionResult por arquivo, na ordem de entrada.
+    """
+    paths = list_images(image_paths)
+    jobs = [
+        (path, output_folder, name, width, height, scale, method, keep_aspect, png_options)
+        for path, name in zip(paths, _unique_output_names(paths))
+    ]
+    return run_file_jobs(resize_file, jobs, workers, progress_callback)
@@ -1,9 +1,12 @@
+from __future__ import annotations
+
 import os
 import subprocess
 import platform
-from tkinter import filedialog
-from typing import Optional
-import customtkinter as ctk
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import customtkinter as ctk
 
 def update_log(log_textbox: ctk.CTkTextbox, message: str, status_label: Optional[ctk.CTkLabel] = None) -> None:
     """
@@ -37,6 +40,7 @@ def select_image_path() -> Optional[str]:
     Abre a caixa de diálogo para selecionar um arquivo de imagem.
     Retorna o caminho do arquivo ou None se a seleção for cancelada.
     """
+    from tkinter import filedialog
     return filedialog.askopenfilename(
         title="Selecione um arquivo de imagem",
         filetypes=[("Imagens", "*.png *.jpg *.jpeg *.bmp *.tiff *.gif *.webp"), ("Todos os arquivos", "*.*")]
@@ -48,4 +52,5 @@ def select_output_folder() -> Optional[str]:
     Abre a caixa de diálogo para selecionar a pasta de saída.
     Retorna o caminho da pasta ou None se a seleção for cancelada.
     """
+    from tkinter import filedialog
     return filedialog.askdirectory(title="Selecione a pasta de saída")
\ No newline at end of file